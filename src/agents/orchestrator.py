@@ -9,7 +9,6 @@ Imaging-first architecture:
 """
 from __future__ import annotations
 
-import json
 from datetime import date
 from pathlib import Path
 from typing import Any
@@ -31,6 +30,7 @@ from src.core.types import (
     ReportSections,
 )
 from src.pipelines.compute_analysis import compute_analysis_from_vision
+from src.pipelines.json_io import dumps_json_line
 from src.tools.vision_tool import run_vision_tool
 
 # LLM tools available AFTER vision data is pre-loaded (no vision_tool in LLM loop)
@@ -182,7 +182,7 @@ class Orchestrator:
             f"- Rule applied: {analysis.get('evidence', {}).get('rule_applied', 'N/A')}\n"
             f"- Baseline date: {analysis.get('baseline_study', {}).get('study_date', 'N/A')}\n"
             f"- Last exam date: {analysis.get('last_study', {}).get('study_date', 'N/A')}\n"
-            f"- Delta lesions: {json.dumps(analysis.get('lesion_deltas', []), ensure_ascii=False)}\n",
+            f"- Delta lesions: {dumps_json_line(analysis.get('lesion_deltas', []))}\n",
         ]
 
         if timeline:
@@ -50,7 +50,7 @@ async def run_vision_tool(
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/jpeg",
+                    "media_type": img_meta.thumbnail_media_type,
                     "data": img_meta.thumbnail_b64,
                 },
             })
@@ -17,6 +17,7 @@ from src.agents.orchestrator import Orchestrator
 from src.core.config import settings
 from src.core.types import ReportRequest
 from src.pipelines.ingest_excel import ingest_excel
+from src.pipelines.json_io import read_json
 from src.reporting.renderer import Renderer
 
 router = APIRouter()
@@ -132,13 +133,11 @@ async def generate_report(
 @router.post("/generate/from-manifest")
 async def generate_from_manifest(patient_id: str):
     """Generate a report using a pre-configured patient from the manifest."""
-    import json
-
     manifest_path = settings.data_dir / "manifests" / "manifest.json"
     if not manifest_path.exists():
         raise HTTPException(status_code=404, detail="Manifest not found")
 
-    manifest = json.loads(manifest_path.read_text())
+    manifest = read_json(manifest_path)
     case = next((c for c in manifest["cases"] if c["patient_id"] == patient_id), None)
     if not case:
         raise HTTPException(status_code=404, detail=f"Patient {patient_id} not in manifest")
@@ -78,6 +78,7 @@ class ImageMetadata(BaseModel):
     width: int | None = None
     height: int | None = None
     thumbnail_b64: str | None = None  # base64 encoded thumbnail
+    thumbnail_media_type: str = "image/jpeg"  # MIME type of thumbnail_b64
 
 
 # --- Report ---
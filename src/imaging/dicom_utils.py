@@ -8,29 +8,28 @@ Extends src/pipelines/dicom_utils.py (metadata-only) by adding:
 """
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
+from src.pipelines.dicom_utils import parse_dicom_date
+
+# The only tags read_dicom_metadata() needs — pydicom skips converting the rest
+_METADATA_TAGS = [
+    "PatientID", "StudyDate", "Modality", "PixelSpacing",
+    "InstanceNumber", "SeriesInstanceUID", "StudyInstanceUID",
+]
+
 # ---------------------------------------------------------------------------
 # Tag helpers
 # ---------------------------------------------------------------------------
 
 def _str_tag(ds: Any, tag: str, default: str = "") -> str:
-    try:
-        val = getattr(ds, tag, None)
-        return str(val).strip() if val is not None else default
-    except Exception:
-        return default
-
-
-def _parse_dicom_date(raw: str) -> str | None:
-    """Convert DICOM YYYYMMDD → ISO YYYY-MM-DD."""
-    s = (raw or "").strip()
-    if len(s) == 8 and s.isdigit():
-        return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
-    return None
+    val = getattr(ds, tag, None)
+    return str(val).strip() if val is not None else default
 
 
 # ---------------------------------------------------------------------------
@@ -79,9 +78,23 @@ def read_dicom_metadata(path: str | Path) -> dict[str, Any]:
             PixelSpacing (list[float, float] | None), InstanceNumber (int | None),
             SeriesInstanceUID (str), StudyInstanceUID (str).
     """
+    path = os.fspath(path)  # strings pass straight through — no Path per slice
+    st = os.stat(path)
+    meta = _read_dicom_metadata_cached(path, st.st_mtime_ns, st.st_size)
+    # Fresh dict/list so callers cannot corrupt the cached entry
+    spacing = meta["PixelSpacing"]
+    return {**meta, "PixelSpacing": list(spacing) if spacing is not None else None}
+
+
+@lru_cache(maxsize=4096)
+def _read_dicom_metadata_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Header parse behind :func:`read_dicom_metadata`, keyed by (path, mtime, size).
+
+    *mtime_ns* and *size* are not used in the body; they make a rewritten file miss the cache.
+    """
     import pydicom  # late import — module usable without pydicom installed
 
-    ds = pydicom.dcmread(str(path), stop_before_pixels=True)
+    ds = pydicom.dcmread(path, stop_before_pixels=True, specific_tags=_METADATA_TAGS)
 
     pixel_spacing: list[float] | None = None
     try:
@@ -100,7 +113,7 @@ def read_dicom_metadata(path: str | Path) -> dict[str, Any]:
 
     return {
         "PatientID":         _str_tag(ds, "PatientID"),
-        "StudyDate":         _parse_dicom_date(_str_tag(ds, "StudyDate")),
+        "StudyDate":         parse_dicom_date(_str_tag(ds, "StudyDate")),
         "Modality":          _str_tag(ds, "Modality"),
         "PixelSpacing":      pixel_spacing,
         "InstanceNumber":    instance_number,
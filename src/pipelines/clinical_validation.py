@@ -40,12 +40,13 @@ Gracefully returns analysis unchanged if:
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import UTC, datetime
 from typing import Any
 
+from src.pipelines.json_io import dumps_json
+
 logger = logging.getLogger(__name__)
 
 # ── Protected fields — never modified by validation ──────────────────────────
@@ -213,7 +214,7 @@ def validate_clinical(
     ctx = _build_validation_context(analysis)
     user_msg = (
         "Données d'analyse DICOM à valider :\n"
-        f"{json.dumps(ctx, ensure_ascii=False, indent=2)}\n\n"
+        f"{dumps_json(ctx)}\n\n"
         "Effectue la validation de cohérence clinique."
     )
 
@@ -17,12 +17,13 @@ Usage (CLI):
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from datetime import date
 from pathlib import Path
 from typing import Any
 
+from src.pipelines.json_io import read_json, write_json
+
 # ---------------------------------------------------------------------------
 # Thresholds
 # ---------------------------------------------------------------------------
@@ -55,37 +56,36 @@ def compute_lesion_deltas(
     When counts differ, extra last-exam lesions are marked "new"; lesions
     that vanished are marked accordingly.
     """
-    n = max(len(baseline_sizes), len(last_sizes))
     deltas: list[dict[str, Any]] = []
 
-    for i in range(n):
-        has_baseline = i < len(baseline_sizes)
-        has_last = i < len(last_sizes)
-
-        b: float | None = baseline_sizes[i] if has_baseline else None
-        cur: float | None = last_sizes[i] if has_last else None
-
-        if b is not None and cur is not None:
-            delta_mm: float | None = round(cur - b, 2)
-            delta_pct: float | None = round((cur - b) / b * 100, 1) if b > 0 else None
-        else:
-            delta_mm = None
-            delta_pct = None
-
-        entry: dict[str, Any] = {
+    # Lesions present in both exams — the only ones with a delta
+    for i, (b, cur) in enumerate(zip(baseline_sizes, last_sizes)):
+        diff = cur - b
+        delta_mm = round(diff, 2)
+        delta_pct = round(diff / b * 100, 1) if b > 0 else None
+        deltas.append({
             "lesion_index": i,
             "baseline_mm": b,
             "last_mm": cur,
             "delta_mm": delta_mm,
             "delta_pct": delta_pct,
             "status": _lesion_status(delta_mm, delta_pct),
-        }
-        if b is None:
-            entry["note"] = "new lesion — absent at baseline"
-        if cur is None:
-            entry["note"] = "lesion absent at last exam"
-
-        deltas.append(entry)
+        })
+
+    # Unmatched tail: at most one of these loops runs
+    n_pairs = len(deltas)
+    for i, b in enumerate(baseline_sizes[n_pairs:], n_pairs):
+        deltas.append({
+            "lesion_index": i, "baseline_mm": b, "last_mm": None,
+            "delta_mm": None, "delta_pct": None, "status": _lesion_status(None, None),
+            "note": "lesion absent at last exam",
+        })
+    for i, cur in enumerate(last_sizes[n_pairs:], n_pairs):
+        deltas.append({
+            "lesion_index": i, "baseline_mm": None, "last_mm": cur,
+            "delta_mm": None, "delta_pct": None, "status": _lesion_status(None, None),
+            "note": "new lesion — absent at baseline",
+        })
 
     return deltas
 
@@ -525,7 +525,7 @@ def main(argv: list[str] | None = None) -> None:
     stem = timeline_path.stem  # e.g. CASE_01_timeline
     case_id = stem.replace("_timeline", "")
 
-    timeline: list[dict] = json.loads(timeline_path.read_text(encoding="utf-8"))
+    timeline: list[dict] = read_json(timeline_path)
     print(f"[compute_analysis] Loaded {len(timeline)} exam(s) from {timeline_path}")
 
     analysis = compute_analysis(timeline, case_id)
@@ -533,7 +533,7 @@ def main(argv: list[str] | None = None) -> None:
     out_path = args.out or timeline_path.parent / f"{case_id}_analysis.json"
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(analysis, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out_path, analysis)
 
     print(
         f"[compute_analysis] Status={analysis['overall_status']}  "
@@ -25,13 +25,16 @@ Every analysis dict also carries:
 from __future__ import annotations
 
 import argparse
-import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
+from src.pipelines.dicom_utils import parse_dicom_date
+from src.pipelines.json_io import read_json, write_json
+
 _SCHEMA_PATH = Path(__file__).parent.parent.parent / "data" / "schema" / "analysis_schema.json"
 
 PIPELINE_VERSION: str = "0.2.0"
@@ -47,6 +50,13 @@ _NON_IMAGE_MODALITIES: frozenset[str] = frozenset({
 })
 
 _MAX_SAMPLE_SLICES: int = 16
+_MAX_STATS_ELEMENTS: int = 1 << 16
+
+# Native little-endian syntaxes whose PixelData can be read as a flat array.
+_UNCOMPRESSED_LE_SYNTAXES: frozenset[str] = frozenset({
+    "1.2.840.10008.1.2",    # Implicit VR Little Endian
+    "1.2.840.10008.1.2.1",  # Explicit VR Little Endian
+})
 
 
 # ---------------------------------------------------------------------------
@@ -54,36 +64,30 @@ _MAX_SAMPLE_SLICES: int = 16
 # ---------------------------------------------------------------------------
 
 def _str_tag(ds: Any, tag: str, default: str = "") -> str:
-    try:
-        val = getattr(ds, tag, None)
-        return str(val).strip() if val is not None else default
-    except Exception:
-        return default
+    val = getattr(ds, tag, None)
+    return str(val).strip() if val is not None else default
 
 
 def _int_tag(ds: Any, tag: str) -> int | None:
+    val = getattr(ds, tag, None)
+    if val is None:
+        return None
     try:
-        val = getattr(ds, tag, None)
-        return int(val) if val is not None else None
+        return int(val)
     except (ValueError, TypeError):
         return None
 
 
 def _float_tag(ds: Any, tag: str) -> float | None:
+    val = getattr(ds, tag, None)
+    if val is None:
+        return None
     try:
-        val = getattr(ds, tag, None)
-        return float(val) if val is not None else None
+        return float(val)
     except (ValueError, TypeError):
         return None
 
 
-def _parse_dicom_date(raw: str) -> str | None:
-    s = (raw or "").strip()
-    if len(s) == 8 and s.isdigit():
-        return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
-    return None
-
-
 def extract_metadata(ds: Any) -> dict[str, Any]:
     """Extract structured metadata from a pydicom Dataset."""
     pixel_spacing: list[float] | None = None
@@ -100,7 +104,7 @@ def extract_metadata(ds: Any) -> dict[str, Any]:
         "SeriesInstanceUID": _str_tag(ds, "SeriesInstanceUID"),
         "Modality":          _str_tag(ds, "Modality"),
         "BodyPartExamined":  _str_tag(ds, "BodyPartExamined") or None,
-        "StudyDate":         _parse_dicom_date(_str_tag(ds, "StudyDate")),
+        "StudyDate":         parse_dicom_date(_str_tag(ds, "StudyDate")),
         "SeriesDescription": _str_tag(ds, "SeriesDescription") or None,
         "InstanceNumber":    _int_tag(ds, "InstanceNumber"),
         "PixelSpacing":      pixel_spacing,
@@ -194,27 +198,97 @@ def _consistency_score(mn: float, mx: float, std: float, size: int, meta_score:
     return round(max(0.0, min(1.0, score * 0.7 + meta_score * 0.3)), 3)
 
 
-def extract_image_stats(ds: Any, metadata: dict[str, Any]) -> dict[str, Any]:
-    """Compute image statistics from a single ds.pixel_array.
+def _decode_pixels(ds: Any) -> np.ndarray:
+    """Decode ``ds.pixel_array`` once, with a clear error for compressed syntaxes.
+
+    Compressed transfer syntaxes (JPEG, JPEG 2000, RLE, …) need a decoder plugin
+    such as ``pylibjpeg`` or ``python-gdcm`` (see the ``codecs`` extra).
 
     Raises:
-        ValueError: if pixel_array cannot be read.
+        ValueError: if the pixel data cannot be decoded.
     """
     try:
-        arr = ds.pixel_array.astype(np.float32)
+        return ds.pixel_array
     except Exception as exc:
+        ts = getattr(getattr(ds, "file_meta", None), "TransferSyntaxUID", None)
+        if ts is not None and getattr(ts, "is_compressed", False):
+            raise ValueError(
+                f"Cannot decode compressed pixel data ({getattr(ts, 'name', ts)}): {exc}. "
+                "Install a decoder plugin: pip install -e '.[codecs]'"
+            ) from exc
         raise ValueError(f"Cannot read pixel_array from DICOM: {exc}") from exc
 
-    mn, mx, mean, std = float(arr.min()), float(arr.max()), float(arr.mean()), float(arr.std())
+
+def _read_pixels_direct(ds: Any, path: Path) -> np.ndarray | None:
+    """Read uncompressed single-frame pixel data straight from its file offset.
+
+    *ds* must have been read from *path* with PixelData deferred
+    (``dcmread(path, defer_size=...)``); the raw bytes are then loaded with
+    ``np.fromfile``, skipping pydicom's pixel handlers. Returns None when the
+    file is not a plain little-endian monochrome frame with
+    BitsStored == BitsAllocated — callers then decode *ds* with :func:`_decode_pixels`.
+    """
+    ts = str(getattr(getattr(ds, "file_meta", None), "TransferSyntaxUID", ""))
+    bits = _int_tag(ds, "BitsAllocated")
+    rows, cols = _int_tag(ds, "Rows"), _int_tag(ds, "Columns")
+    if (
+        ts not in _UNCOMPRESSED_LE_SYNTAXES
+        or bits not in (8, 16, 32)
+        or _int_tag(ds, "BitsStored") != bits
+        or (_int_tag(ds, "SamplesPerPixel") or 1) != 1
+        or (_int_tag(ds, "NumberOfFrames") or 1) != 1
+        or not rows
+        or not cols
+    ):
+        return None
+    elem = ds.get_item(0x7FE00010, keep_deferred=True)
+    if elem is None or getattr(elem, "value_tell", None) is None:
+        return None
+    kind = "i" if _int_tag(ds, "PixelRepresentation") == 1 else "u"
+    dtype = np.dtype(f"<{kind}{bits // 8}")
+    try:
+        arr = np.fromfile(path, dtype=dtype, count=rows * cols, offset=elem.value_tell)
+    except (OSError, ValueError):
+        return None
+    if arr.size != rows * cols:
+        return None
+    return arr.reshape(rows, cols)
+
+
+def _strided_sample(arr: np.ndarray, max_elements: int = _MAX_STATS_ELEMENTS) -> np.ndarray:
+    """Return a strided view of *arr* holding roughly *max_elements* values.
+
+    The consistency score only compares mean/std against coarse thresholds, so
+    a regular subsample is enough on large arrays. Small arrays are returned as-is.
+    """
+    if arr.size <= max_elements:
+        return arr
+    stride = max(1, int((arr.size / max_elements) ** (1 / arr.ndim)))
+    return arr[(slice(None, None, stride),) * arr.ndim]
+
+
+def extract_image_stats(ds: Any, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Compute image statistics from a single ds.pixel_array.
+
+    min/max are exact; mean/std are computed on a strided subsample when the
+    array holds more than ``_MAX_STATS_ELEMENTS`` values.
+
+    Raises:
+        ValueError: if pixel_array cannot be read.
+    """
+    raw = _decode_pixels(ds)
+    sample = _strided_sample(raw).astype(np.float32)
+    mn, mx = float(raw.min()), float(raw.max())
+    mean, std = float(sample.mean()), float(sample.std())
 
     return {
-        "shape":                  list(arr.shape),
-        "dtype":                  str(arr.dtype),
+        "shape":                  list(raw.shape),
+        "dtype":                  str(sample.dtype),
         "min":                    round(mn, 4),
         "max":                    round(mx, 4),
         "mean":                   round(mean, 4),
         "std":                    round(std, 4),
-        "data_consistency_score": _consistency_score(mn, mx, std, arr.size, _metadata_completeness(metadata)),
+        "data_consistency_score": _consistency_score(mn, mx, std, raw.size, _metadata_completeness(metadata)),
     }
 
 
@@ -236,8 +310,11 @@ def _compute_series_pixel_stats(
     arrays: list[np.ndarray] = []
     for path in sample:
         try:
-            ds = pydicom.dcmread(str(path))
-            arrays.append(ds.pixel_array.astype(np.float32))
+            ds = pydicom.dcmread(str(path), defer_size=1024)
+            arr = _read_pixels_direct(ds, path)
+            if arr is None:
+                arr = _decode_pixels(ds)  # loads the deferred PixelData from the same dataset
+            arrays.append(arr.astype(np.float32))
         except Exception:
             continue
 
@@ -294,21 +371,30 @@ def _build_imaging_block(
 # Schema validation
 # ---------------------------------------------------------------------------
 
-def validate_analysis(analysis: dict[str, Any]) -> None:
-    """Validate *analysis* against ``data/schema/analysis_schema.json``."""
+@lru_cache(maxsize=1)
+def _schema_validator() -> Any:
+    """Load, check and compile the analysis schema once per process."""
     import jsonschema
 
     if not _SCHEMA_PATH.exists():
         raise FileNotFoundError(f"JSON Schema not found: {_SCHEMA_PATH}")
 
-    schema = json.loads(_SCHEMA_PATH.read_text(encoding="utf-8"))
-    try:
-        jsonschema.validate(instance=analysis, schema=schema)
-    except jsonschema.ValidationError as exc:
-        field_path = " → ".join(str(p) for p in exc.absolute_path) or "<root>"
+    schema = read_json(_SCHEMA_PATH)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def validate_analysis(analysis: dict[str, Any]) -> None:
+    """Validate *analysis* against ``data/schema/analysis_schema.json``."""
+    import jsonschema
+
+    error = jsonschema.exceptions.best_match(_schema_validator().iter_errors(analysis))
+    if error is not None:
+        field_path = " → ".join(str(p) for p in error.absolute_path) or "<root>"
         raise jsonschema.ValidationError(
-            f"Schema validation FAILED at [{field_path}]: {exc.message}"
-        ) from exc
+            f"Schema validation FAILED at [{field_path}]: {error.message}"
+        ) from error
 
 
 # ---------------------------------------------------------------------------
@@ -334,13 +420,15 @@ def analyze_dicom(
     """
     import pydicom
 
-    dicom_input = Path(dicom_input)
-    if not dicom_input.exists():
-        raise FileNotFoundError(f"DICOM input is required — file not found: {dicom_input}")
+    if not isinstance(dicom_input, Path):
+        dicom_input = Path(dicom_input)
 
+    # is_file()/is_dir() each cost one stat — no separate exists() probe needed
     if dicom_input.is_file():
         return _analyze_single_file(dicom_input, case_id, pydicom)
-    return _analyze_series_folder(dicom_input, case_id, pydicom)
+    if dicom_input.is_dir():
+        return _analyze_series_folder(dicom_input, case_id, pydicom)
+    raise FileNotFoundError(f"DICOM input is required — file not found: {dicom_input}")
 
 
 def _analyze_single_file(path: Path, case_id: str, pydicom: Any) -> dict[str, Any]:
@@ -495,12 +583,9 @@ def _build_parser() -> argparse.ArgumentParser:
 
 def main(argv: list[str] | None = None) -> None:
     args = _build_parser().parse_args(argv)
+    dicom_input: Path = args.dicom
 
-    dicom_input = Path(args.dicom)
-    if not dicom_input.exists():
-        print(f"[dicom_analysis] ERROR: not found: {dicom_input}", file=sys.stderr)
-        sys.exit(1)
-
+    # analyze_dicom raises FileNotFoundError for a missing input — no pre-check here
     try:
         analysis = analyze_dicom(dicom_input, case_id=args.case_id)
     except (ValueError, FileNotFoundError) as exc:
@@ -516,10 +601,9 @@ def main(argv: list[str] | None = None) -> None:
             sys.exit(1)
 
     stem = analysis["case_id"]
-    out_path = args.out or dicom_input.parent / f"{stem}_analysis.json"
-    out_path = Path(out_path)
+    out_path: Path = args.out or dicom_input.parent / f"{stem}_analysis.json"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(analysis, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out_path, analysis)  # same writer as run_case
     print(f"[dicom_analysis] Written → {out_path}")
 
 
@@ -5,37 +5,52 @@ unit-testable without real DICOM files.
 """
 from __future__ import annotations
 
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
+# The only tags read_dicom_metadata() needs — pydicom skips converting the rest
+_METADATA_TAGS = [
+    "AccessionNumber", "StudyInstanceUID", "SeriesInstanceUID", "StudyDate",
+    "Modality", "SeriesDescription", "SeriesNumber",
+]
+
+# Folders smaller than this are scanned inline; larger ones go to worker processes
+_PARALLEL_MIN_FILES = 512
+# Paths per worker task — amortises pickling / IPC over many header reads
+_SCAN_CHUNKSIZE = 128
 
 def _str_tag(ds: Any, tag: str, default: str = "") -> str:
     """Safely read a DICOM tag as a stripped string."""
-    try:
-        val = getattr(ds, tag, None)
-        if val is None:
-            return default
-        return str(val).strip()
-    except Exception:
-        return default
+    val = getattr(ds, tag, None)
+    return str(val).strip() if val is not None else default
 
 
 def _int_tag(ds: Any, tag: str) -> int | None:
     """Safely read a DICOM tag as int."""
+    val = getattr(ds, tag, None)
+    if val is None:
+        return None
     try:
-        val = getattr(ds, tag, None)
-        return int(val) if val is not None else None
+        return int(val)
     except (ValueError, TypeError):
         return None
 
 
+# DICOM DA is ASCII-only — re.ASCII keeps \d from matching other Unicode digits
+_DICOM_DATE_RE = re.compile(r"\d{8}", re.ASCII)
+
+
 def parse_dicom_date(raw: str) -> str | None:
     """Convert DICOM date format YYYYMMDD → ISO YYYY-MM-DD.
 
     Returns None for empty or malformed values.
     """
     s = raw.strip() if raw else ""
-    if len(s) == 8 and s.isdigit():
+    if _DICOM_DATE_RE.fullmatch(s):
         return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
     return None
 
@@ -68,38 +83,54 @@ def read_dicom_metadata(ds: Any) -> dict[str, Any]:
     }
 
 
-def scan_dicom_dir(dicom_dir: Path) -> list[dict[str, Any]]:
+def _read_record(path: str) -> dict[str, Any] | None:
+    """Metadata record for one file, or None when pydicom cannot read it.
+
+    Module-level so it pickles into :func:`scan_dicom_dir`'s worker processes.
+    """
+    import pydicom  # import here so the module is importable without pydicom
+
+    try:
+        ds = pydicom.dcmread(path, stop_before_pixels=True, force=False, specific_tags=_METADATA_TAGS)
+    except Exception:
+        return None  # skip non-DICOM files silently
+    meta = read_dicom_metadata(ds)
+    meta["file_path"] = path
+    return meta
+
+
+def scan_dicom_dir(dicom_dir: Path, max_workers: int | None = None) -> list[dict[str, Any]]:
     """Recursively scan *dicom_dir* and return metadata for every DICOM file found.
 
     Only files that can be read by pydicom are included; others are silently
     skipped. Pixel data is never loaded (``stop_before_pixels=True``).
 
+    Header parsing is CPU-bound and holds the GIL, so large folders are read
+    in worker processes (*max_workers*, default one per core); small ones are
+    read inline, where process start-up would cost more than it saves.
+
     Args:
         dicom_dir: Root directory to scan.
+        max_workers: Worker process cap for large folders.
 
     Returns:
-        List of metadata dicts (one per file).
+        List of metadata dicts (one per file), in discovery order.
     """
-    import pydicom  # import here so the module is importable without pydicom
-
-    records: list[dict[str, Any]] = []
     patterns = ("**/*.dcm", "**/*.DCM", "**/*")  # some DICOMs have no extension
 
     seen: set[Path] = set()
+    paths: list[str] = []
     for pattern in patterns:
         for fpath in dicom_dir.glob(pattern):
             if not fpath.is_file() or fpath in seen:
                 continue
             seen.add(fpath)
-            try:
-                ds = pydicom.dcmread(str(fpath), stop_before_pixels=True, force=False)
-                meta = read_dicom_metadata(ds)
-                meta["file_path"] = str(fpath)
-                records.append(meta)
-            except Exception:
-                pass  # skip non-DICOM files silently
+            paths.append(str(fpath))
 
-    return records
+    if len(paths) < _PARALLEL_MIN_FILES:
+        return [meta for meta in map(_read_record, paths) if meta is not None]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return [meta for meta in pool.map(_read_record, paths, chunksize=_SCAN_CHUNKSIZE) if meta is not None]
 
 
 def group_by_accession(
@@ -109,11 +140,11 @@ def group_by_accession(
 
     Records without an AccessionNumber are placed under the key ``""``.
     """
-    groups: dict[str, list[dict[str, Any]]] = {}
+    # defaultdict: no throwaway [] per record as with setdefault
+    groups: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
     for rec in records:
-        key = rec.get("accession_number", "") or ""
-        groups.setdefault(key, []).append(rec)
-    return groups
+        groups[rec.get("accession_number") or ""].append(rec)
+    return dict(groups)
 
 
 def build_study_summary(records: list[dict[str, Any]]) -> dict[str, Any]:
@@ -130,35 +161,38 @@ def build_study_summary(records: list[dict[str, Any]]) -> dict[str, Any]:
     if not records:
         return {}
 
-    # Pick study-level fields from first record (they should be identical)
-    study_uid = next(
-        (r["study_instance_uid"] for r in records if r.get("study_instance_uid")), ""
-    )
-    study_date = next(
-        (r["study_date"] for r in records if r.get("study_date")), None
-    )
-
-    # Group by series
-    series_map: dict[str, list[dict]] = {}
+    # One pass: study-level fields (first non-empty value; they should be
+    # identical) and per-series entries keyed by UID, counting files as we go
+    study_uid: str = ""
+    study_date: str | None = None
+    series_map: dict[str, dict[str, Any]] = {}
+    # Series without a SeriesNumber sort last, in discovery order — kept apart
+    # so the numbered ones can be sorted with a plain C-level itemgetter key
+    numbered: list[dict[str, Any]] = []
+    unnumbered: list[dict[str, Any]] = []
     for r in records:
+        if not study_uid:
+            study_uid = r.get("study_instance_uid") or ""
+        if study_date is None:
+            study_date = r.get("study_date") or None
+
         sid = r.get("series_instance_uid", "")
-        series_map.setdefault(sid, []).append(r)
-
-    series_list: list[dict[str, Any]] = []
-    for sid, files in series_map.items():
-        first = files[0]
-        series_list.append({
-            "series_instance_uid": sid,
-            "modality": first.get("modality", ""),
-            "series_description": first.get("series_description", ""),
-            "series_number": first.get("series_number"),
-            "file_count": len(files),
-        })
+        entry = series_map.get(sid)
+        if entry is None:
+            entry = series_map[sid] = {
+                "series_instance_uid": sid,
+                "modality": r.get("modality", ""),
+                "series_description": r.get("series_description", ""),
+                "series_number": r.get("series_number"),
+                "file_count": 1,
+            }
+            (unnumbered if entry["series_number"] is None else numbered).append(entry)
+        else:
+            entry["file_count"] += 1
 
     # Sort series by series_number (None last)
-    series_list.sort(
-        key=lambda s: (s["series_number"] is None, s["series_number"] or 0)
-    )
+    numbered.sort(key=itemgetter("series_number"))
+    series_list = numbered + unnumbered
 
     ct_series_uid = next(
         (s["series_instance_uid"] for s in series_list if s["modality"] == "CT"), None
@@ -1,7 +1,9 @@
 """Deterministic report generation from timeline + analysis JSON.
 
-Fills src/reporting/templates/thorax_report.md via Jinja2.
-No LLM is involved — this is a pure template-filling step.
+Fills src/reporting/templates/thorax_report.md via Jinja2, or via the
+Rust-backed ``minijinja`` when it is installed (``pip install -e ".[speedups]"``);
+both render the template identically. No LLM is involved — this is a pure
+template-filling step.
 
 Usage (CLI):
     python -m src.pipelines.generate_report \\
@@ -12,73 +14,160 @@ Usage (CLI):
 from __future__ import annotations
 
 import argparse
-import json
 import sys
+import time
+from collections.abc import Callable
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any
 
 from jinja2 import Environment, FileSystemLoader, StrictUndefined
 
+try:
+    import minijinja  # optional Rust extension — renders outside the CPython eval loop
+except ImportError:  # pragma: no cover - exercised when minijinja is absent
+    minijinja = None  # type: ignore[assignment]
+
+from src.pipelines.json_io import read_json
+
 # Template directory — relative to this file's package root
 _TEMPLATE_DIR = Path(__file__).parent.parent / "reporting" / "templates"
 _TEMPLATE_NAME = "thorax_report.md"
 
 PIPELINE_VERSION = "0.1.0"
 
+# Context defaults — built once at import, shared read-only across renders
+_DEFAULT_EVIDENCE: dict[str, Any] = {
+    "rule_applied": "N/A",
+    "progression_triggers": [],
+    "response_triggers": [],
+    "thresholds": {
+        "progression_pct": 20.0,
+        "progression_abs_mm": 5.0,
+        "response_pct": 30.0,
+    },
+}
+
+_DEFAULT_CALIBRATION: dict[str, Any] = {"method": "N/A", "pixel_spacing_mm": None}
+
+_DEFAULT_IMAGING: dict[str, Any] = {
+    "input_kind": "single",
+    "n_slices": 1,
+    "volume_shape": [1, None, None],
+    "spacing_mm": [None, None, None],
+    "series_instance_uid": None,
+    "sorting_key_used": "none",
+    "is_3d": False,
+}
+
+# KPI keys always present in the context (value used when the analysis lacks it)
+_KPI_DEFAULTS: dict[str, Any] = {
+    "sum_diameters_baseline_mm":   None,
+    "sum_diameters_current_mm":    None,
+    "sum_diameters_delta_pct":     None,
+    "dominant_lesion_baseline_mm": None,
+    "dominant_lesion_current_mm":  None,
+    "dominant_lesion_delta_pct":   None,
+    "lesion_count_baseline":       0,
+    "lesion_count_current":        0,
+    "lesion_count_delta":          0,
+    "growth_rate_mm_per_day":      None,
+    "data_completeness_score":     0.0,
+}
+
+# Section 9 — fixed text per overall_status; anything else gets "unknown"
+_RECOMMENDATIONS: dict[str, str] = {
+    "progression": (
+        "- Consultation oncologique recommandée.\n"
+        "- Réévaluation thérapeutique à envisager.\n"
+        "- Prochain contrôle imaging : 4 semaines."
+    ),
+    "response": (
+        "- Poursuite du traitement en cours.\n"
+        "- Prochain contrôle imaging : 3 mois."
+    ),
+    "stable": (
+        "- Surveillance radiologique.\n"
+        "- Prochain contrôle imaging : 3–6 mois selon contexte clinique."
+    ),
+    "unknown": "- Données insuffisantes — bilan complémentaire à envisager.",
+}
+
 
 # ---------------------------------------------------------------------------
 # Context builder
 # ---------------------------------------------------------------------------
 
-def _latest_section(
-    timeline: list[dict[str, Any]], key: str
-) -> str | None:
-    """Return the most recent non-null value of report_sections[key]."""
+# report_sections keys surfaced as latest_<key> in the context
+_SECTION_KEYS: tuple[str, ...] = ("clinical_information", "study_technique", "report", "conclusions")
+
+
+def _latest_sections(timeline: list[dict[str, Any]]) -> dict[str, str | None]:
+    """Most recent non-null value of each report_sections key, in one backward pass.
+
+    An empty timeline returns all-None without any scanning; otherwise the
+    walk stops as soon as every key has been found.
+    """
+    found: dict[str, str | None] = dict.fromkeys(_SECTION_KEYS)
+    missing = len(_SECTION_KEYS)
     for exam in reversed(timeline):
-        val = exam.get("report_sections", {}).get(key)
-        if val:
-            return val
-    return None
+        sections = exam.get("report_sections")
+        if not sections:
+            continue
+        for key in _SECTION_KEYS:
+            if found[key] is None:
+                val = sections.get(key)
+                if val:
+                    found[key] = val
+                    missing -= 1
+        if not missing:
+            break
+    return found
+
+
+def _norm_exam(d: dict) -> dict:
+    """Ensure 'study_date' key is always present (legacy path uses 'date')."""
+    d = d or {}
+    if "study_date" not in d and "date" in d:
+        d = {**d, "study_date": d["date"]}
+    if "study_date" not in d:
+        d = {**d, "study_date": None}
+    return d
+
+
+@lru_cache(maxsize=1)
+def _generated_at(minute: int) -> str:
+    """Report timestamp for the epoch *minute* — the stamp has minute resolution."""
+    return datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M")
 
 
 def build_context(
     timeline: list[dict[str, Any]],
     analysis: dict[str, Any],
+    generated_at: str | None = None,
 ) -> dict[str, Any]:
     """Assemble the Jinja2 template context from pipeline data.
 
     Supports both:
     - Legacy Excel-timeline analysis (baseline_exam / last_exam keys)
     - Imaging-first analysis  (baseline_study / last_study keys + studies list)
-    """
-    def _norm_exam(d: dict) -> dict:
-        """Ensure 'study_date' key is always present (legacy path uses 'date')."""
-        d = d or {}
-        if "study_date" not in d and "date" in d:
-            d = {**d, "study_date": d["date"]}
-        if "study_date" not in d:
-            d = {**d, "study_date": None}
-        return d
 
+    *generated_at* overrides the report timestamp (default: the current minute).
+    """
     # Unify baseline/last regardless of which analysis path produced the data
     baseline = _norm_exam(analysis.get("baseline_exam") or analysis.get("baseline_study") or {})
     last     = _norm_exam(analysis.get("last_exam")     or analysis.get("last_study")     or {})
 
-    _default_evidence = {
-        "rule_applied": "N/A",
-        "progression_triggers": [],
-        "response_triggers": [],
-        "thresholds": {
-            "progression_pct": 20.0,
-            "progression_abs_mm": 5.0,
-            "response_pct": 30.0,
-        },
-    }
+    dicom   = analysis.get("dicom") or {}
+    kpi_src = analysis.get("kpi", {})
+
+    status = analysis.get("overall_status", "unknown")
+    sections = _latest_sections(timeline)
 
     return {
         # ── meta ──────────────────────────────────────────────────────────
-        "generated_at":    datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "generated_at":    generated_at or _generated_at(int(time.time()) // 60),
         "pipeline_version": analysis.get("pipeline_version", PIPELINE_VERSION),
         # ── clinical validation block (None when skipped) ─────────────────
         "validation": analysis.get("validation"),
@@ -89,65 +178,46 @@ def build_context(
         "last_exam_date":  analysis.get("last_exam_date"),
         "time_delta_days": analysis.get("time_delta_days"),
         # ── analysis results ──────────────────────────────────────────────
-        "overall_status":  analysis.get("overall_status", "unknown"),
+        "overall_status":  status,
+        "recommendations": _RECOMMENDATIONS.get(status, _RECOMMENDATIONS["unknown"]),
         "lesion_deltas":   analysis.get("lesion_deltas", []),
         "baseline_exam":   baseline,  # legacy compat
         "last_exam":       last,      # legacy compat
         "baseline_study":  baseline,  # imaging-first
         "last_study":      last,      # imaging-first
-        "evidence":        analysis.get("evidence", _default_evidence),
+        "evidence":        analysis.get("evidence", _DEFAULT_EVIDENCE),
         # ── imaging-first data ────────────────────────────────────────────
         "studies":     analysis.get("studies",     []),
-        "calibration": analysis.get("calibration", {"method": "N/A", "pixel_spacing_mm": None}),
+        "calibration": analysis.get("calibration", _DEFAULT_CALIBRATION),
         "warnings":    analysis.get("warnings",    []),
         # ── DICOM analysis block (from dicom_analysis.py) ─────────────────
-        "dicom_metadata":    (analysis.get("dicom") or {}).get("metadata"),
-        "dicom_image_stats": (analysis.get("dicom") or {}).get("image_stats"),
+        "dicom_metadata":    dicom.get("metadata"),
+        "dicom_image_stats": dicom.get("image_stats"),
         # ── latest pseudo-report sections ─────────────────────────────────
         # Priority: Excel timeline > LLM enrichment > None (template shows "Non disponible")
         "latest_clinical_information": (
-            _latest_section(timeline, "clinical_information")
+            sections["clinical_information"]
             or analysis.get("latest_clinical_information")
         ),
         "latest_study_technique": (
-            _latest_section(timeline, "study_technique")
+            sections["study_technique"]
             or analysis.get("latest_study_technique")
         ),
         "latest_report": (
-            _latest_section(timeline, "report")
+            sections["report"]
             or analysis.get("latest_report")
         ),
         "latest_conclusions": (
-            _latest_section(timeline, "conclusions")
+            sections["conclusions"]
             or analysis.get("latest_conclusions")
         ),
         # ── DICOM input geometry ──────────────────────────────────────────
-        "imaging": analysis.get("imaging") or {
-            "input_kind": "single",
-            "n_slices": 1,
-            "volume_shape": [1, None, None],
-            "spacing_mm": [None, None, None],
-            "series_instance_uid": None,
-            "sorting_key_used": "none",
-            "is_3d": False,
-        },
+        "imaging": analysis.get("imaging") or _DEFAULT_IMAGING,
         # ── status gating ─────────────────────────────────────────────────
         "status_reason":      analysis.get("status_reason", ""),
         "status_explanation": analysis.get("status_explanation", ""),
         # ── KPIs (all keys always present; None when not computable) ──────
-        "kpi": {
-            "sum_diameters_baseline_mm":   analysis.get("kpi", {}).get("sum_diameters_baseline_mm"),
-            "sum_diameters_current_mm":    analysis.get("kpi", {}).get("sum_diameters_current_mm"),
-            "sum_diameters_delta_pct":     analysis.get("kpi", {}).get("sum_diameters_delta_pct"),
-            "dominant_lesion_baseline_mm": analysis.get("kpi", {}).get("dominant_lesion_baseline_mm"),
-            "dominant_lesion_current_mm":  analysis.get("kpi", {}).get("dominant_lesion_current_mm"),
-            "dominant_lesion_delta_pct":   analysis.get("kpi", {}).get("dominant_lesion_delta_pct"),
-            "lesion_count_baseline":       analysis.get("kpi", {}).get("lesion_count_baseline", 0),
-            "lesion_count_current":        analysis.get("kpi", {}).get("lesion_count_current", 0),
-            "lesion_count_delta":          analysis.get("kpi", {}).get("lesion_count_delta", 0),
-            "growth_rate_mm_per_day":      analysis.get("kpi", {}).get("growth_rate_mm_per_day"),
-            "data_completeness_score":     analysis.get("kpi", {}).get("data_completeness_score", 0.0),
-        },
+        "kpi": {k: kpi_src.get(k, default) for k, default in _KPI_DEFAULTS.items()},
     }
 
 
@@ -155,22 +225,40 @@ def build_context(
 # Renderer
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
+def _load_template(template_dir: str, template_name: str) -> Callable[..., str]:
+    """Compile *template_name* once per process and return its render callable."""
+    if minijinja is not None:
+        source = (Path(template_dir) / template_name).read_text(encoding="utf-8")
+        mj_env = minijinja.Environment(
+            templates={template_name: source},
+            undefined_behavior="strict",
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        return partial(mj_env.render_template, template_name)
+
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,  # templates ship with the package — never re-stat them
+    )
+    return env.get_template(template_name).render
+
+
 def render_report(
     timeline: list[dict[str, Any]],
     analysis: dict[str, Any],
     template_dir: Path = _TEMPLATE_DIR,
     template_name: str = _TEMPLATE_NAME,
+    generated_at: str | None = None,
 ) -> str:
     """Render the Markdown report. Returns the rendered string."""
-    env = Environment(
-        loader=FileSystemLoader(str(template_dir)),
-        undefined=StrictUndefined,
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    template = env.get_template(template_name)
-    context = build_context(timeline, analysis)
-    return template.render(**context)
+    render = _load_template(str(template_dir), template_name)
+    context = build_context(timeline, analysis, generated_at)
+    return render(**context)
 
 
 def generate_report(
@@ -182,8 +270,8 @@ def generate_report(
 
     Returns the path of the written Markdown file.
     """
-    timeline: list[dict] = json.loads(timeline_path.read_text(encoding="utf-8"))
-    analysis: dict = json.loads(analysis_path.read_text(encoding="utf-8"))
+    timeline: list[dict] = read_json(timeline_path)
+    analysis: dict = read_json(analysis_path)
 
     print(
         f"[generate_report] {len(timeline)} exam(s), "
@@ -196,10 +284,11 @@ def generate_report(
     if out_path is None:
         case_id = analysis_path.stem.replace("_analysis", "")
         out_path = analysis_path.parent / f"{case_id}_final_report.md"
+    elif not isinstance(out_path, Path):
+        out_path = Path(out_path)
 
-    out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(rendered, encoding="utf-8")
+    out_path.write_bytes(rendered.encode("utf-8"))
     print(f"[generate_report] Written → {out_path}  ({len(rendered)} chars)")
     return out_path
 
@@ -223,14 +312,14 @@ def main(argv: list[str] | None = None) -> None:
     args = _build_parser().parse_args(argv)
 
     for p in (args.timeline, args.analysis):
-        if not Path(p).exists():
+        if not p.is_file():
             print(f"[generate_report] ERROR: file not found: {p}", file=sys.stderr)
             sys.exit(1)
 
     try:
         out = generate_report(
-            timeline_path=Path(args.timeline),
-            analysis_path=Path(args.analysis),
+            timeline_path=args.timeline,
+            analysis_path=args.analysis,
             out_path=args.out,
         )
         print(f"[generate_report] Done → {out}")
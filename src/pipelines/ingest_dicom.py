@@ -7,12 +7,12 @@ Usage (CLI):
     python -m src.pipelines.ingest_dicom \\
         --timeline  data/processed/CASE_01_timeline.json \\
         --dicom-dir /path/to/dicom_root \\
-        --out       data/processed/CASE_01_timeline_enriched.json
+        --out       data/processed/CASE_01_timeline_enriched.json \\
+        [--jsonl]   # one exam per line instead of an indented array
 """
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Any
@@ -22,6 +22,7 @@ from src.pipelines.dicom_utils import (
     group_by_accession,
     scan_dicom_dir,
 )
+from src.pipelines.json_io import read_json, write_json, write_jsonl
 
 
 def enrich_timeline(
@@ -45,6 +46,7 @@ def enrich_timeline(
     print(f"[ingest_dicom] Found {len(records)} DICOM file(s).")
 
     accession_index = group_by_accession(records)
+    del records  # the index holds every record; drop the flat list
     print(
         f"[ingest_dicom] Unique AccessionNumbers in DICOM dir: {len(accession_index)}"
     )
@@ -74,6 +76,7 @@ def ingest_dicom(
     timeline_path: Path,
     dicom_dir: Path,
     out_path: Path | None = None,
+    jsonl: bool = False,
 ) -> list[dict[str, Any]]:
     """Load, enrich, and write the enriched timeline.
 
@@ -82,6 +85,9 @@ def ingest_dicom(
         dicom_dir:     Root directory containing DICOM files.
         out_path:      Override output path.
                        Defaults to same dir as timeline, with ``_enriched`` suffix.
+        jsonl:         Write JSON Lines (one exam per line, serialised one at a
+                       time rather than as one big string) instead of a
+                       single indented JSON array.
 
     Returns:
         Enriched list of exam dicts.
@@ -92,15 +98,19 @@ def ingest_dicom(
     if not dicom_dir.exists():
         raise FileNotFoundError(f"DICOM directory not found: {dicom_dir}")
 
-    timeline: list[dict] = json.loads(timeline_path.read_text(encoding="utf-8"))
+    timeline: list[dict] = read_json(timeline_path)
     enriched = enrich_timeline(timeline, dicom_dir)
 
     if out_path is None:
         stem = timeline_path.stem  # e.g. CASE_01_timeline
-        out_path = timeline_path.parent / f"{stem}_enriched.json"
+        suffix = ".jsonl" if jsonl else ".json"
+        out_path = timeline_path.parent / f"{stem}_enriched{suffix}"
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(enriched, ensure_ascii=False, indent=2), encoding="utf-8")
+    if jsonl:
+        write_jsonl(out_path, enriched)
+    else:
+        write_json(out_path, enriched)
     print(f"[ingest_dicom] Written → {out_path}")
     return enriched
 
@@ -119,6 +129,8 @@ def _build_parser() -> argparse.ArgumentParser:
                    help="Root directory containing DICOM files.")
     p.add_argument("--out",       default=None,  type=Path,
                    help="Output path (default: *_timeline_enriched.json).")
+    p.add_argument("--jsonl",     action="store_true",
+                   help="Write JSON Lines (one exam per line) instead of a JSON array.")
     return p
 
 
@@ -129,6 +141,7 @@ def main(argv: list[str] | None = None) -> None:
             timeline_path=args.timeline,
             dicom_dir=args.dicom_dir,
             out_path=args.out,
+            jsonl=args.jsonl,
         )
     except (FileNotFoundError, ValueError) as exc:
         print(f"[ingest_dicom] ERROR: {exc}", file=sys.stderr)
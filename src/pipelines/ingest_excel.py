@@ -25,41 +25,50 @@ Output schema (one object per row / exam):
 from __future__ import annotations
 
 import argparse
-import json
 import math
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
+from src.pipelines.json_io import write_json
 from src.pipelines.parsers import parse_lesion_sizes, split_report_sections
 
 # ---------------------------------------------------------------------------
 # Column discovery helpers
 # ---------------------------------------------------------------------------
 
+# Separators dropped from column names before keyword matching
+_NORM_TABLE = str.maketrans("", "", " _-/")
+
+
 def _norm(s: str) -> str:
-    """Lowercase and strip all separators for fuzzy column matching."""
-    return s.lower().replace(" ", "").replace("_", "").replace("/", "").replace("-", "")
+    """Casefold and strip all separators for fuzzy column matching."""
+    return s.casefold().translate(_NORM_TABLE)
+
 
+def _find_col(columns: list[tuple[str, str]], *keywords: str) -> str | None:
+    """Return the first column whose normalised name contains any keyword.
 
-def _find_col(columns: list[str], *keywords: str) -> str | None:
-    """Return the first column whose normalised name contains any keyword."""
-    for col in columns:
-        col_n = _norm(col)
+    *columns* holds ``(name, _norm(name))`` pairs so each header is normalised once.
+    """
+    for col, col_n in columns:
         for kw in keywords:
             if kw in col_n:
                 return col
     return None
 
 
-def _find_all_cols(columns: list[str], *keywords: str) -> list[str]:
+def _find_all_cols(columns: list[tuple[str, str]], *keywords: str) -> list[str]:
     """Return ALL columns whose normalised name contains any keyword."""
     seen: set[str] = set()
     result: list[str] = []
-    for col in columns:
-        col_n = _norm(col)
+    for col, col_n in columns:
         for kw in keywords:
             if kw in col_n and col not in seen:
                 result.append(col)
@@ -95,12 +104,22 @@ def _to_accession_str(val: Any) -> str:
     return s
 
 
+# ISO dates as pandas renders Excel date cells under dtype=str ("2024-01-15 00:00:00")
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[ T]00:00:00)?", re.ASCII)
+
+
 def _to_date(val: Any) -> str | None:
     """Parse any date-like value to ISO-8601 string; return None on failure."""
     if val is None:
         return None
     if isinstance(val, float) and math.isnan(val):
         return None
+    # Fast path: plain ISO strings skip the Timestamp/dateutil machinery
+    if isinstance(val, str) and (m := _ISO_DATE_RE.fullmatch(val.strip())):
+        try:
+            return date(int(m[1]), int(m[2]), int(m[3])).isoformat()
+        except ValueError:
+            return None
     try:
         return pd.to_datetime(val).strftime("%Y-%m-%d")
     except Exception:
@@ -113,7 +132,7 @@ def _to_date(val: Any) -> str | None:
 
 def _discover_columns(df: pd.DataFrame) -> dict[str, Any]:
     """Map semantic roles to actual DataFrame column names."""
-    cols = list(df.columns)
+    cols = [(col, _norm(col)) for col in df.columns]
     return {
         "patient_id":        _find_col(cols, "patientid", "patient"),
         "accession_number":  _find_col(cols, "accessionnumber", "accession"),
@@ -125,41 +144,84 @@ def _discover_columns(df: pd.DataFrame) -> dict[str, Any]:
     }
 
 
-def _row_to_exam(row: pd.Series, col_map: dict[str, Any]) -> dict[str, Any]:
-    """Convert one DataFrame row into the target exam dict."""
-    # patient_id
-    pid_col = col_map["patient_id"]
-    patient_id = _to_str(row[pid_col]) if pid_col else ""
+def _str_column(df: pd.DataFrame, col: str | None) -> pd.Series:
+    """Vectorised ``_to_str`` over one column; all-empty Series when *col* is None."""
+    if not col:
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+    return df[col].fillna("").astype(str).str.strip()
 
-    # accession_number — always a clean string, never '123.0'
-    acc_col = col_map["accession_number"]
-    accession_number = _to_accession_str(row[acc_col]) if acc_col else ""
 
-    # study_date
-    date_col = col_map["date"]
-    study_date = _to_date(row[date_col]) if date_col else None
+def _accession_column(df: pd.DataFrame, col: str | None) -> pd.Series:
+    """Vectorised ``_to_accession_str``: drop the '.0' Excel adds to whole numbers."""
+    s = _str_column(df, col)
+    head = s.str[:-2]
+    float_like = s.str.endswith(".0") & head.str.lstrip("-").str.isdigit()
+    return head.where(float_like, s)
 
-    # lesion sizes — collect from all matching columns, flatten, deduplicate
-    raw_sizes: list[float] = []
-    for lc in col_map["lesion_sizes"]:
-        raw_sizes.extend(parse_lesion_sizes(row[lc]))
-    lesion_sizes = sorted(set(raw_sizes))
 
-    # raw report text
-    rep_col = col_map["report"]
-    report_raw = _to_str(row[rep_col]) if rep_col else ""
+def _date_column(df: pd.DataFrame, col: str | None) -> list[str | None]:
+    """Vectorised ``_to_date``: one ``pd.to_datetime`` call for the whole column."""
+    if not col:
+        return [None] * len(df)
+    values = df[col]
+    try:
+        # Vectorised ISO-8601 parser first; only the leftovers go through the
+        # much slower per-element "mixed" inference
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(values[retry], errors="coerce", format="mixed")
+        return [d if isinstance(d, str) else None for d in parsed.dt.strftime("%Y-%m-%d")]
+    except Exception:
+        # e.g. mixed tz-aware / naive values — fall back to per-cell parsing
+        return [_to_date(v) for v in values]
 
-    # parsed report sections
-    report_sections = split_report_sections(report_raw)
 
-    return {
-        "patient_id":       patient_id,
-        "accession_number": accession_number,
-        "study_date":       study_date,
-        "lesion_sizes_mm":  lesion_sizes,
-        "report_raw":       report_raw,
-        "report_sections":  report_sections,
-    }
+def _lesion_column(df: pd.DataFrame, cols: list[str]) -> list[list[float]]:
+    """Parse every lesion-size column of each row into one sorted, deduplicated list.
+
+    Cells are joined with a space first — the parser treats any separator as
+    whitespace, so this is equivalent to parsing each cell and concatenating.
+    """
+    if not cols:
+        return [[] for _ in range(len(df))]
+    first, *rest = (df[c].fillna("").astype(str) for c in cols)
+    joined = first.str.cat(list(rest), sep=" ") if rest else first
+    # Rows hold a handful of sizes: sorted(set()) beats np.unique (per row or
+    # frame-wide lexsort + split) because the NumPy call/split overhead dominates.
+    # Each distinct cell text is parsed once — blank cells and copied-down
+    # values repeat a lot; every row still gets its own list.
+    parsed: dict[str, list[float]] = {}
+    out: list[list[float]] = []
+    for text in joined:
+        sizes = parsed.get(text)
+        if sizes is None:
+            sizes = parsed[text] = sorted(set(parse_lesion_sizes(text)))
+        out.append(sizes.copy())
+    return out
+
+
+def _frame_to_exams(df: pd.DataFrame, col_map: dict[str, Any]) -> list[dict[str, Any]]:
+    """Convert the DataFrame into exam dicts column-wise (no per-row Series access)."""
+    report_raw = _str_column(df, col_map["report"]).tolist()
+    return [
+        {
+            "patient_id":       patient_id,
+            "accession_number": accession_number,
+            "study_date":       study_date,
+            "lesion_sizes_mm":  lesion_sizes,
+            "report_raw":       report,
+            "report_sections":  split_report_sections(report),
+        }
+        for patient_id, accession_number, study_date, lesion_sizes, report in zip(
+            _str_column(df, col_map["patient_id"]).tolist(),
+            _accession_column(df, col_map["accession_number"]).tolist(),
+            _date_column(df, col_map["date"]),
+            _lesion_column(df, col_map["lesion_sizes"]),
+            report_raw,
+            strict=True,
+        )
+    ]
 
 
 def ingest_excel(
@@ -192,8 +254,9 @@ def ingest_excel(
     df = pd.read_excel(excel_path, sheet_name=sheet_name, dtype=str, engine="openpyxl")
     # Strip column names
     df.columns = [str(c).strip() for c in df.columns]
-    # Drop fully empty rows and fully empty columns
-    df = df.dropna(how="all").dropna(axis=1, how="all").reset_index(drop=True)
+    # Drop fully empty rows and fully empty columns from a single notna() scan
+    mask = df.notna()
+    df = df.loc[mask.any(axis=1), mask.any(axis=0)].reset_index(drop=True)
 
     if df.empty:
         raise ValueError(f"No data rows found in {excel_path} (sheet={sheet_name!r}).")
@@ -205,7 +268,7 @@ def ingest_excel(
     print(f"[ingest_excel] Column mapping: {col_map}")
 
     # Build exam list
-    exams: list[dict[str, Any]] = [_row_to_exam(row, col_map) for _, row in df.iterrows()]
+    exams: list[dict[str, Any]] = _frame_to_exams(df, col_map)
 
     # Sort by date when available; rows without dates stay in original order (appended last)
     dated   = [e for e in exams if e["study_date"] is not None]
@@ -219,11 +282,45 @@ def ingest_excel(
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    out_path.write_text(json.dumps(exams, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out_path, exams)
     print(f"[ingest_excel] Written {len(exams)} exam(s) → {out_path}")
     return exams
 
 
+def ingest_excel_many(
+    excel_paths: list[Path],
+    sheet_name: str | int | None = 0,
+    out_dir: Path | None = None,
+    max_workers: int | None = None,
+) -> list[list[dict[str, Any]]]:
+    """Ingest several Excel files in parallel worker processes.
+
+    openpyxl XML parsing is CPU-bound and holds the GIL, so files are spread
+    across processes. Each file's stem is used as its case id; outputs go to
+    ``<out_dir>/<stem>_timeline.json`` (default ``data/processed``).
+
+    Returns:
+        One exam list per input path, in the order of *excel_paths*.
+
+    Raises:
+        ValueError: if two paths share a stem — both would write the same
+                    ``<stem>_timeline.json`` from different worker processes.
+    """
+    excel_paths = [Path(p) for p in excel_paths]
+    out_dir = Path(out_dir) if out_dir is not None else Path("data/processed")
+    case_ids = [p.stem for p in excel_paths]
+    if len(set(case_ids)) != len(case_ids):
+        dupes = sorted({c for c in case_ids if case_ids.count(c) > 1})
+        raise ValueError(f"Duplicate Excel file stems (case ids): {', '.join(dupes)}")
+    out_paths = [out_dir / f"{case_id}_timeline.json" for case_id in case_ids]
+    args = (excel_paths, case_ids, repeat(sheet_name), out_paths)
+
+    if len(excel_paths) <= 1:
+        return list(map(ingest_excel, *args))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(ingest_excel, *args))
+
+
 # ---------------------------------------------------------------------------
 # CLI entry-point
 # ---------------------------------------------------------------------------
@@ -1,27 +1,51 @@
 """Parse medical images (JPEG/PNG) into ImageMetadata with base64 thumbnails."""
 import base64
 import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
 from loguru import logger
-from PIL import Image
+from PIL import Image, features
 
 from src.core.types import ImageMetadata
 
 THUMBNAIL_SIZE = (512, 512)
+# WebP is ~30% smaller than JPEG at equal quality; fall back when Pillow lacks libwebp
+THUMBNAIL_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+_THUMBNAIL_SAVE_OPTS: dict[str, dict] = {
+    "WEBP": {"quality": 80, "method": 4},
+    "JPEG": {"quality": 85},
+}
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp"}
+_JPEG_EXTENSIONS = {".jpg", ".jpeg"}
+
+_DATE_PATTERNS = [
+    re.compile(r"(\d{4})[-_](\d{2})[-_](\d{2})"),  # 2024-06-15 or 2024_06_15
+    re.compile(r"(\d{4})[-_](\d{2})"),              # 2024-06 or 2024_06
+]
+
+# Keyword → modality, in priority order ("pet_ct.jpg" is CT)
+_MODALITY_KEYWORDS = {
+    "ct":    "CT",
+    "scan":  "CT",  # also covers "scanner"
+    "pet":   "PET",
+    "rx":    "RX",
+    "radio": "RX",
+    "chest": "RX",
+    "mri":   "MRI",
+    "irm":   "MRI",
+}
+_MODALITY_PRIORITY = {m: i for i, m in enumerate(dict.fromkeys(_MODALITY_KEYWORDS.values()))}
+# Zero-width lookahead so overlapping keywords are all reported in one pass
+_MODALITY_RE = re.compile(f"(?=({'|'.join(_MODALITY_KEYWORDS)}))")
 
 
 def _extract_date_from_filename(filename: str) -> date | None:
     """Try to extract a date from common filename patterns like ct_2024_06.jpg."""
-    import re
-    patterns = [
-        r"(\d{4})[-_](\d{2})[-_](\d{2})",  # 2024-06-15 or 2024_06_15
-        r"(\d{4})[-_](\d{2})",              # 2024-06 or 2024_06
-    ]
-    for pattern in patterns:
-        m = re.search(pattern, filename)
+    for pattern in _DATE_PATTERNS:
+        m = pattern.search(filename)
         if m:
             groups = m.groups()
             try:
@@ -35,59 +59,67 @@ def _extract_date_from_filename(filename: str) -> date | None:
 
 
 def _guess_modality(filename: str) -> str | None:
-    lower = filename.lower()
-    if "ct" in lower or "scan" in lower or "scanner" in lower:
-        return "CT"
-    if "pet" in lower:
-        return "PET"
-    if "rx" in lower or "radio" in lower or "chest" in lower:
-        return "RX"
-    if "mri" in lower or "irm" in lower:
-        return "MRI"
-    return None
+    """Map filename keywords to a modality; earlier keywords win on conflicts."""
+    hits = [_MODALITY_KEYWORDS[k] for k in _MODALITY_RE.findall(filename.lower())]
+    return min(hits, key=_MODALITY_PRIORITY.__getitem__) if hits else None
+
 
+def _image_to_b64_thumbnail(img: Image.Image, fmt: str = THUMBNAIL_FORMAT) -> str:
+    """Convert PIL image to a base64 thumbnail string (WebP by default, or JPEG).
 
-def _image_to_b64_thumbnail(img: Image.Image) -> str:
-    """Convert PIL image to base64 JPEG thumbnail string."""
-    img_copy = img.copy()
-    img_copy.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
-    if img_copy.mode not in ("RGB", "L"):
-        img_copy = img_copy.convert("RGB")
+    Thumbnails *img* in place — callers must read any full-size attributes first.
+    """
+    img.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
     buf = io.BytesIO()
-    img_copy.save(buf, format="JPEG", quality=85)
+    img.save(buf, format=fmt, **_THUMBNAIL_SAVE_OPTS[fmt])
     return base64.standard_b64encode(buf.getvalue()).decode()
 
 
-def ingest_images(paths: list[Path]) -> list[ImageMetadata]:
-    """Load and process a list of image paths into ImageMetadata objects."""
-    results = []
-    for path in paths:
-        if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            logger.warning(f"Skipping unsupported image format: {path.name}")
-            continue
-        if not path.exists():
-            logger.warning(f"Image not found: {path}")
-            continue
+def _process_one(path: Path) -> ImageMetadata | None:
+    """Decode one image and build its ImageMetadata; None when skipped or unreadable."""
+    if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+        logger.warning(f"Skipping unsupported image format: {path.name}")
+        return None
+    if not path.exists():
+        logger.warning(f"Image not found: {path}")
+        return None
 
-        try:
-            img = Image.open(path)
+    try:
+        with Image.open(path) as img:
             width, height = img.size
+            if path.suffix.lower() in _JPEG_EXTENSIONS:
+                # DCT-domain downscale: libjpeg decodes at 1/2..1/8 scale, still >= THUMBNAIL_SIZE
+                img.draft("RGB", THUMBNAIL_SIZE)
             thumbnail_b64 = _image_to_b64_thumbnail(img)
-            exam_date = _extract_date_from_filename(path.name)
-            modality = _guess_modality(path.name)
-
-            metadata = ImageMetadata(
-                file_path=path,
-                filename=path.name,
-                exam_date=exam_date,
-                modality=modality,
-                width=width,
-                height=height,
-                thumbnail_b64=thumbnail_b64,
-            )
-            results.append(metadata)
-            logger.info(f"Loaded image: {path.name} ({width}x{height}, modality={modality})")
-        except Exception as e:
-            logger.error(f"Failed to process image {path.name}: {e}")
-
-    return results
+        exam_date = _extract_date_from_filename(path.name)
+        modality = _guess_modality(path.name)
+
+        metadata = ImageMetadata(
+            file_path=path,
+            filename=path.name,
+            exam_date=exam_date,
+            modality=modality,
+            width=width,
+            height=height,
+            thumbnail_b64=thumbnail_b64,
+            thumbnail_media_type=f"image/{THUMBNAIL_FORMAT.lower()}",
+        )
+        logger.info(f"Loaded image: {path.name} ({width}x{height}, modality={modality})")
+        return metadata
+    except Exception as e:
+        logger.error(f"Failed to process image {path.name}: {e}")
+        return None
+
+
+def ingest_images(paths: list[Path], max_workers: int | None = None) -> list[ImageMetadata]:
+    """Load and process a list of image paths into ImageMetadata objects.
+
+    Images are decoded and thumbnailed in a thread pool — Pillow releases the GIL
+    during decode and resampling. Results keep the order of *paths*.
+    """
+    if len(paths) <= 1:
+        return [r for r in map(_process_one, paths) if r is not None]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return [r for r in pool.map(_process_one, paths) if r is not None]
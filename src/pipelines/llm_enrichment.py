@@ -20,14 +20,24 @@ Usage:
     from src.pipelines.llm_enrichment import enrich_analysis
     analysis = enrich_analysis(analysis)          # no-op if no API key
     analysis = enrich_analysis(analysis, dry_run=True)  # skip API call, return as-is
+
+    # Many cases at once: concurrent requests over one AsyncAnthropic client
+    analyses = asyncio.run(enrich_analyses(analyses))
+
+    # Whole cohorts: one Message Batches submission, polled until it ends
+    analyses = enrich_analyses_batch(analyses)
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
+import time
+from functools import lru_cache
 from typing import Any
 
+from src.pipelines.json_io import dumps_json
+
 logger = logging.getLogger(__name__)
 
 # ── Tool definition (forced structured output) ────────────────────────────────
@@ -87,47 +97,34 @@ _PROTECTED_KEYS = frozenset({
     "evidence", "lesion_deltas", "kpi", "dicom",
 })
 
+# analysis key → tool_use field. Only narrative keys are ever added; the
+# protected-key filter runs once here rather than on every merge
+_NARRATIVE_KEYS: dict[str, str] = {
+    key_name: tool_field
+    for key_name, tool_field in {
+        "latest_study_technique": "study_technique",
+        "latest_report":          "preliminary_findings",
+        "latest_conclusions":     "conclusions",
+    }.items()
+    if key_name not in _PROTECTED_KEYS
+}
 
-# ── Main public function ───────────────────────────────────────────────────────
 
-def enrich_analysis(
-    analysis: dict[str, Any],
-    *,
-    api_key: str | None = None,
-    dry_run: bool = False,
-) -> dict[str, Any]:
-    """Add LLM-generated narrative sections to the analysis dict.
+_MODEL = "claude-haiku-4-5-20251001"
 
-    Args:
-        analysis:  The validated analysis dict from ``analyze_dicom()``.
-        api_key:   Override ANTHROPIC_API_KEY (useful for tests).
-        dry_run:   Skip the API call entirely and return *analysis* unchanged.
+# Concurrent in-flight requests for enrich_analyses() — keeps well under rate limits
+_MAX_CONCURRENCY = 8
 
-    Returns:
-        The analysis dict, possibly enriched with:
-        - ``latest_study_technique``
-        - ``latest_report``
-        - ``latest_conclusions``
-        - ``llm_enriched: True``
+# Message Batches polling for enrich_analyses_batch() — batches usually end
+# within the hour; give up (and cancel) after the API's 24 h processing window
+_BATCH_POLL_SECONDS = 30.0
+_BATCH_MAX_WAIT_SECONDS = 24 * 3600.0
 
-        All protected/deterministic fields are unchanged.
-        On any failure the original *analysis* is returned unchanged.
-    """
-    if dry_run:
-        return analysis
 
-    # Resolve API key
-    key = api_key or os.getenv("ANTHROPIC_API_KEY", "")
-    if not key:
-        logger.debug("[llm_enrichment] ANTHROPIC_API_KEY not set — skipping enrichment")
-        return analysis
-
-    try:
-        import anthropic  # late import: optional dependency for enrichment
-    except ImportError:
-        logger.warning("[llm_enrichment] anthropic package not installed — skipping enrichment")
-        return analysis
+# ── Request / response helpers ────────────────────────────────────────────────
 
+def _request_kwargs(analysis: dict[str, Any]) -> dict[str, Any]:
+    """Build the ``messages.create`` keyword arguments for one analysis."""
     meta  = (analysis.get("dicom") or {}).get("metadata", {})
     stats = (analysis.get("dicom") or {}).get("image_stats", {})
 
@@ -148,24 +145,22 @@ def enrich_analysis(
 
     user_msg = (
         "Données DICOM disponibles :\n"
-        f"{json.dumps(context_payload, ensure_ascii=False, indent=2)}\n\n"
+        f"{dumps_json(context_payload)}\n\n"
         "Génère les trois sections techniques du compte rendu en français."
     )
 
-    try:
-        client = anthropic.Anthropic(api_key=key)
-        response = client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=600,
-            system=_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_msg}],
-            tools=[_ENRICH_TOOL],
-            tool_choice={"type": "tool", "name": "write_report_sections"},
-        )
-    except Exception as exc:
-        logger.warning(f"[llm_enrichment] API call failed ({exc}) — skipping enrichment")
-        return analysis
+    return {
+        "model":       _MODEL,
+        "max_tokens":  600,
+        "system":      _SYSTEM_PROMPT,
+        "messages":    [{"role": "user", "content": user_msg}],
+        "tools":       [_ENRICH_TOOL],
+        "tool_choice": {"type": "tool", "name": "write_report_sections"},
+    }
+
 
+def _merge_response(analysis: dict[str, Any], response: Any) -> dict[str, Any]:
+    """Merge the tool_use output of *response* into *analysis* (unchanged if absent)."""
     # Extract the guaranteed tool_use block
     enriched_fields: dict[str, str] = {}
     for block in response.content:
@@ -177,17 +172,174 @@ def enrich_analysis(
         logger.warning("[llm_enrichment] No tool_use block in response — skipping enrichment")
         return analysis
 
-    # Merge: only add narrative keys, never overwrite protected ones
-    additions: dict[str, Any] = {
-        "latest_study_technique": enriched_fields.get("study_technique"),
-        "latest_report":          enriched_fields.get("preliminary_findings"),
-        "latest_conclusions":     enriched_fields.get("conclusions"),
-        "llm_enriched":           True,
-    }
+    logger.info("[llm_enrichment] Analysis enriched with LLM narrative sections")
+    # Shallow top-level copy, then write the few new keys in place — the
+    # caller's dict is left untouched and nested blocks are shared, not rebuilt
+    merged = dict(analysis)
+    for key_name, tool_field in _NARRATIVE_KEYS.items():
+        merged[key_name] = enriched_fields.get(tool_field)
+    merged["llm_enriched"] = True
+    return merged
 
-    # Safety guard — should never trigger given _PROTECTED_KEYS, but belt-and-suspenders
-    for key_name in _PROTECTED_KEYS:
-        additions.pop(key_name, None)
 
-    logger.info("[llm_enrichment] Analysis enriched with LLM narrative sections")
-    return {**analysis, **additions}
+def _import_anthropic(api_key: str | None) -> tuple[Any, str] | None:
+    """Return ``(anthropic_module, key)`` or None when enrichment must be skipped."""
+    key = api_key or os.getenv("ANTHROPIC_API_KEY", "")
+    if not key:
+        logger.debug("[llm_enrichment] ANTHROPIC_API_KEY not set — skipping enrichment")
+        return None
+
+    try:
+        import anthropic  # late import: optional dependency for enrichment
+    except ImportError:
+        logger.warning("[llm_enrichment] anthropic package not installed — skipping enrichment")
+        return None
+    return anthropic, key
+
+
+@lru_cache(maxsize=4)
+def _get_client(anthropic: Any, api_key: str) -> Any:
+    """Process-wide sync client per API key — reuses its HTTP connection pool across calls."""
+    return anthropic.Anthropic(api_key=api_key)
+
+
+# ── Main public functions ─────────────────────────────────────────────────────
+
+def enrich_analysis(
+    analysis: dict[str, Any],
+    *,
+    api_key: str | None = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Add LLM-generated narrative sections to the analysis dict.
+
+    Args:
+        analysis:  The validated analysis dict from ``analyze_dicom()``.
+        api_key:   Override ANTHROPIC_API_KEY (useful for tests).
+        dry_run:   Skip the API call entirely and return *analysis* unchanged.
+
+    Returns:
+        The analysis dict, possibly enriched with:
+        - ``latest_study_technique``
+        - ``latest_report``
+        - ``latest_conclusions``
+        - ``llm_enriched: True``
+
+        All protected/deterministic fields are unchanged.
+        On any failure the original *analysis* is returned unchanged.
+    """
+    if dry_run:
+        return analysis
+
+    resolved = _import_anthropic(api_key)
+    if resolved is None:
+        return analysis
+    anthropic, key = resolved
+
+    try:
+        client = _get_client(anthropic, key)
+        response = client.messages.create(**_request_kwargs(analysis))
+    except Exception as exc:
+        logger.warning(f"[llm_enrichment] API call failed ({exc}) — skipping enrichment")
+        return analysis
+
+    return _merge_response(analysis, response)
+
+
+async def enrich_analyses(
+    analyses: list[dict[str, Any]],
+    *,
+    api_key: str | None = None,
+    dry_run: bool = False,
+    max_concurrency: int = _MAX_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """Enrich many analyses concurrently over a single ``AsyncAnthropic`` client.
+
+    Wall time is roughly one round-trip per ``max_concurrency`` analyses instead
+    of one per analysis. Each item degrades independently exactly like
+    :func:`enrich_analysis`; results keep the order of *analyses*.
+    """
+    if dry_run or not analyses:
+        return list(analyses)
+
+    resolved = _import_anthropic(api_key)
+    if resolved is None:
+        return list(analyses)
+    anthropic, key = resolved
+
+    client = anthropic.AsyncAnthropic(api_key=key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(analysis: dict[str, Any]) -> dict[str, Any]:
+        try:
+            async with semaphore:
+                response = await client.messages.create(**_request_kwargs(analysis))
+        except Exception as exc:
+            logger.warning(f"[llm_enrichment] API call failed ({exc}) — skipping enrichment")
+            return analysis
+        return _merge_response(analysis, response)
+
+    return list(await asyncio.gather(*(_one(a) for a in analyses)))
+
+
+def enrich_analyses_batch(
+    analyses: list[dict[str, Any]],
+    *,
+    api_key: str | None = None,
+    dry_run: bool = False,
+    poll_interval: float = _BATCH_POLL_SECONDS,
+    max_wait: float = _BATCH_MAX_WAIT_SECONDS,
+) -> list[dict[str, Any]]:
+    """Enrich a whole cohort through one Message Batches submission.
+
+    All requests go out in a single ``messages.batches.create`` call; the batch
+    is polled every *poll_interval* seconds until it ends, then its results are
+    merged back by ``custom_id``. Suited to offline cohort runs where latency
+    does not matter — use :func:`enrich_analysis` for interactive single cases.
+
+    Items whose request errored, expired or was cancelled are returned
+    unchanged. If the submission or polling fails, or the batch has not ended
+    after *max_wait* seconds (it is then cancelled), every item is returned
+    unchanged. Results keep the order of *analyses*.
+    """
+    if dry_run or not analyses:
+        return list(analyses)
+
+    resolved = _import_anthropic(api_key)
+    if resolved is None:
+        return list(analyses)
+    anthropic, key = resolved
+
+    # custom_id must match [a-zA-Z0-9_-]{1,64} and be unique — case_id may be
+    # neither, so results are keyed by list position instead
+    results = list(analyses)
+    requests = [
+        {"custom_id": f"analysis-{i}", "params": _request_kwargs(analysis)}
+        for i, analysis in enumerate(analyses)
+    ]
+
+    try:
+        client = _get_client(anthropic, key)
+        batch = client.messages.batches.create(requests=requests)
+        deadline = time.monotonic() + max_wait
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                logger.warning(f"[llm_enrichment] Batch {batch.id} still running after {max_wait:.0f}s — cancelling")
+                client.messages.batches.cancel(batch.id)
+                return results
+            time.sleep(poll_interval)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        for entry in client.messages.batches.results(batch.id):
+            index = int(entry.custom_id.rsplit("-", 1)[1])
+            if entry.result.type != "succeeded":
+                logger.warning(
+                    f"[llm_enrichment] Batch request {entry.custom_id} {entry.result.type} — skipping enrichment"
+                )
+                continue
+            results[index] = _merge_response(analyses[index], entry.result.message)
+    except Exception as exc:
+        logger.warning(f"[llm_enrichment] Batch API call failed ({exc}) — skipping enrichment")
+        return list(analyses)
+
+    return results
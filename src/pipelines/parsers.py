@@ -6,11 +6,19 @@ from __future__ import annotations
 
 import math
 import re
+import string
+from functools import lru_cache
 
 # ---------------------------------------------------------------------------
 # Lesion size parsing
 # ---------------------------------------------------------------------------
 
+# Separators (and Excel Alt+Enter line breaks) mapped to spaces in one C-level pass
+_SEP_TABLE = str.maketrans({c: " " for c in ",;|/\\\r\n"})
+# Trailing unit characters stripped from each token ("mm", "cm", "°")
+_UNIT_CHARS = string.ascii_letters + "°"
+
+
 def parse_lesion_sizes(value: object) -> list[float]:
     """Parse a raw cell value into a list of lesion sizes in mm.
 
@@ -29,39 +37,59 @@ def parse_lesion_sizes(value: object) -> list[float]:
     Returns:
         Sorted list of floats. Empty list when no valid number is found.
     """
-    # Reject None / NaN / empty
-    if value is None:
-        return []
-    if isinstance(value, float):
-        if math.isnan(value):
+    # Exact str first: ingest_excel only ever passes strings, so they skip the
+    # scalar checks and the str() round-trip
+    if type(value) is str:
+        text = value.strip()
+    else:
+        # Reject None / NaN / empty
+        if value is None:
             return []
-        return [value]
-    if isinstance(value, int):
-        return [float(value)]
-
-    # Convert to string and clean up
-    text = str(value).strip()
+        if isinstance(value, float):
+            # NaN (empty Excel cell) and ±inf are not sizes, as for strings below
+            return [value] if math.isfinite(value) else []
+        if isinstance(value, int):
+            return [float(value)]
+        text = str(value).strip()
     if not text:
         return []
 
-    # Normalise line endings first (Excel Alt+Enter cells contain \r\n or \n)
-    text = text.replace("\r\n", " ").replace("\r", " ").replace("\n", " ")
-    # Replace other common separators with spaces, then split
-    normalized = re.sub(r"[,;|/\\]+", " ", text)
-    tokens = normalized.split()
+    # Common case: the cell is one bare number — skip tokenising entirely.
+    # Only when it starts like a token that survives the loop below unchanged:
+    # a leading "." is stripped there (".5" → 5.0), so it must take that path
+    # too; "nan"/"inf" fall through and are dropped by the unit stripping
+    if text[0].isdigit() or text[0] in "+-":
+        try:
+            single = float(text)
+        except ValueError:
+            pass
+        else:
+            if math.isfinite(single):
+                return [single]
+
+    # Replace line breaks and common separators with spaces, then split
+    tokens = text.translate(_SEP_TABLE).split()
 
     sizes: list[float] = []
     for token in tokens:
         # Strip trailing units like "mm", "cm" etc.
-        token_clean = re.sub(r"[a-zA-Z°]+$", "", token).strip(" .")
-        if not token_clean:
+        token_clean = token.rstrip(_UNIT_CHARS).strip(" .")
+        # A size starts with a digit or sign and ends with a digit — skip words
+        # ("nodule", "nan."), a lone "-" or "2:" up front instead of paying for
+        # a raised ValueError on each one
+        if not token_clean or not token_clean[-1].isdigit():
+            continue
+        if not (token_clean[0].isdigit() or token_clean[0] in "+-"):
             continue
         try:
-            sizes.append(float(token_clean))
+            size = float(token_clean)
         except ValueError:
-            pass  # skip non-numeric tokens
+            continue  # skip non-numeric tokens
+        if math.isfinite(size):  # "-inf." still parses
+            sizes.append(size)
 
-    return sorted(sizes)
+    sizes.sort()  # in place — the list is ours, no copy as with sorted()
+    return sizes
 
 
 # ---------------------------------------------------------------------------
@@ -78,6 +106,13 @@ _SECTION_PATTERNS: list[tuple[str, str]] = [
     ("conclusions",          r"CONCLUSIONS?\.?"),
 ]
 
+# One compiled pattern per marker, each searched on its own: markers may overlap
+# ("CONCLUSIONSTUDY" holds both CONCLUSIONS and STUDY), so a single alternation
+# scanned left to right would let one marker hide the next
+_SECTION_RES: list[tuple[str, re.Pattern[str]]] = [
+    (key, re.compile(pattern, re.IGNORECASE)) for key, pattern in _SECTION_PATTERNS
+]
+
 _ALL_KEYS = [k for k, _ in _SECTION_PATTERNS]
 _EMPTY_SECTIONS: dict[str, str | None] = {k: None for k in _ALL_KEYS}
 
@@ -99,27 +134,31 @@ def split_report_sections(text: object) -> dict[str, str | None]:
         ``report``, ``conclusions``. Each value is ``None`` when the
         corresponding marker is absent or the section content is empty.
     """
-    result = dict(_EMPTY_SECTIONS)  # fresh copy
-
     if not text or not isinstance(text, str):
-        return result
+        return dict(_EMPTY_SECTIONS)
+    # Copy so callers can mutate the result without corrupting the cache
+    return dict(_split_report_sections_cached(text))
+
+
+@lru_cache(maxsize=4096)
+def _split_report_sections_cached(text: str) -> dict[str, str | None]:
+    """Memoised core of :func:`split_report_sections` — rows often repeat boilerplate."""
+    result = dict(_EMPTY_SECTIONS)  # fresh copy
 
     text = text.strip()
     if not text:
         return result
 
-    # Locate every marker and record (position_start, position_end, key)
+    # Locate every marker and record (position_start, position_end, key),
+    # sorted by position of occurrence in the text
     found: list[tuple[int, int, str]] = []
-    for key, pattern in _SECTION_PATTERNS:
-        m = re.search(pattern, text, re.IGNORECASE)
+    for key, pattern in _SECTION_RES:
+        m = pattern.search(text)
         if m:
             found.append((m.start(), m.end(), key))
-
     if not found:
         return result
-
-    # Sort by position of occurrence in the text
-    found.sort(key=lambda x: x[0])
+    found.sort()
 
     # Extract content between consecutive markers
     for i, (_, end_pos, key) in enumerate(found):
@@ -132,3 +171,4 @@ def split_report_sections(text: object) -> dict[str, str | None]:
         result[key] = content if content else None
 
     return result
+
@@ -11,6 +11,7 @@ Steps:
     4. Write  {out}/analysis.json
     5. ingest_excel() if --excel/--xlsx given  → timeline dict
     6. Write  {out}/timeline.json              (only when Excel provided)
+       Steps 5–6 run on a worker thread, overlapping steps 3.5–4.
     7. generate_report.render_report()    → Markdown string
     8. Write  {out}/final_report.md
     9. Print  10-line case summary
@@ -25,12 +26,15 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import logging
+import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from src.pipelines.json_io import write_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +81,69 @@ def _print_summary(
     print(sep)
 
 
+def _load_timeline(
+    excel_path: Path,
+    case_id: str,
+    out_dir: Path,
+) -> tuple[Path | None, list[dict[str, Any]]]:
+    """Excel → timeline.json (metadata only). Returns ``(timeline_path, timeline)``."""
+    if not excel_path.exists():
+        logger.warning(
+            f"[run_case] Excel file not found (skipped): {excel_path}"
+        )
+        return None, []
+
+    from src.pipelines.ingest_excel import ingest_excel as _ingest_excel
+
+    logger.info(f"[run_case] Ingesting Excel (metadata only): {excel_path}")
+    timeline_path = out_dir / "timeline.json"
+    # ingest_excel writes timeline.json and returns the same list — no re-read
+    timeline = _ingest_excel(
+        excel_path,
+        case_id=case_id,
+        out_path=timeline_path,
+    )
+    logger.info(
+        f"[run_case] Written → {timeline_path}  ({len(timeline)} exam(s))"
+    )
+    return timeline_path, timeline
+
+
+def _run_llm_steps(analysis: dict[str, Any]) -> dict[str, Any]:
+    """Optional LLM steps; each soft-fails and returns *analysis* unchanged on error."""
+    # ── Step 3.5: LLM enrichment (optional — soft fail) ──────────────────────
+    logger.info("[run_case] Attempting LLM narrative enrichment …")
+    try:
+        from src.pipelines.llm_enrichment import enrich_analysis
+        analysis = enrich_analysis(analysis)
+        if analysis.get("llm_enriched"):
+            logger.info("[run_case] LLM enrichment applied")
+        else:
+            logger.info("[run_case] LLM enrichment skipped (no API key or unavailable)")
+    except Exception as exc:
+        logger.warning(f"[run_case] LLM enrichment failed (non-fatal): {exc}")
+
+    # ── Step 3.7: Clinical validation (optional — soft fail) ──────────────────
+    logger.info("[run_case] Attempting clinical consistency validation …")
+    try:
+        from src.pipelines.clinical_validation import validate_clinical
+        analysis = validate_clinical(analysis)
+        if analysis.get("validation"):
+            v = analysis["validation"]
+            logger.info(
+                f"[run_case] Clinical validation: "
+                f"confidence={v['confidence_score']:.2f} "
+                f"consistency={v['clinical_consistency_score']:.2f} "
+                f"flags={v['anomaly_flags']}"
+            )
+        else:
+            logger.info("[run_case] Clinical validation skipped (no API key or unavailable)")
+    except Exception as exc:
+        logger.warning(f"[run_case] Clinical validation failed (non-fatal): {exc}")
+
+    return analysis
+
+
 def run_case(
     dicom_path: Path,
     out_dir: Path,
@@ -104,8 +171,13 @@ def run_case(
     from src.pipelines.dicom_analysis import analyze_dicom, validate_analysis
     from src.pipelines.generate_report import render_report
 
-    dicom_path = Path(dicom_path)
-    out_dir    = Path(out_dir)
+    # Callers (the CLI included) usually pass Path already — skip the re-parse
+    if not isinstance(dicom_path, Path):
+        dicom_path = Path(dicom_path)
+    if not isinstance(out_dir, Path):
+        out_dir = Path(out_dir)
+    if excel_path is not None and not isinstance(excel_path, Path):
+        excel_path = Path(excel_path)
 
     # ── Step 1: DICOM is mandatory ────────────────────────────────────────────
     if not dicom_path.exists():
@@ -134,67 +206,31 @@ def run_case(
         logger.error(f"[run_case] Schema validation FAILED: {exc}")
         sys.exit(1)
 
-    # ── Step 3.5: LLM enrichment (optional — soft fail) ──────────────────────
-    logger.info("[run_case] Attempting LLM narrative enrichment …")
-    try:
-        from src.pipelines.llm_enrichment import enrich_analysis
-        analysis = enrich_analysis(analysis)
-        if analysis.get("llm_enriched"):
-            logger.info("[run_case] LLM enrichment applied")
-        else:
-            logger.info("[run_case] LLM enrichment skipped (no API key or unavailable)")
-    except Exception as exc:
-        logger.warning(f"[run_case] LLM enrichment failed (non-fatal): {exc}")
-
-    # ── Step 3.7: Clinical validation (optional — soft fail) ──────────────────
-    logger.info("[run_case] Attempting clinical consistency validation …")
-    try:
-        from src.pipelines.clinical_validation import validate_clinical
-        analysis = validate_clinical(analysis)
-        if analysis.get("validation"):
-            v = analysis["validation"]
-            logger.info(
-                f"[run_case] Clinical validation: "
-                f"confidence={v['confidence_score']:.2f} "
-                f"consistency={v['clinical_consistency_score']:.2f} "
-                f"flags={v['anomaly_flags']}"
-            )
+    # ── Steps 5–6 start now: Excel ingest is independent of steps 3.5–4 ───────
+    # Submitted only once validation has passed, so a failed run never writes timeline.json
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        timeline_future: Future | None = None
+        if excel_path is not None:
+            timeline_future = pool.submit(_load_timeline, excel_path, cid, out_dir)
+
+        # ── Steps 3.5–3.7: LLM enrichment + clinical validation (optional) ────
+        # Both need ANTHROPIC_API_KEY; without it, skip before importing the modules
+        if os.getenv("ANTHROPIC_API_KEY"):
+            analysis = _run_llm_steps(analysis)
         else:
-            logger.info("[run_case] Clinical validation skipped (no API key or unavailable)")
-    except Exception as exc:
-        logger.warning(f"[run_case] Clinical validation failed (non-fatal): {exc}")
+            logger.info("[run_case] LLM enrichment and clinical validation skipped — no API key")
 
-    # ── Step 4: Write analysis.json ───────────────────────────────────────────
-    analysis_path = out_dir / "analysis.json"
-    analysis_path.write_text(
-        json.dumps(analysis, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
-    logger.info(f"[run_case] Written → {analysis_path}")
+        # ── Step 4: Write analysis.json ───────────────────────────────────────
+        analysis_path = out_dir / "analysis.json"
+        write_json(analysis_path, analysis)  # orjson when installed; handles NumPy scalars
+        logger.info(f"[run_case] Written → {analysis_path}")
 
-    # ── Step 5: Excel → timeline.json (optional; metadata only) ──────────────
-    timeline: list[dict[str, Any]] = []
-    timeline_path: Path | None = None
-
-    if excel_path is not None:
-        excel_path = Path(excel_path)
-        if not excel_path.exists():
-            logger.warning(
-                f"[run_case] Excel file not found (skipped): {excel_path}"
-            )
-        else:
-            from src.pipelines.ingest_excel import ingest_excel as _ingest_excel
-
-            logger.info(f"[run_case] Ingesting Excel (metadata only): {excel_path}")
-            tl_out = _ingest_excel(
-                excel_path,
-                case_id=cid,
-                out_path=out_dir / "timeline.json",
-            )
-            timeline_path = tl_out
-            timeline = json.loads(tl_out.read_text(encoding="utf-8"))
-            logger.info(
-                f"[run_case] Written → {timeline_path}  ({len(timeline)} exam(s))"
-            )
+        # ── Steps 5–6: collect the Excel timeline (optional; metadata only) ───
+        timeline: list[dict[str, Any]] = []
+        timeline_path: Path | None = None
+        if timeline_future is not None:
+            # Re-raises an ingest error here, after analysis.json is already on disk
+            timeline_path, timeline = timeline_future.result()
 
     # ── Step 7: Render Markdown report ────────────────────────────────────────
     logger.info("[run_case] Rendering final report …")
@@ -205,7 +241,7 @@ def run_case(
         sys.exit(1)
 
     report_path = out_dir / "final_report.md"
-    report_path.write_text(rendered, encoding="utf-8")
+    report_path.write_bytes(rendered.encode("utf-8"))
     logger.info(
         f"[run_case] Written → {report_path}  ({len(rendered)} chars)"
     )
@@ -265,15 +301,8 @@ def _build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> None:
     args = _build_parser().parse_args(argv)
 
-    dicom_path = Path(args.dicom)
-
-    # Explicit DICOM check before delegating (gives a clean error in CLI context)
-    if not dicom_path.exists():
-        print(
-            f"ERROR: DICOM input is required — not found: {dicom_path}",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+    # Existence is checked once, inside run_case (logs the error and exits 1)
+    dicom_path: Path = args.dicom  # argparse type=Path
 
     # Default out: data/processed/{stem}/
     case_id = args.case_id or dicom_path.stem
@@ -59,38 +59,147 @@ Output schema:
 """
 from __future__ import annotations
 
+import copy
 import json
+import math
+import os
+import shutil
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from src.imaging.dicom_utils import read_dicom_metadata
 from src.imaging.orthanc_utils import download_study
 
+# Header reads are small and seek-bound; threads overlap the syscall latency
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Copy buffer for zip extraction (the BufferedIO default is 8 KiB)
+_EXTRACT_CHUNK = 1 << 20
+
+# Structural contract of the annotations input (see module docstring); extra keys allowed
+_ANNOTATIONS_SCHEMA: dict[str, Any] = {
+    "type":  "array",
+    "items": {
+        "type":       "object",
+        "properties": {
+            "study_id":   {"type": "string"},
+            "series_uid": {"type": "string"},
+            "lesions":    {
+                "type":  "array",
+                "items": {
+                    "type":       "object",
+                    "properties": {
+                        "lesion_id":      {"type": "string"},
+                        "series_uid":     {"type": "string"},
+                        "slice_instance": {"type": ["integer", "null"]},
+                        "long_axis_px":   {"type": ["number", "null"]},
+                        "short_axis_px":  {"type": ["number", "null"]},
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Concurrent Orthanc archive downloads — kept low so the server is not flooded
+_DOWNLOAD_WORKERS = 4
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
 def _scan_dcm_files(folder: Path) -> list[Path]:
-    """Recursively find all .dcm files in *folder*."""
-    return sorted(folder.rglob("*.dcm")) + sorted(
-        p for p in folder.rglob("*.DCM")
-        if p not in set(folder.rglob("*.dcm"))
-    )
+    """Recursively find all .dcm files in *folder* (suffix matched case-insensitively).
 
+    Iterative ``os.scandir`` walk: the DirEntry type bits answer is_dir/is_file
+    without a stat, and Path objects are only built for the sorted matches.
+    Unreadable sub-directories and directory symlinks are skipped, as with os.walk.
+    """
+    found: list[str] = []
+    stack = [os.fspath(folder)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".dcm") and entry.is_file():
+                    found.append(entry.path)
+    found.sort()
+    return [Path(f) for f in found]
 
-def _build_study_meta(dcm_files: list[Path]) -> dict[str, Any]:
-    """Build study-level summary: group by SeriesInstanceUID, capture patient/date."""
+
+def _extract_dcm_members(zip_path: Path, extract_dir: Path) -> int:
+    """Stream only the ``.dcm`` members of *zip_path* into *extract_dir*.
+
+    DICOMDIR, previews and other non-DICOM entries are skipped. The archive's
+    sub-folders are kept (instance names are only unique per series), and
+    members resolving outside *extract_dir* are ignored.
+
+    Returns:
+        Number of files written.
+    """
+    root = extract_dir.resolve()
+    written = 0
+    with zipfile.ZipFile(zip_path) as zf:
+        for zi in zf.infolist():
+            if zi.is_dir() or not zi.filename.lower().endswith(".dcm"):
+                continue
+            target = (root / zi.filename).resolve()
+            if not target.is_relative_to(root):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(zi) as src, open(target, "wb", buffering=0) as dst:
+                shutil.copyfileobj(src, dst, length=_EXTRACT_CHUNK)
+            written += 1
+    return written
+
+
+def _fetch_study(study_id: str, tmp_root: Path) -> Path:
+    """Download one Orthanc study and extract its DICOM files; return the folder."""
+    zip_path = download_study(study_id, out_dir=tmp_root)
+    extract_dir = tmp_root / f"study_{study_id[:8]}"
+    extract_dir.mkdir(parents=True, exist_ok=True)
+    _extract_dcm_members(Path(zip_path), extract_dir)
+    return extract_dir
+
+
+def _read_one(f: str | Path) -> dict[str, Any] | None:
+    """Header metadata for *f*, or None when it is not a readable DICOM file."""
+    try:
+        return read_dicom_metadata(f)
+    except Exception:
+        return None
+
+
+def _build_study_meta(dcm_files: list[str] | list[Path]) -> dict[str, Any]:
+    """Build study-level summary: group by SeriesInstanceUID, capture patient/date.
+
+    Plain path strings are accepted so callers need not build a Path per slice.
+    """
     series: dict[str, dict[str, Any]] = {}
     patient_id = ""
     study_date = ""
     study_uid = ""
 
-    for f in dcm_files:
-        try:
-            meta = read_dicom_metadata(f)
-        except Exception:
+    if len(dcm_files) > 1:
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+            metas = list(pool.map(_read_one, dcm_files))
+    else:
+        metas = [_read_one(f) for f in dcm_files]
+
+    # Reduce in file order so "first non-empty" fields match a serial scan
+    for f, meta in zip(dcm_files, metas, strict=True):
+        if meta is None:
             continue
 
         if not patient_id:
@@ -119,16 +228,44 @@ def _build_study_meta(dcm_files: list[Path]) -> dict[str, Any]:
     }
 
 
-def _resolve_pixel_spacing(
-    series_map: dict[str, dict[str, Any]],
-    series_uid: str,
-) -> tuple[float, float] | None:
-    """Return (sx, sy) mm for the given series_uid, or None."""
-    s = series_map.get(series_uid)
-    if s and s.get("pixel_spacing"):
-        ps = s["pixel_spacing"]
-        return float(ps[0]), float(ps[1])
-    return None
+def _spacing_lookup(
+    series: list[dict[str, Any]],
+) -> tuple[dict[str, tuple[float, float]], tuple[float, float] | None]:
+    """Return ``({series_uid: (sx, sy)}, ct_fallback)`` for one study.
+
+    Spacings are cast to float once per series; *ct_fallback* is the spacing of
+    the first CT series that has one (None when there is none).
+    """
+    ps_map = {
+        s["series_uid"]: (float(s["pixel_spacing"][0]), float(s["pixel_spacing"][1]))
+        for s in series
+        if s.get("pixel_spacing")
+    }
+    ct_fallback = next(
+        (ps_map[s["series_uid"]] for s in series if s.get("modality") == "CT" and s["series_uid"] in ps_map),
+        None,
+    )
+    return ps_map, ct_fallback
+
+
+@lru_cache(maxsize=1)
+def _annotations_validator() -> Any:
+    """Check and compile :data:`_ANNOTATIONS_SCHEMA` once per process."""
+    import jsonschema
+
+    validator_cls = jsonschema.validators.validator_for(_ANNOTATIONS_SCHEMA)
+    validator_cls.check_schema(_ANNOTATIONS_SCHEMA)
+    return validator_cls(_ANNOTATIONS_SCHEMA)
+
+
+def _validate_annotations(annotations: list[dict[str, Any]]) -> None:
+    """Hard-fail on the first (most relevant) schema violation in *annotations*."""
+    import jsonschema
+
+    error = jsonschema.exceptions.best_match(_annotations_validator().iter_errors(annotations))
+    if error is not None:
+        field_path = " → ".join(str(p) for p in error.absolute_path) or "<root>"
+        _hard_fail(f"Invalid annotations at [{field_path}]: {error.message}")
 
 
 def _hard_fail(detail: str) -> None:
@@ -139,91 +276,41 @@ def _hard_fail(detail: str) -> None:
     }))
 
 
-# ---------------------------------------------------------------------------
-# Public API
-# ---------------------------------------------------------------------------
+def _folder_signature(folder: Path) -> tuple[tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) of every .dcm file under *folder* — changes when any file does."""
+    sig = []
+    for f in _scan_dcm_files(folder):
+        st = f.stat()
+        sig.append((str(f), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
 
-def run_vision_tool(
-    dicom_paths: list[str | Path] | None = None,
-    orthanc_study_ids: list[str] | None = None,
-    annotations: list[dict[str, Any]] | None = None,
-    annotations_json_str: str | None = None,
-    work_dir: str | Path | None = None,
+
+@lru_cache(maxsize=64)
+def _measure_studies(
+    folders_sig: tuple[tuple[str, tuple[tuple[str, int, int], ...]], ...],
+    ann_json: str,
 ) -> dict[str, Any]:
-    """Run the imaging-first measurement pipeline.
+    """Measure every study folder; cached so repeated agent calls skip the re-scan.
 
     Args:
-        dicom_paths:          Local .dcm files or folders.
-        orthanc_study_ids:    Orthanc study UUIDs — downloaded before processing.
-        annotations:          Pre-parsed annotation list (pixel coords).
-        annotations_json_str: Raw JSON string of annotations (alternative to above).
-        work_dir:             Base dir for Orthanc downloads (default: system tempdir).
-
-    Returns:
-        Structured dict with "studies", "warnings", "calibration".
-
-    Raises:
-        ValueError: structured JSON with ``error="MEASUREMENTS_REQUIRED"`` when
-                    measurements cannot be derived.
+        folders_sig: ``(folder, _folder_signature(folder))`` per DICOM source.
+        ann_json:    Canonical JSON of the annotations grouped by study id.
     """
+    ann_by_study: dict[str, list[dict[str, Any]]] = json.loads(ann_json)
     warnings: list[str] = []
     studies_out: list[dict[str, Any]] = []
 
-    # ── Parse annotations ─────────────────────────────────────────────────────
-    if annotations_json_str and not annotations:
-        try:
-            annotations = json.loads(annotations_json_str)
-        except json.JSONDecodeError as e:
-            _hard_fail(f"Invalid annotations JSON: {e}")
-
-    ann_by_study: dict[str, list[dict[str, Any]]] = {}
-    if annotations:
-        for entry in annotations:
-            sid = entry.get("study_id", "__default__")
-            ann_by_study[sid] = entry.get("lesions", [])
-
-    # No annotations at all → fail immediately with clear message
-    if not ann_by_study:
-        _hard_fail(
-            "No lesion measurements available. "
-            "Provide annotations (px) or DICOM SR/RTSTRUCT."
-        )
-
-    # ── Resolve DICOM sources ─────────────────────────────────────────────────
-    all_folders: list[Path] = []
-
-    if orthanc_study_ids:
-        tmp_root = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="vision_"))
-        for study_id in orthanc_study_ids:
-            zip_path = download_study(study_id, out_dir=tmp_root)
-            extract_dir = tmp_root / f"study_{study_id[:8]}"
-            extract_dir.mkdir(parents=True, exist_ok=True)
-            with zipfile.ZipFile(zip_path) as zf:
-                zf.extractall(extract_dir)
-            all_folders.append(extract_dir)
-
-    if dicom_paths:
-        for p in dicom_paths:
-            pp = Path(p)
-            if pp.is_dir():
-                all_folders.append(pp)
-            elif pp.is_file() and pp.suffix.lower() in (".dcm", ""):
-                all_folders.append(pp.parent)
-
-    if not all_folders:
-        _hard_fail("No DICOM sources provided. Supply dicom_paths or orthanc_study_ids.")
-
-    # ── Process each folder as one study ─────────────────────────────────────
     last_calibration: dict[str, Any] = {"method": "dicom_spacing", "pixel_spacing_mm": None}
 
-    for folder in all_folders:
-        dcm_files = _scan_dcm_files(folder)
+    for folder_str, files_sig in folders_sig:
+        folder = Path(folder_str)
+        dcm_files = [path for path, _, _ in files_sig]
         if not dcm_files:
             warnings.append(f"No .dcm files found in {folder}")
             continue
 
         study_meta = _build_study_meta(dcm_files)
-        series_map = {s["series_uid"]: s for s in study_meta["series"]}
+        ps_map, ct_fallback = _spacing_lookup(study_meta["series"])
 
         # Match annotations to this study (by study_uid, study_date, or __default__)
         study_key = study_meta["study_uid"] or study_meta["study_date"] or str(folder)
@@ -241,23 +328,20 @@ def run_vision_tool(
 
         # ── Convert px → mm ───────────────────────────────────────────────────
         lesions_out: list[dict[str, Any]] = []
+        resolved: list[tuple[dict[str, Any], float, float]] = []
 
         for ann in ann_lesions:
             ann_series_uid = ann.get("series_uid", "")
-            ps = _resolve_pixel_spacing(series_map, ann_series_uid)
+            ps = ps_map.get(ann_series_uid)
 
-            if ps is None:
+            if ps is None and ct_fallback is not None:
                 # Fall back to first CT series with spacing
-                for s in study_meta["series"]:
-                    if s.get("modality") == "CT" and s.get("pixel_spacing"):
-                        raw_ps = s["pixel_spacing"]
-                        ps = (float(raw_ps[0]), float(raw_ps[1]))
-                        warnings.append(
-                            f"Series UID not matched for lesion "
-                            f"{ann.get('lesion_id', '?')}, "
-                            f"using first CT series spacing."
-                        )
-                        break
+                ps = ct_fallback
+                warnings.append(
+                    f"Series UID not matched for lesion "
+                    f"{ann.get('lesion_id', '?')}, "
+                    f"using first CT series spacing."
+                )
 
             if ps is None:
                 warnings.append(
@@ -268,20 +352,26 @@ def run_vision_tool(
 
             sx, sy = ps
             last_calibration["pixel_spacing_mm"] = [sx, sy]
+            resolved.append((ann, sx, sy))
 
-            long_px  = ann.get("long_axis_px")
-            short_px = ann.get("short_axis_px")
-            long_mm  = round(long_px  * sx, 2) if long_px  is not None else None
-            short_mm = round(short_px * sy, 2) if short_px is not None else None
+        # One vectorised multiply for every lesion of the study (None → NaN → None)
+        px = np.array(
+            [(ann.get("long_axis_px"), ann.get("short_axis_px")) for ann, _, _ in resolved],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        spacing = np.array([(sx, sy) for _, sx, sy in resolved], dtype=np.float64).reshape(-1, 2)
+        mm_arr = px * spacing
 
+        for (ann, _, _), (long_mm, short_mm) in zip(resolved, mm_arr.tolist(), strict=True):
             lesions_out.append({
                 "lesion_id":      ann.get("lesion_id", f"L{len(lesions_out) + 1}"),
                 "slice_instance": ann.get("slice_instance"),
-                "long_axis_px":   long_px,
-                "short_axis_px":  short_px,
-                "long_axis_mm":   long_mm,
-                "short_axis_mm":  short_mm,
-                "series_uid":     ann_series_uid,
+                "long_axis_px":   ann.get("long_axis_px"),
+                "short_axis_px":  ann.get("short_axis_px"),
+                # Python round(): correctly rounded, unlike np.round's scale-and-round
+                "long_axis_mm":   None if math.isnan(long_mm) else round(long_mm, 2),
+                "short_axis_mm":  None if math.isnan(short_mm) else round(short_mm, 2),
+                "series_uid":     ann.get("series_uid", ""),
             })
 
         if not lesions_out:
@@ -317,3 +407,80 @@ def run_vision_tool(
         "warnings":    warnings,
         "calibration": last_calibration,
     }
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def run_vision_tool(
+    dicom_paths: list[str | Path] | None = None,
+    orthanc_study_ids: list[str] | None = None,
+    annotations: list[dict[str, Any]] | None = None,
+    annotations_json_str: str | None = None,
+    work_dir: str | Path | None = None,
+) -> dict[str, Any]:
+    """Run the imaging-first measurement pipeline.
+
+    Args:
+        dicom_paths:          Local .dcm files or folders.
+        orthanc_study_ids:    Orthanc study UUIDs — downloaded before processing.
+        annotations:          Pre-parsed annotation list (pixel coords).
+        annotations_json_str: Raw JSON string of annotations (alternative to above).
+        work_dir:             Base dir for Orthanc downloads (default: system tempdir).
+
+    Returns:
+        Structured dict with "studies", "warnings", "calibration".
+
+    Raises:
+        ValueError: structured JSON with ``error="MEASUREMENTS_REQUIRED"`` when
+                    measurements cannot be derived.
+    """
+    # ── Parse annotations ─────────────────────────────────────────────────────
+    if annotations_json_str and not annotations:
+        try:
+            annotations = json.loads(annotations_json_str)
+        except json.JSONDecodeError as e:
+            _hard_fail(f"Invalid annotations JSON: {e}")
+
+    if annotations:
+        _validate_annotations(annotations)
+
+    ann_by_study: dict[str, list[dict[str, Any]]] = {}
+    if annotations:
+        for entry in annotations:
+            sid = entry.get("study_id", "__default__")
+            ann_by_study[sid] = entry.get("lesions", [])
+
+    # No annotations at all → fail immediately with clear message
+    if not ann_by_study:
+        _hard_fail(
+            "No lesion measurements available. "
+            "Provide annotations (px) or DICOM SR/RTSTRUCT."
+        )
+
+    # ── Resolve DICOM sources ─────────────────────────────────────────────────
+    all_folders: list[Path] = []
+
+    if orthanc_study_ids:
+        tmp_root = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="vision_"))
+        # Download of one study overlaps the extraction of another; map keeps input order
+        workers = min(_DOWNLOAD_WORKERS, len(orthanc_study_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            all_folders.extend(pool.map(lambda sid: _fetch_study(sid, tmp_root), orthanc_study_ids))
+
+    if dicom_paths:
+        for p in dicom_paths:
+            pp = Path(p)
+            if pp.is_dir():
+                all_folders.append(pp)
+            elif pp.is_file() and pp.suffix.lower() in (".dcm", ""):
+                all_folders.append(pp.parent)
+
+    if not all_folders:
+        _hard_fail("No DICOM sources provided. Supply dicom_paths or orthanc_study_ids.")
+
+    # ── Process each folder as one study (memoised on files + annotations) ───
+    folders_sig = tuple((str(folder), _folder_signature(folder)) for folder in all_folders)
+    ann_json = json.dumps(ann_by_study, sort_keys=True, ensure_ascii=False)
+    return copy.deepcopy(_measure_studies(folders_sig, ann_json))
@@ -0,0 +1,32 @@
+"""Shared pytest setup.
+
+A fake ``anthropic`` module is installed in sys.modules once per process,
+before any test module is imported. Every module that mocks the Anthropic
+client therefore configures the same object — also under ``pytest -n``,
+where each xdist worker loads this conftest exactly once.
+
+On Linux, ``tmp_path`` directories are created under the RAM-backed
+``/dev/shm`` so the DICOM factories and pipeline outputs never touch disk.
+An explicit ``--basetemp`` or ``PYTEST_DEBUG_TEMPROOT`` wins; on macOS and
+Windows (no ``/dev/shm``) pytest's default temp root is used.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.modules.setdefault("anthropic", MagicMock(name="anthropic"))
+
+_TMPFS_ROOT = "/dev/shm"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.option.basetemp or "PYTEST_DEBUG_TEMPROOT" in os.environ:
+        return
+    if os.path.isdir(_TMPFS_ROOT) and os.access(_TMPFS_ROOT, os.W_OK):
+        # Keeps pytest's pytest-of-<user>/pytest-N layout and retention, just rooted in RAM
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = _TMPFS_ROOT
+
@@ -0,0 +1,140 @@
+"""Hand-encoded DICOM Part-10 files for the test factories.
+
+The factories only need a handful of fixed tags, so the bytes are laid out
+directly with ``struct`` instead of going through pydicom's encoder:
+128-byte preamble, ``DICM``, the file meta group in Explicit VR Little Endian,
+then the dataset in Implicit VR Little Endian with PixelData last.
+
+Set ``USE_PYDICOM_FIXTURES=1`` to build the same elements with pydicom
+instead, which cross-checks this encoder against the reference one.
+"""
+from __future__ import annotations
+
+import io
+import itertools
+import os
+import struct
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+
+USE_PYDICOM_FIXTURES = os.environ.get("USE_PYDICOM_FIXTURES") == "1"
+
+IMPLICIT_VR_LITTLE_ENDIAN = "1.2.840.10008.1.2"
+_IMPLEMENTATION_CLASS_UID = "1.2.826.0.1.3680043.9.9999.1"
+_PREAMBLE = b"\0" * 128
+
+# keyword → (tag, VR) for every element the factories set
+_TAGS: dict[str, tuple[int, str]] = {
+    "SOPClassUID":               (0x00080016, "UI"),
+    "SOPInstanceUID":            (0x00080018, "UI"),
+    "StudyDate":                 (0x00080020, "DA"),
+    "Modality":                  (0x00080060, "CS"),
+    "SeriesDescription":         (0x0008103E, "LO"),
+    "PatientID":                 (0x00100020, "LO"),
+    "BodyPartExamined":          (0x00180015, "CS"),
+    "SliceThickness":            (0x00180050, "DS"),
+    "StudyInstanceUID":          (0x0020000D, "UI"),
+    "SeriesInstanceUID":         (0x0020000E, "UI"),
+    "InstanceNumber":            (0x00200013, "IS"),
+    "ImagePositionPatient":      (0x00200032, "DS"),
+    "SamplesPerPixel":           (0x00280002, "US"),
+    "PhotometricInterpretation": (0x00280004, "CS"),
+    "Rows":                      (0x00280010, "US"),
+    "Columns":                   (0x00280011, "US"),
+    "PixelSpacing":              (0x00280030, "DS"),
+    "BitsAllocated":             (0x00280100, "US"),
+    "BitsStored":                (0x00280101, "US"),
+    "HighBit":                   (0x00280102, "US"),
+    "PixelRepresentation":       (0x00280103, "US"),
+}
+_PIXEL_DATA_TAG = 0x7FE00010
+
+# 64×64 CT ramp (min < 0 < max, std > 0) — invariant, so encoded once per process
+CT_PIXELS = np.arange(64 * 64, dtype=np.int16).reshape(64, 64) - 1000
+CT_PIXEL_BYTES = CT_PIXELS.tobytes()
+
+# Counter-based UIDs: unique per process (pid) and call, no uuid/hash per call
+_UID_BASE = f"1.2.826.0.1.3680043.9.9999.{os.getpid()}."
+_uid_counter = itertools.count(1)
+
+
+def fast_uid() -> str:
+    """Return a fresh UID, unique within the test run (also across xdist workers)."""
+    return _UID_BASE + str(next(_uid_counter))
+
+
+def fixed_uid() -> str:
+    """Like :func:`fast_uid`, but always the same length (8-digit suffix, no leading zero)."""
+    return _UID_BASE + str(10_000_000 + next(_uid_counter))
+
+
+def _encode_value(vr: str, value: Any) -> bytes:
+    """Element value bytes, padded to even length (UI with NUL, text with space)."""
+    if vr == "US":
+        return struct.pack("<H", value)
+    if isinstance(value, (list, tuple)):
+        value = "\\".join(str(v) for v in value)
+    raw = str(value).encode("ascii")
+    if len(raw) % 2:
+        raw += b"\0" if vr == "UI" else b" "
+    return raw
+
+
+def _el_explicit(tag: int, vr: str, value: bytes) -> bytes:
+    """Explicit VR LE element (file meta group)."""
+    head = struct.pack("<HH", tag >> 16, tag & 0xFFFF) + vr.encode("ascii")
+    if vr == "OB":
+        return head + struct.pack("<HI", 0, len(value)) + value
+    return head + struct.pack("<H", len(value)) + value
+
+
+def _el_implicit(tag: int, value: bytes) -> bytes:
+    """Implicit VR LE element (dataset)."""
+    return struct.pack("<HHI", tag >> 16, tag & 0xFFFF, len(value)) + value
+
+
+def fast_dcm_bytes(elements: Mapping[str, Any], pixels: bytes | None = None) -> bytes:
+    """Encode *elements* (keyword → value) and optional *pixels* as a Part-10 file."""
+    meta = b"".join((
+        _el_explicit(0x00020001, "OB", b"\x00\x01"),
+        _el_explicit(0x00020002, "UI", _encode_value("UI", elements["SOPClassUID"])),
+        _el_explicit(0x00020003, "UI", _encode_value("UI", elements["SOPInstanceUID"])),
+        _el_explicit(0x00020010, "UI", _encode_value("UI", IMPLICIT_VR_LITTLE_ENDIAN)),
+        _el_explicit(0x00020012, "UI", _encode_value("UI", _IMPLEMENTATION_CLASS_UID)),
+    ))
+    parts = [_PREAMBLE, b"DICM", _el_explicit(0x00020000, "UL", struct.pack("<I", len(meta))), meta]
+    for keyword in sorted(elements, key=lambda k: _TAGS[k][0]):
+        tag, vr = _TAGS[keyword]
+        parts.append(_el_implicit(tag, _encode_value(vr, elements[keyword])))
+    if pixels is not None:
+        parts.append(_el_implicit(_PIXEL_DATA_TAG, pixels))
+    return b"".join(parts)
+
+
+def pydicom_dcm_bytes(elements: Mapping[str, Any], pixels: bytes | None = None) -> bytes:
+    """Reference encoding of the same elements through pydicom."""
+    from pydicom.dataset import Dataset, FileDataset
+
+    file_meta = Dataset()
+    file_meta.MediaStorageSOPClassUID    = elements["SOPClassUID"]
+    file_meta.MediaStorageSOPInstanceUID = elements["SOPInstanceUID"]
+    file_meta.TransferSyntaxUID          = IMPLICIT_VR_LITTLE_ENDIAN
+
+    ds = FileDataset("", {}, file_meta=file_meta, preamble=_PREAMBLE)
+    for keyword, value in elements.items():
+        setattr(ds, keyword, value)
+    if pixels is not None:
+        ds.PixelData = pixels
+
+    buf = io.BytesIO()
+    ds.save_as(buf, enforce_file_format=False)
+    return buf.getvalue()
+
+
+def dcm_bytes(elements: Mapping[str, Any], pixels: bytes | None = None) -> bytes:
+    """Encode a test DICOM file — hand-encoded unless USE_PYDICOM_FIXTURES=1."""
+    if USE_PYDICOM_FIXTURES:
+        return pydicom_dcm_bytes(elements, pixels)
+    return fast_dcm_bytes(elements, pixels)
@@ -0,0 +1,19 @@
+"""Read-only views of the shared test fixtures.
+
+Module-level fixture dicts are wrapped once at import and handed straight to
+the code under test — no per-test ``.copy()``, and any accidental write
+raises ``TypeError`` instead of leaking into later tests.
+"""
+from __future__ import annotations
+
+import types
+from typing import Any
+
+
+def freeze(obj: Any) -> Any:
+    """Recursively wrap dicts (also inside lists) in MappingProxyType."""
+    if isinstance(obj, dict):
+        return types.MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [freeze(v) for v in obj]
+    return obj
@@ -1,30 +1,34 @@
 """Tests for the Clinical Validation Agent.
 
 All Anthropic API calls are mocked — no network required.
-A fake 'anthropic' module is injected before the module under test is imported,
+A fake 'anthropic' module is injected into sys.modules by conftest.py,
 so tests run even when the anthropic package is not installed.
 """
 from __future__ import annotations
 
+import copy
 import sys
+from collections.abc import Mapping
 from typing import Any
 from unittest.mock import MagicMock
 
+import pytest
+
 # ---------------------------------------------------------------------------
-# Inject a fake 'anthropic' module BEFORE importing the module under test
+# Fake 'anthropic' module — installed by conftest.py before this module loads
 # ---------------------------------------------------------------------------
 
-_fake_anthropic = MagicMock(name="anthropic")
-sys.modules.setdefault("anthropic", _fake_anthropic)
-_fake_anthropic = sys.modules["anthropic"]  # always use whichever mock was installed first
+_fake_anthropic = sys.modules["anthropic"]
 
 from src.pipelines.clinical_validation import _PROTECTED_KEYS, validate_clinical  # noqa: E402
+from src.pipelines.generate_report import build_context  # noqa: E402
+from tests.readonly import freeze  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-_BASE_ANALYSIS: dict[str, Any] = {
+_BASE_ANALYSIS_RAW: dict[str, Any] = {
     "pipeline_version": "0.2.0",
     "case_id": "TEST_01",
     "patient_id": "PAT001",
@@ -73,6 +77,9 @@ _BASE_ANALYSIS: dict[str, Any] = {
     },
 }
 
+# Read-only view handed straight to the code under test — nothing copies it
+_BASE_ANALYSIS: Mapping[str, Any] = freeze(_BASE_ANALYSIS_RAW)
+
 _FAKE_TOOL_OUTPUT: dict[str, Any] = {
     "confidence_score": 0.92,
     "clinical_consistency_score": 0.88,
@@ -81,8 +88,8 @@ _FAKE_TOOL_OUTPUT: dict[str, Any] = {
 }
 
 
-def _setup_mock_api(tool_output: dict | None = _FAKE_TOOL_OUTPUT) -> MagicMock:
-    """Configure _fake_anthropic to return a successful tool_use response."""
+def _tool_response(tool_output: dict | None) -> MagicMock:
+    """Build a messages.create() response carrying *tool_output* (None → no content)."""
     tool_block = MagicMock()
     tool_block.type = "tool_use"
     tool_block.name = "validate_clinical_data"
@@ -90,24 +97,47 @@ def _setup_mock_api(tool_output: dict | None = _FAKE_TOOL_OUTPUT) -> MagicMock:
 
     response = MagicMock()
     response.content = [tool_block] if tool_output is not None else []
+    return response
+
+
+# Built once at import — tests only read them, so every setup is a pointer swap
+_CACHED_RESPONSE = _tool_response(_FAKE_TOOL_OUTPUT)
+_EMPTY_RESPONSE  = _tool_response(None)
+
 
+def _setup_mock_api(response: MagicMock = _CACHED_RESPONSE) -> MagicMock:
+    """Configure _fake_anthropic to return *response* (default: successful tool_use)."""
     _fake_anthropic.Anthropic.reset_mock(return_value=True, side_effect=True)
     _fake_anthropic.Anthropic.return_value.messages.create.return_value = response
     return response
 
 
+@pytest.fixture(scope="class")
+def mock_api_success() -> MagicMock:
+    """Install the cached successful response once per test class."""
+    return _setup_mock_api()
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_api_key():
+    """Unset ANTHROPIC_API_KEY once for the whole module (restored afterwards)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("ANTHROPIC_API_KEY", raising=False)
+        yield
+
+
 # ---------------------------------------------------------------------------
 # dry_run
 # ---------------------------------------------------------------------------
 
 class TestDryRun:
     def test_dry_run_returns_unchanged(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), dry_run=True)
+        result = validate_clinical(_BASE_ANALYSIS, dry_run=True)
         assert "validation" not in result
 
     def test_dry_run_never_calls_api(self):
         _fake_anthropic.reset_mock()
-        validate_clinical(_BASE_ANALYSIS.copy(), dry_run=True)
+        validate_clinical(_BASE_ANALYSIS, dry_run=True)
         _fake_anthropic.Anthropic.assert_not_called()
 
 
@@ -116,15 +146,13 @@ class TestDryRun:
 # ---------------------------------------------------------------------------
 
 class TestNoApiKey:
-    def test_no_key_returns_unchanged(self, monkeypatch):
-        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="")
+    def test_no_key_returns_unchanged(self):
+        result = validate_clinical(_BASE_ANALYSIS, api_key="")
         assert "validation" not in result
 
-    def test_no_key_never_calls_api(self, monkeypatch):
-        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    def test_no_key_never_calls_api(self):
         _fake_anthropic.reset_mock()
-        validate_clinical(_BASE_ANALYSIS.copy(), api_key="")
+        validate_clinical(_BASE_ANALYSIS, api_key="")
         _fake_anthropic.Anthropic.assert_not_called()
 
 
@@ -132,48 +160,46 @@ class TestNoApiKey:
 # Successful validation
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("mock_api_success")
 class TestValidationSuccess:
-    def setup_method(self):
-        _setup_mock_api()
-
     def test_validation_block_present(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert "validation" in result
 
     def test_confidence_score_in_range(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         score = result["validation"]["confidence_score"]
         assert 0.0 <= score <= 1.0
 
     def test_clinical_consistency_in_range(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         score = result["validation"]["clinical_consistency_score"]
         assert 0.0 <= score <= 1.0
 
     def test_scores_match_tool_output(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["validation"]["confidence_score"] == pytest.approx(0.92)
         assert result["validation"]["clinical_consistency_score"] == pytest.approx(0.88)
 
     def test_anomaly_flags_is_list(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert isinstance(result["validation"]["anomaly_flags"], list)
 
     def test_anomaly_flags_match_tool_output(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["validation"]["anomaly_flags"] == ["single_slice_only"]
 
     def test_validated_at_is_string(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert isinstance(result["validation"]["validated_at"], str)
         assert "T" in result["validation"]["validated_at"]  # ISO-8601
 
     def test_model_used_present(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["validation"]["model_used"] == "claude-haiku-4-5-20251001"
 
     def test_validation_notes_present(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["validation"]["validation_notes"] is not None
 
 
@@ -181,34 +207,34 @@ class TestValidationSuccess:
 # Protected fields never modified
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("mock_api_success")
 class TestProtectedFields:
-    def setup_method(self):
-        _setup_mock_api()
-
     def test_overall_status_unchanged(self):
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["overall_status"] == "unknown"
 
     def test_kpi_unchanged(self):
-        original = _BASE_ANALYSIS.copy()
-        result = validate_clinical(original, api_key="fake-key")
-        assert result["kpi"] == original["kpi"]
+        snapshot = copy.deepcopy(_BASE_ANALYSIS_RAW)
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
+        assert result["kpi"] == snapshot["kpi"]
+        assert _BASE_ANALYSIS == snapshot  # input not mutated either
 
     def test_dicom_block_unchanged(self):
-        original = _BASE_ANALYSIS.copy()
-        result = validate_clinical(original, api_key="fake-key")
-        assert result["dicom"] == original["dicom"]
+        snapshot = copy.deepcopy(_BASE_ANALYSIS_RAW)
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
+        assert result["dicom"] == snapshot["dicom"]
+        assert _BASE_ANALYSIS == snapshot
 
     def test_all_protected_keys_unchanged(self):
-        original = _BASE_ANALYSIS.copy()
-        result = validate_clinical(original, api_key="fake-key")
+        snapshot = copy.deepcopy(_BASE_ANALYSIS_RAW)
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         for key in _PROTECTED_KEYS:
-            if key in original:
-                assert result[key] == original[key], f"Protected key '{key}' was modified"
+            if key in snapshot:
+                assert result[key] == snapshot[key], f"Protected key '{key}' was modified"
+        assert _BASE_ANALYSIS == snapshot
 
     def test_pipeline_version_unchanged(self):
-        original = _BASE_ANALYSIS.copy()
-        result = validate_clinical(original, api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["pipeline_version"] == "0.2.0"
 
 
@@ -219,18 +245,18 @@ class TestProtectedFields:
 class TestGracefulDegradation:
     def test_api_exception_returns_original(self):
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = Exception("timeout")
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert "validation" not in result
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = None
 
     def test_empty_content_returns_original(self):
-        _setup_mock_api(tool_output=None)
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        _setup_mock_api(_EMPTY_RESPONSE)
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert "validation" not in result
 
     def test_runtime_error_returns_original(self):
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = RuntimeError("fail")
-        result = validate_clinical(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = validate_clinical(_BASE_ANALYSIS, api_key="fake-key")
         assert result["case_id"] == "TEST_01"
         assert result["overall_status"] == "unknown"
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = None
@@ -240,37 +266,33 @@ class TestGracefulDegradation:
 # Integration: validation appears in report
 # ---------------------------------------------------------------------------
 
-class TestValidationInReport:
-    def test_validation_block_in_report_context(self):
-        """validation block from analysis must flow into generate_report context."""
-        from src.pipelines.generate_report import build_context
-
-        analysis_with_validation = {
-            **_BASE_ANALYSIS,
-            "validation": {
-                "confidence_score": 0.9,
-                "clinical_consistency_score": 0.85,
-                "anomaly_flags": ["test_flag"],
-                "validation_notes": "Test note.",
-                "validated_at": "2024-07-15T12:00:00+00:00",
-                "model_used": "claude-haiku-4-5-20251001",
-            },
-        }
-        ctx = build_context([], analysis_with_validation)
-        assert ctx["validation"] is not None
-        assert ctx["validation"]["confidence_score"] == pytest.approx(0.9)
-        assert ctx["validation"]["anomaly_flags"] == ["test_flag"]
-
-    def test_no_validation_context_is_none(self):
-        """When validation is absent, context key is None — template handles it gracefully."""
-        from src.pipelines.generate_report import build_context
+@pytest.fixture(scope="module")
+def ctx_with_validation() -> dict[str, Any]:
+    return build_context([], {
+        **_BASE_ANALYSIS,
+        "validation": {
+            "confidence_score": 0.9,
+            "clinical_consistency_score": 0.85,
+            "anomaly_flags": ["test_flag"],
+            "validation_notes": "Test note.",
+            "validated_at": "2024-07-15T12:00:00+00:00",
+            "model_used": "claude-haiku-4-5-20251001",
+        },
+    })
 
-        ctx = build_context([], _BASE_ANALYSIS.copy())
-        assert ctx["validation"] is None
 
+@pytest.fixture(scope="module")
+def ctx_without_validation() -> dict[str, Any]:
+    return build_context([], _BASE_ANALYSIS)
 
-# ---------------------------------------------------------------------------
-# Import guard
-# ---------------------------------------------------------------------------
 
-import pytest  # noqa: E402 (placed at end to avoid shadowing)
+class TestValidationInReport:
+    def test_validation_block_in_report_context(self, ctx_with_validation):
+        """validation block from analysis must flow into generate_report context."""
+        assert ctx_with_validation["validation"] is not None
+        assert ctx_with_validation["validation"]["confidence_score"] == pytest.approx(0.9)
+        assert ctx_with_validation["validation"]["anomaly_flags"] == ["test_flag"]
+
+    def test_no_validation_context_is_none(self, ctx_without_validation):
+        """When validation is absent, context key is None — template handles it gracefully."""
+        assert ctx_without_validation["validation"] is None
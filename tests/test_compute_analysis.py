@@ -1,5 +1,7 @@
 """Tests for src/pipelines/compute_analysis.py — deterministic rules."""
 
+import pytest
+
 from src.pipelines.compute_analysis import (
     PROGRESSION_PCT_THRESHOLD,
     _days_between,
@@ -75,15 +77,14 @@ class TestComputeLesionDeltas:
         assert deltas[0]["status"] == "response"
         assert deltas[0]["delta_pct"] == -40.0
 
-    def test_stable(self):
-        deltas = compute_lesion_deltas([15.0], [15.5])
-        assert deltas[0]["status"] == "stable"
-
-    def test_multiple_lesions(self):
+    @pytest.mark.parametrize("baseline,last,expected_statuses", [
+        ([15.0],       [15.5],       ["stable"]),
         # Two lesions: first stable, second progressing
-        deltas = compute_lesion_deltas([10.0, 8.0], [11.0, 15.0])
-        assert deltas[0]["status"] == "stable"
-        assert deltas[1]["status"] == "progression"
+        ([10.0, 8.0],  [11.0, 15.0], ["stable", "progression"]),
+    ])
+    def test_statuses(self, baseline, last, expected_statuses):
+        deltas = compute_lesion_deltas(baseline, last)
+        assert [d["status"] for d in deltas] == expected_statuses
 
     def test_new_lesion_in_last_exam(self):
         # Baseline has 1, last has 2
@@ -112,26 +113,17 @@ class TestComputeLesionDeltas:
 # ===========================================================================
 
 class TestDetermineOverallStatus:
-    def test_progression_wins(self):
-        deltas = compute_lesion_deltas([10.0, 20.0], [18.0, 10.0])
-        # 10→18: +8mm/+80% = progression; 20→10: -50% = response
-        # progression should win
-        status, prog, resp, rule = determine_overall_status(deltas)
-        assert status == "progression"
-        assert 0 in prog
-
-    def test_response_when_no_progression(self):
-        deltas = compute_lesion_deltas([20.0], [12.0])
-        status, _, resp, _ = determine_overall_status(deltas)
-        assert status == "response"
-        assert 0 in resp
-
-    def test_stable(self):
-        deltas = compute_lesion_deltas([10.0], [10.5])
-        status, prog, resp, _ = determine_overall_status(deltas)
-        assert status == "stable"
-        assert prog == []
-        assert resp == []
+    @pytest.mark.parametrize("baseline,last,expected_status,expected_prog,expected_resp", [
+        # 10→18: +8mm/+80% = progression; 20→10: -50% = response — progression wins
+        ([10.0, 20.0], [18.0, 10.0], "progression", [0], [1]),
+        ([20.0],       [12.0],       "response",    [],  [0]),
+        ([10.0],       [10.5],       "stable",      [],  []),
+    ])
+    def test_overall_status(self, baseline, last, expected_status, expected_prog, expected_resp):
+        status, prog, resp, _ = determine_overall_status(compute_lesion_deltas(baseline, last))
+        assert status == expected_status
+        assert prog == expected_prog
+        assert resp == expected_resp
 
     def test_empty_deltas_gives_unknown(self):
         status, _, _, rule = determine_overall_status([])
@@ -393,13 +385,22 @@ class TestComputeDataCompletenessScore:
 # KPI integration via compute_analysis
 # ===========================================================================
 
+@pytest.fixture(scope="module")
+def kpi_result():
+    """compute_analysis on TIMELINE_TWO_EXAMS, run once for the read-only KPI tests."""
+    return compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")
+
+
+@pytest.fixture(scope="module")
+def kpi(kpi_result):
+    return kpi_result["kpi"]
+
+
 class TestKPIIntegration:
-    def test_kpi_key_present(self):
-        result = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")
-        assert "kpi" in result
+    def test_kpi_key_present(self, kpi_result):
+        assert "kpi" in kpi_result
 
-    def test_kpi_all_fields_present(self):
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
+    def test_kpi_all_fields_present(self, kpi):
         expected_keys = {
             "sum_diameters_baseline_mm", "sum_diameters_current_mm", "sum_diameters_delta_pct",
             "dominant_lesion_baseline_mm", "dominant_lesion_current_mm", "dominant_lesion_delta_pct",
@@ -408,38 +409,31 @@ class TestKPIIntegration:
         }
         assert set(kpi.keys()) == expected_keys
 
-    def test_sum_diameters_baseline(self):
+    def test_sum_diameters_baseline(self, kpi):
         # TIMELINE_TWO_EXAMS baseline = [10.0, 8.0] → sum = 18.0
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["sum_diameters_baseline_mm"] == 18.0
 
-    def test_sum_diameters_current(self):
+    def test_sum_diameters_current(self, kpi):
         # last exam = [18.0, 7.5] → sum = 25.5
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["sum_diameters_current_mm"] == 25.5
 
-    def test_sum_diameters_delta_pct(self):
+    def test_sum_diameters_delta_pct(self, kpi):
         # 18.0 → 25.5 = +41.7%
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["sum_diameters_delta_pct"] == round((25.5 - 18.0) / 18.0 * 100, 1)
 
-    def test_dominant_lesion_baseline(self):
+    def test_dominant_lesion_baseline(self, kpi):
         # max([10.0, 8.0]) = 10.0
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["dominant_lesion_baseline_mm"] == 10.0
 
-    def test_dominant_lesion_current(self):
+    def test_dominant_lesion_current(self, kpi):
         # max([18.0, 7.5]) = 18.0
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["dominant_lesion_current_mm"] == 18.0
 
-    def test_dominant_lesion_delta_pct(self):
+    def test_dominant_lesion_delta_pct(self, kpi):
         # 10.0 → 18.0 = +80%
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         assert kpi["dominant_lesion_delta_pct"] == 80.0
 
-    def test_lesion_counts(self):
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
+    def test_lesion_counts(self, kpi):
         assert kpi["lesion_count_baseline"] == 2
         assert kpi["lesion_count_current"] == 2
         assert kpi["lesion_count_delta"] == 0
@@ -454,9 +448,8 @@ class TestKPIIntegration:
         assert kpi["lesion_count_current"] == 2
         assert kpi["lesion_count_delta"] == 1
 
-    def test_growth_rate_computed(self):
+    def test_growth_rate_computed(self, kpi):
         # dominant: 10→18 over 182 days
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
         expected = round((18.0 - 10.0) / 182, 4)
         assert kpi["growth_rate_mm_per_day"] == expected
 
@@ -482,6 +475,5 @@ class TestKPIIntegration:
         assert kpi["dominant_lesion_baseline_mm"] is None
         assert kpi["growth_rate_mm_per_day"] is None
 
-    def test_data_completeness_score_type(self):
-        kpi = compute_analysis(TIMELINE_TWO_EXAMS, "CASE_KPI")["kpi"]
+    def test_data_completeness_score_type(self, kpi):
         assert isinstance(kpi["data_completeness_score"], float)
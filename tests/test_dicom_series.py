@@ -12,16 +12,46 @@ Covers:
 """
 from __future__ import annotations
 
-import json
+import io
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 import numpy as np
+import pydicom
 import pytest
 
+from src.pipelines.dicom_analysis import _read_pixels_direct, analyze_dicom, validate_analysis
+from src.pipelines.json_io import read_json
+from src.pipelines.run_case import main as run_main
+from src.pipelines.run_case import run_case
+from tests.dicom_factory import CT_PIXEL_BYTES, CT_PIXELS, dcm_bytes, fast_dcm_bytes, fast_uid, fixed_uid, pydicom_dcm_bytes
+
+# Below this many slices thread start-up costs more than the overlapped writes save
+_PARALLEL_WRITE_MIN = 4
+
+
 # ---------------------------------------------------------------------------
 # DICOM factories
 # ---------------------------------------------------------------------------
 
+# Unbuffered create-or-truncate: no Python file object, one write syscall per file
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _write_file(path: Path, data: bytes | bytearray) -> None:
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def _make_dicom_slice(
     out_dir: Path,
     filename: str,
@@ -33,99 +63,139 @@ def _make_dicom_slice(
     study_uid: str | None = None,
 ) -> Path:
     """Create a single DICOM slice with configurable InstanceNumber and z-position."""
-    from pydicom.dataset import Dataset, FileDataset
-    from pydicom.uid import ExplicitVRLittleEndian, generate_uid
-
     out_dir.mkdir(parents=True, exist_ok=True)
     dcm_path = out_dir / filename
-
-    sop_uid = generate_uid()
-    file_meta = Dataset()
-    file_meta.MediaStorageSOPClassUID    = "1.2.840.10008.5.1.4.1.1.2"
-    file_meta.MediaStorageSOPInstanceUID = sop_uid
-    file_meta.TransferSyntaxUID          = ExplicitVRLittleEndian
-
-    ds = FileDataset(str(dcm_path), {}, file_meta=file_meta, preamble=b"\0" * 128)
-
-    ds.PatientID         = patient_id
-    ds.StudyInstanceUID  = study_uid or generate_uid()
-    ds.SeriesInstanceUID = series_uid or generate_uid()
-    ds.SOPInstanceUID    = sop_uid
-    ds.SOPClassUID       = file_meta.MediaStorageSOPClassUID
-
-    ds.Modality                  = modality
-    ds.StudyDate                 = "20240715"
-    ds.BodyPartExamined          = "CHEST"
-    ds.InstanceNumber            = str(instance_number)
-    ds.PixelSpacing              = [0.703125, 0.703125]
-    ds.SliceThickness            = 2.5
-    ds.ImagePositionPatient      = [0.0, 0.0, z_position]
-
-    rng = np.random.default_rng(instance_number)
-    arr = rng.integers(low=-1000, high=500, size=(64, 64), dtype=np.int16)
-    ds.Rows                      = 64
-    ds.Columns                   = 64
-    ds.BitsAllocated             = 16
-    ds.BitsStored                = 16
-    ds.HighBit                   = 15
-    ds.PixelRepresentation       = 1
-    ds.SamplesPerPixel           = 1
-    ds.PhotometricInterpretation = "MONOCHROME2"
-    ds.PixelData                 = arr.tobytes()
-
-    ds.save_as(str(dcm_path), enforce_file_format=True)
+    elements = _slice_elements(instance_number, z_position, modality, patient_id, series_uid, study_uid)
+    _write_file(dcm_path, dcm_bytes(elements, CT_PIXEL_BYTES))
     return dcm_path
 
 
+def _slice_elements(
+    instance_number: int | str = 1,
+    z_position: float | str = 0.0,
+    modality: str = "CT",
+    patient_id: str = "SERIESPAT",
+    series_uid: str | None = None,
+    study_uid: str | None = None,
+    sop_uid: str | None = None,
+) -> dict[str, Any]:
+    """Elements of the CT slice behind :func:`_make_dicom_slice` (pixels excluded)."""
+    return {
+        "PatientID":                 patient_id,
+        "StudyInstanceUID":          study_uid or fast_uid(),
+        "SeriesInstanceUID":         series_uid or fast_uid(),
+        "SOPInstanceUID":            sop_uid or fast_uid(),
+        "SOPClassUID":               "1.2.840.10008.5.1.4.1.1.2",
+        "Modality":                  modality,
+        "StudyDate":                 "20240715",
+        "BodyPartExamined":          "CHEST",
+        "InstanceNumber":            str(instance_number),
+        "PixelSpacing":              [0.703125, 0.703125],
+        "SliceThickness":            2.5,
+        "ImagePositionPatient":      [0.0, 0.0, z_position],
+        "Rows":                      64,
+        "Columns":                   64,
+        "BitsAllocated":             16,
+        "BitsStored":                16,
+        "HighBit":                   15,
+        "PixelRepresentation":       1,
+        "SamplesPerPixel":           1,
+        "PhotometricInterpretation": "MONOCHROME2",
+    }
+
+
+def _value_at(blob: bytes, header: bytes) -> int:
+    """Offset of the value following the element *header* (tag + VR/length bytes)."""
+    return blob.index(header) + len(header)
+
+
 def _make_series_folder(
     out_dir: Path,
     n_slices: int = 5,
     modality: str = "CT",
 ) -> Path:
-    """Create a folder containing *n_slices* DICOM CT slices."""
-    from pydicom.uid import generate_uid
+    """Create a folder containing *n_slices* DICOM CT slices.
 
-    series_uid = generate_uid()
-    study_uid  = generate_uid()
+    A single template slice is encoded with fixed-width varying values (SOP
+    UID, InstanceNumber, z-position, pixels); every slice is that blob with
+    those byte ranges patched in place, then the files are written concurrently.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    uid = fixed_uid()
+    template = dcm_bytes(
+        _slice_elements("000000", "00000.00", modality=modality, sop_uid=uid),
+        CT_PIXEL_BYTES,
+    )
+
+    # File meta is always explicit VR; the dataset itself is implicit VR
+    uid_len = len(uid) + len(uid) % 2
+    uid_at = (
+        _value_at(template, struct.pack("<HH", 0x0002, 0x0003) + b"UI" + struct.pack("<H", uid_len)),
+        _value_at(template, struct.pack("<HHI", 0x0008, 0x0018, uid_len)),
+    )
+    in_at = _value_at(template, struct.pack("<HHI", 0x0020, 0x0013, 6))
+    z_at  = _value_at(template, struct.pack("<HHI", 0x0020, 0x0032, 16)) + len(b"0.0\\0.0\\")
+    px_at = len(template) - len(CT_PIXEL_BYTES)  # PixelData is the last element
+
+    blobs: list[tuple[Path, bytearray]] = []
+    # Same ramp as _make_dicom_slice, offset by one per slice (stays well inside int16)
+    volume = CT_PIXELS + np.arange(n_slices, dtype=np.int16)[:, None, None]
     for i in range(1, n_slices + 1):
-        _make_dicom_slice(
-            out_dir,
-            filename=f"slice_{i:03d}.dcm",
-            instance_number=i,
-            z_position=float(i) * 2.5,
-            modality=modality,
-            series_uid=series_uid,
-            study_uid=study_uid,
-        )
+        blob = bytearray(template)
+        sop_uid = fixed_uid().encode()
+        for at in uid_at:
+            blob[at:at + len(sop_uid)] = sop_uid
+        blob[in_at:in_at + 6] = b"%06d" % i
+        blob[z_at:z_at + 8]   = b"%08.2f" % (i * 2.5)
+        blob[px_at:]          = volume[i - 1].tobytes()
+        blobs.append((out_dir / f"slice_{i:03d}.dcm", blob))
+
+    # The file writes release the GIL, so overlap them
+    if n_slices >= _PARALLEL_WRITE_MIN:
+        with ThreadPoolExecutor(max_workers=min(n_slices, 8)) as pool:
+            list(pool.map(lambda job: _write_file(*job), blobs))
+    else:
+        for path, blob in blobs:
+            _write_file(path, blob)
     return out_dir
 
 
-def _make_sr_file(out_dir: Path) -> Path:
-    """Create a minimal DICOM SR (Structured Report) file — no pixel data."""
-    from pydicom.dataset import Dataset, FileDataset
-    from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+@lru_cache(maxsize=1)
+def _sr_bytes() -> bytes:
+    """Encoded minimal DICOM SR (Structured Report) — no pixel data, built once."""
+    return dcm_bytes({
+        "PatientID":         "SRPAT",
+        "StudyInstanceUID":  fast_uid(),
+        "SeriesInstanceUID": fast_uid(),
+        "SOPInstanceUID":    fast_uid(),
+        "SOPClassUID":       "1.2.840.10008.5.1.4.1.1.88.11",  # Basic SR
+        "Modality":          "SR",
+        "StudyDate":         "20240715",
+    })
 
+
+def _make_sr_file(out_dir: Path) -> Path:
+    """Write the cached SR object to ``out_dir/report.dcm``."""
     out_dir.mkdir(parents=True, exist_ok=True)
     dcm_path = out_dir / "report.dcm"
-    sop_uid = generate_uid()
-
-    file_meta = Dataset()
-    file_meta.MediaStorageSOPClassUID    = "1.2.840.10008.5.1.4.1.1.88.11"  # Basic SR
-    file_meta.MediaStorageSOPInstanceUID = sop_uid
-    file_meta.TransferSyntaxUID          = ExplicitVRLittleEndian
-
-    ds = FileDataset(str(dcm_path), {}, file_meta=file_meta, preamble=b"\0" * 128)
-    ds.PatientID        = "SRPAT"
-    ds.StudyInstanceUID = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID   = sop_uid
-    ds.SOPClassUID      = file_meta.MediaStorageSOPClassUID
-    ds.Modality         = "SR"
-    ds.StudyDate        = "20240715"
-    ds.save_as(str(dcm_path), enforce_file_format=True)
+    _write_file(dcm_path, _sr_bytes())
     return dcm_path
 
 
+# ---------------------------------------------------------------------------
+# Shared single-slice analysis (read-only — built and analysed once)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def shared_single_dcm(tmp_path_factory) -> Path:
+    return _make_dicom_slice(tmp_path_factory.mktemp("shared"), "slice.dcm")
+
+
+@pytest.fixture(scope="session")
+def shared_single_analysis(shared_single_dcm) -> dict:
+    return analyze_dicom(shared_single_dcm)
+
+
 # ---------------------------------------------------------------------------
 # Single-file imaging block
 # ---------------------------------------------------------------------------
@@ -133,85 +203,109 @@ def _make_sr_file(out_dir: Path) -> Path:
 class TestSingleFileImagingBlock:
     """imaging block is correct for a single .dcm input."""
 
-    def test_input_kind_is_single(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["imaging"]["input_kind"] == "single"
-
-    def test_n_slices_is_one(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["imaging"]["n_slices"] == 1
-
-    def test_is_3d_false(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["imaging"]["is_3d"] is False
-
-    def test_volume_shape_length_three(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert len(result["imaging"]["volume_shape"]) == 3
-
-    def test_spacing_mm_length_three(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert len(result["imaging"]["spacing_mm"]) == 3
-
-    def test_sorting_key_is_none_for_single(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["imaging"]["sorting_key_used"] == "none"
+    @pytest.mark.parametrize("key,check", [
+        ("input_kind",       lambda v: v == "single"),
+        ("n_slices",         lambda v: v == 1),
+        ("is_3d",            lambda v: v is False),
+        ("volume_shape",     lambda v: len(v) == 3),
+        ("spacing_mm",       lambda v: len(v) == 3),
+        ("sorting_key_used", lambda v: v == "none"),
+    ])
+    def test_imaging_field(self, shared_single_analysis, key, check):
+        assert check(shared_single_analysis["imaging"][key]), shared_single_analysis["imaging"][key]
 
 
 # ---------------------------------------------------------------------------
 # Series folder imaging block
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="class")
+def series_result(tmp_path_factory) -> dict:
+    """One 5-slice series analysed once for every TestSeriesFolderImagingBlock test."""
+    folder = _make_series_folder(tmp_path_factory.mktemp("series"), n_slices=5)
+    return analyze_dicom(folder)
+
+
 class TestSeriesFolderImagingBlock:
     """imaging block is correct for a folder of slices."""
 
-    @pytest.fixture()
-    def series_result(self, tmp_path):
-        folder = _make_series_folder(tmp_path / "series", n_slices=5)
-        from src.pipelines.dicom_analysis import analyze_dicom
-        return analyze_dicom(folder)
+    @pytest.mark.parametrize("key,check", [
+        ("input_kind",          lambda v: v == "series"),
+        ("n_slices",            lambda v: v == 5),
+        ("is_3d",               lambda v: v is True),
+        ("volume_shape",        lambda v: v[0] == 5),
+        ("series_instance_uid", lambda v: v is not None),
+        ("sorting_key_used",    lambda v: v in {"InstanceNumber", "ImagePositionPatient"}),
+    ])
+    def test_imaging_field(self, series_result, key, check):
+        assert check(series_result["imaging"][key]), series_result["imaging"][key]
 
-    def test_input_kind_is_series(self, series_result):
-        assert series_result["imaging"]["input_kind"] == "series"
+    def test_schema_valid_for_series(self, series_result):
+        validate_analysis(series_result)  # must not raise
 
-    def test_n_slices_matches_folder(self, series_result):
-        assert series_result["imaging"]["n_slices"] == 5
+    def test_image_stats_shape_has_three_dims(self, series_result):
+        shape = series_result["dicom"]["image_stats"]["shape"]
+        assert len(shape) == 3
+        assert shape[0] == 5
 
-    def test_is_3d_true(self, series_result):
-        assert series_result["imaging"]["is_3d"] is True
 
-    def test_volume_shape_first_dim_matches(self, series_result):
-        assert series_result["imaging"]["volume_shape"][0] == 5
+# ---------------------------------------------------------------------------
+# Hand-encoded fixtures vs pydicom's encoder
+# ---------------------------------------------------------------------------
 
-    def test_series_uid_populated(self, series_result):
-        assert series_result["imaging"]["series_instance_uid"] is not None
+class TestFastDicomBytes:
+    """fast_dcm_bytes must decode exactly like pydicom's own encoding of the same elements."""
 
-    def test_sorting_key_used(self, series_result):
-        key = series_result["imaging"]["sorting_key_used"]
-        assert key in {"InstanceNumber", "ImagePositionPatient"}
+    def test_matches_pydicom_encoding(self):
+        elements = _slice_elements(instance_number=3, z_position=7.5)
+        fast = pydicom.dcmread(io.BytesIO(fast_dcm_bytes(elements, CT_PIXEL_BYTES)))
+        ref  = pydicom.dcmread(io.BytesIO(pydicom_dcm_bytes(elements, CT_PIXEL_BYTES)))
 
-    def test_schema_valid_for_series(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom, validate_analysis
-        folder = _make_series_folder(tmp_path / "series", n_slices=3)
-        result = analyze_dicom(folder)
-        validate_analysis(result)  # must not raise
+        assert fast.file_meta.TransferSyntaxUID == ref.file_meta.TransferSyntaxUID
+        assert fast.file_meta.MediaStorageSOPInstanceUID == ref.file_meta.MediaStorageSOPInstanceUID
+        for keyword in elements:
+            assert fast[keyword].value == ref[keyword].value, keyword
+        assert np.array_equal(fast.pixel_array, ref.pixel_array)
 
-    def test_image_stats_shape_has_three_dims(self, series_result):
-        shape = series_result["dicom"]["image_stats"]["shape"]
-        assert len(shape) == 3
-        assert shape[0] == 5
+
+# ---------------------------------------------------------------------------
+# Direct pixel read (uncompressed little-endian fast path)
+# ---------------------------------------------------------------------------
+
+class TestDirectPixelRead:
+    """_read_pixels_direct must match pydicom's decoded pixel_array exactly."""
+
+    def test_matches_pixel_array(self, tmp_path):
+        dcm = _make_dicom_slice(tmp_path, "slice.dcm", instance_number=7)
+        arr = _read_pixels_direct(pydicom.dcmread(str(dcm), defer_size=1024), dcm)
+        assert arr is not None
+        assert np.array_equal(arr, pydicom.dcmread(str(dcm)).pixel_array)
+
+    def test_returns_none_without_pixel_data(self, tmp_path):
+        sr = _make_sr_file(tmp_path)
+        assert _read_pixels_direct(pydicom.dcmread(str(sr), defer_size=1024), sr) is None
+
+    def test_fallback_decodes_without_rereading(self, tmp_path, monkeypatch):
+        """12-bit CT skips the fast path but must still read each slice only once."""
+        series_uid = fast_uid()
+        pixels = np.arange(64 * 64, dtype=np.uint16).reshape(64, 64)
+        for i in range(4):
+            elements = _slice_elements(i + 1, float(i), series_uid=series_uid)
+            elements.update(BitsStored=12, HighBit=11, PixelRepresentation=0)
+            _write_file(tmp_path / f"s{i}.dcm", dcm_bytes(elements, pixels.tobytes()))
+
+        reads: list[str] = []
+        real_dcmread = pydicom.dcmread
+
+        def counting_dcmread(fp, *args, **kwargs):
+            reads.append(str(fp))
+            return real_dcmread(fp, *args, **kwargs)
+
+        monkeypatch.setattr(pydicom, "dcmread", counting_dcmread)
+        stats = analyze_dicom(tmp_path)["dicom"]["image_stats"]
+
+        assert stats["max"] == 4095.0
+        assert len(reads) == len(set(reads)) * 2  # one header scan + one pixel read per slice
 
 
 # ---------------------------------------------------------------------------
@@ -222,20 +316,17 @@ class TestNonImageRejection:
     """SR and other non-image DICOM objects must be rejected before pixel access."""
 
     def test_sr_single_file_raises_value_error(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
         sr_path = _make_sr_file(tmp_path)
         with pytest.raises(ValueError, match="Non-image DICOM rejected"):
             analyze_dicom(sr_path)
 
     def test_sr_error_message_contains_modality(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
         sr_path = _make_sr_file(tmp_path)
         with pytest.raises(ValueError, match="SR"):
             analyze_dicom(sr_path)
 
     def test_folder_with_only_sr_raises(self, tmp_path):
         """A folder where all files are SR must raise ValueError."""
-        from src.pipelines.dicom_analysis import analyze_dicom
         folder = tmp_path / "sr_folder"
         _make_sr_file(folder)  # creates one SR
         with pytest.raises(ValueError):
@@ -249,39 +340,28 @@ class TestNonImageRejection:
 class TestStatusReason:
     """status_reason reflects why overall_status is set."""
 
-    def test_single_file_reason_is_no_timeline(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["status_reason"] == "no_timeline"
+    def test_single_file_reason_is_no_timeline(self, shared_single_analysis):
+        assert shared_single_analysis["status_reason"] == "no_timeline"
 
     def test_series_folder_reason_is_no_timeline(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
         folder = _make_series_folder(tmp_path / "series", n_slices=3)
         result = analyze_dicom(folder)
         assert result["status_reason"] == "no_timeline"
 
-    def test_status_explanation_is_non_empty_string(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert isinstance(result["status_explanation"], str)
-        assert len(result["status_explanation"]) > 0
+    def test_status_explanation_is_non_empty_string(self, shared_single_analysis):
+        assert isinstance(shared_single_analysis["status_explanation"], str)
+        assert len(shared_single_analysis["status_explanation"]) > 0
 
-    def test_overall_status_is_unknown_no_timeline(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-        dcm = _make_dicom_slice(tmp_path, "slice.dcm")
-        result = analyze_dicom(dcm)
-        assert result["overall_status"] == "unknown"
+    def test_overall_status_is_unknown_no_timeline(self, shared_single_analysis):
+        assert shared_single_analysis["overall_status"] == "unknown"
 
     def test_status_explanation_appears_in_report(self, tmp_path):
         """status_explanation must be visible in the rendered Markdown report."""
-        from src.pipelines.run_case import run_case
         dcm = _make_dicom_slice(tmp_path / "in", "slice.dcm")
         out = tmp_path / "out"
         run_case(dicom_path=dcm, out_dir=out, case_id="STATUS_01")
         report = (out / "final_report.md").read_text()
-        analysis = json.loads((out / "analysis.json").read_text())
+        analysis = read_json(out / "analysis.json")
         # The explanation string (or at least part of it) must appear in report
         assert analysis["status_explanation"][:30] in report
 
@@ -298,7 +378,6 @@ class TestCLIUpgrades:
         monkeypatch.chdir(tmp_path)
         dcm = _make_dicom_slice(tmp_path / "in", "slice.dcm")
 
-        from src.pipelines.run_case import main as run_main
         run_main(["--dicom", str(dcm), "--case-id", "DEFAULT_OUT"])
 
         expected = tmp_path / "data" / "processed" / "DEFAULT_OUT"
@@ -310,9 +389,8 @@ class TestCLIUpgrades:
         folder = _make_series_folder(tmp_path / "series", n_slices=3)
         out = tmp_path / "out"
 
-        from src.pipelines.run_case import main as run_main
         run_main(["--dicom", str(folder), "--case-id", "SERIES_CLI", "--out", str(out)])
 
-        data = json.loads((out / "analysis.json").read_text())
+        data = read_json(out / "analysis.json")
         assert data["imaging"]["input_kind"] == "series"
         assert data["imaging"]["n_slices"] == 3
@@ -5,11 +5,22 @@ test_e2e_missing_dicom — No DICOM, pipeline exits with non-zero status.
 """
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
+from types import SimpleNamespace
 
+import jsonschema
 import numpy as np
+import pandas as pd
 import pytest
+from pydicom.uid import JPEG2000Lossless
+
+from src.pipelines.dicom_analysis import _schema_validator, analyze_dicom, extract_image_stats, validate_analysis
+from src.pipelines.dicom_analysis import main as dicom_main
+from src.pipelines.json_io import read_json
+from src.pipelines.run_case import main as run_main
+from src.pipelines.run_case import run_case
+from tests.dicom_factory import CT_PIXEL_BYTES, dcm_bytes, fast_uid
 
 # ---------------------------------------------------------------------------
 # Synthetic DICOM factory
@@ -18,56 +29,40 @@ import pytest
 def _make_synthetic_dicom(out_dir: Path, patient_id: str = "TESTPAT001") -> Path:
     """Create a minimal but fully valid DICOM CT slice for testing.
 
-    Uses pydicom to write a real .dcm file with:
+    Writes a real Part-10 .dcm file (see tests/dicom_factory.py) with:
     - All required metadata tags
     - PixelSpacing and SliceThickness
     - A 64×64 int16 pixel array (CT HU range)
     """
-    from pydicom.dataset import Dataset, FileDataset
-    from pydicom.uid import ExplicitVRLittleEndian, generate_uid
-
     out_dir.mkdir(parents=True, exist_ok=True)
     dcm_path = out_dir / "slice_001.dcm"
-
-    sop_uid = generate_uid()
-
-    file_meta = Dataset()
-    file_meta.MediaStorageSOPClassUID    = "1.2.840.10008.5.1.4.1.1.2"  # CT Storage
-    file_meta.MediaStorageSOPInstanceUID = sop_uid
-    file_meta.TransferSyntaxUID          = ExplicitVRLittleEndian
-
-    ds = FileDataset(str(dcm_path), {}, file_meta=file_meta, preamble=b"\0" * 128)
-
-    # Patient / study / series
-    ds.PatientID         = patient_id
-    ds.StudyInstanceUID  = generate_uid()
-    ds.SeriesInstanceUID = generate_uid()
-    ds.SOPInstanceUID    = sop_uid
-    ds.SOPClassUID       = file_meta.MediaStorageSOPClassUID
-
-    # Descriptors
-    ds.Modality                  = "CT"
-    ds.StudyDate                 = "20240715"
-    ds.BodyPartExamined          = "CHEST"
-    ds.SeriesDescription         = "CT THORAX SYNTHETIQUE"
-    ds.InstanceNumber            = "1"
-    ds.PixelSpacing              = [0.703125, 0.703125]
-    ds.SliceThickness            = 1.5
-
-    # Pixel data — 64×64 CT HU range signed int16
-    rng = np.random.default_rng(42)
-    arr = rng.integers(low=-1000, high=500, size=(64, 64), dtype=np.int16)
-    ds.Rows                      = 64
-    ds.Columns                   = 64
-    ds.BitsAllocated             = 16
-    ds.BitsStored                = 16
-    ds.HighBit                   = 15
-    ds.PixelRepresentation       = 1   # signed
-    ds.SamplesPerPixel           = 1
-    ds.PhotometricInterpretation = "MONOCHROME2"
-    ds.PixelData                 = arr.tobytes()
-
-    ds.save_as(str(dcm_path), enforce_file_format=True)
+    dcm_path.write_bytes(dcm_bytes({
+        # Patient / study / series
+        "PatientID":                 patient_id,
+        "StudyInstanceUID":          fast_uid(),
+        "SeriesInstanceUID":         fast_uid(),
+        "SOPInstanceUID":            fast_uid(),
+        "SOPClassUID":               "1.2.840.10008.5.1.4.1.1.2",  # CT Storage
+
+        # Descriptors
+        "Modality":                  "CT",
+        "StudyDate":                 "20240715",
+        "BodyPartExamined":          "CHEST",
+        "SeriesDescription":         "CT THORAX SYNTHETIQUE",
+        "InstanceNumber":            "1",
+        "PixelSpacing":              [0.703125, 0.703125],
+        "SliceThickness":            1.5,
+
+        # Pixel data — 64×64 CT HU range signed int16
+        "Rows":                      64,
+        "Columns":                   64,
+        "BitsAllocated":             16,
+        "BitsStored":                16,
+        "HighBit":                   15,
+        "PixelRepresentation":       1,   # signed
+        "SamplesPerPixel":           1,
+        "PhotometricInterpretation": "MONOCHROME2",
+    }, CT_PIXEL_BYTES))
     return dcm_path
 
 
@@ -76,46 +71,41 @@ def _make_synthetic_dicom(out_dir: Path, patient_id: str = "TESTPAT001") -> Path
 # ---------------------------------------------------------------------------
 
 def _load_analysis(out_dir: Path) -> dict:
-    return json.loads((out_dir / "analysis.json").read_text())
+    return read_json(out_dir / "analysis.json")
 
 
 # ---------------------------------------------------------------------------
 # test_e2e_success
 # ---------------------------------------------------------------------------
 
-class TestE2ESuccess:
-    """Full pipeline: DICOM → analysis.json (schema-valid) → final_report.md."""
-
-    def test_outputs_exist(self, tmp_path):
-        dcm_path = _make_synthetic_dicom(tmp_path / "input")
-        out_dir  = tmp_path / "output"
-
-        from src.pipelines.run_case import run_case
-        outputs = run_case(dicom_path=dcm_path, out_dir=out_dir, case_id="TEST_01")
+@pytest.fixture(scope="class")
+def e2e_run(tmp_path_factory) -> dict:
+    """Run the pipeline once on the default synthetic slice; tests only read the outputs."""
+    base     = tmp_path_factory.mktemp("e2e")
+    dcm_path = _make_synthetic_dicom(base / "input")
+    out_dir  = base / "output"
 
-        assert outputs["analysis"].exists(), "analysis.json must be created"
-        assert outputs["report"].exists(),   "final_report.md must be created"
+    outputs = run_case(dicom_path=dcm_path, out_dir=out_dir, case_id="TEST_01")
+    return {
+        "out_dir":  out_dir,
+        "outputs":  outputs,
+        "analysis": _load_analysis(out_dir),
+        "report":   (out_dir / "final_report.md").read_text(encoding="utf-8"),
+    }
 
-    def test_analysis_json_schema_valid(self, tmp_path):
-        dcm_path = _make_synthetic_dicom(tmp_path / "input")
-        out_dir  = tmp_path / "output"
 
-        from src.pipelines.dicom_analysis import validate_analysis
-        from src.pipelines.run_case import run_case
+class TestE2ESuccess:
+    """Full pipeline: DICOM → analysis.json (schema-valid) → final_report.md."""
 
-        run_case(dicom_path=dcm_path, out_dir=out_dir, case_id="TEST_01")
+    def test_outputs_exist(self, e2e_run):
+        assert e2e_run["outputs"]["analysis"].exists(), "analysis.json must be created"
+        assert e2e_run["outputs"]["report"].exists(),   "final_report.md must be created"
 
-        analysis = _load_analysis(out_dir)
-        validate_analysis(analysis)  # raises jsonschema.ValidationError on failure
+    def test_analysis_json_schema_valid(self, e2e_run):
+        validate_analysis(e2e_run["analysis"])  # raises jsonschema.ValidationError on failure
 
-    def test_analysis_has_dicom_block(self, tmp_path):
-        dcm_path = _make_synthetic_dicom(tmp_path / "input")
-        out_dir  = tmp_path / "output"
-
-        from src.pipelines.run_case import run_case
-        run_case(dicom_path=dcm_path, out_dir=out_dir, case_id="TEST_01")
-
-        analysis = _load_analysis(out_dir)
+    def test_analysis_has_dicom_block(self, e2e_run):
+        analysis = e2e_run["analysis"]
         assert "dicom" in analysis,               "analysis.json must contain 'dicom' key"
         assert "metadata" in analysis["dicom"],   "dicom block must contain 'metadata'"
         assert "image_stats" in analysis["dicom"], "dicom block must contain 'image_stats'"
@@ -124,7 +114,6 @@ class TestE2ESuccess:
         dcm_path = _make_synthetic_dicom(tmp_path / "input", patient_id="P999")
         out_dir  = tmp_path / "output"
 
-        from src.pipelines.run_case import run_case
         run_case(dicom_path=dcm_path, out_dir=out_dir)
 
         meta = _load_analysis(out_dir)["dicom"]["metadata"]
@@ -135,60 +124,87 @@ class TestE2ESuccess:
         assert meta["PixelSpacing"]     == [0.703125, 0.703125]
         assert meta["SliceThickness"]   == pytest.approx(1.5)
 
-    def test_pixel_array_actually_loaded(self, tmp_path):
+    def test_pixel_array_actually_loaded(self, e2e_run):
         """pixel_array stats must reflect real pixel values, not defaults."""
-        dcm_path = _make_synthetic_dicom(tmp_path / "input")
-        out_dir  = tmp_path / "output"
-
-        from src.pipelines.run_case import run_case
-        run_case(dicom_path=dcm_path, out_dir=out_dir)
-
-        stats = _load_analysis(out_dir)["dicom"]["image_stats"]
+        stats = e2e_run["analysis"]["dicom"]["image_stats"]
         assert stats["shape"] == [64, 64]
-        # Synthetic array range: [-1000, 500) → max must be > 0
+        # Synthetic ramp: [-1000, 3096) → max must be > 0
         assert stats["max"] > 0
         assert stats["min"] < 0         # CT HU range has negatives
         assert stats["std"] > 0         # non-constant image
         assert 0.0 <= stats["data_consistency_score"] <= 1.0
 
-    def test_report_contains_imaging_section(self, tmp_path):
-        dcm_path = _make_synthetic_dicom(tmp_path / "input")
-        out_dir  = tmp_path / "output"
-
-        from src.pipelines.run_case import run_case
-        run_case(dicom_path=dcm_path, out_dir=out_dir)
-
-        report = (out_dir / "final_report.md").read_text()
+    def test_report_contains_imaging_section(self, e2e_run):
+        report = e2e_run["report"]
         assert "Imaging Findings" in report
         assert "CT" in report                   # Modality
         assert "CHEST" in report                # BodyPartExamined
         assert "0.703125" in report             # PixelSpacing
 
-    def test_overall_status_is_unknown_for_single_instance(self, tmp_path):
+    def test_overall_status_is_unknown_for_single_instance(self, e2e_run):
         """A single DICOM cannot produce a comparison → status must be 'unknown'."""
+        assert e2e_run["analysis"]["overall_status"] == "unknown"
+
+    def test_no_timeline_without_excel(self, e2e_run):
+        assert "timeline" not in e2e_run["outputs"]
+        assert not (e2e_run["out_dir"] / "timeline.json").exists()
+
+    def test_timeline_written_with_excel(self, tmp_path):
         dcm_path = _make_synthetic_dicom(tmp_path / "input")
         out_dir  = tmp_path / "output"
+        xlsx     = tmp_path / "case.xlsx"
+        pd.DataFrame({
+            "Patient ID": ["TESTPAT001", "TESTPAT001"],
+            "Study Date": ["2024-06-01", "2024-01-01"],
+        }).to_excel(xlsx, index=False)
 
-        from src.pipelines.run_case import run_case
-        run_case(dicom_path=dcm_path, out_dir=out_dir)
+        outputs = run_case(dicom_path=dcm_path, out_dir=out_dir, excel_path=xlsx)
+
+        assert outputs["timeline"] == out_dir / "timeline.json"
+        timeline = read_json(outputs["timeline"])
+        assert [e["study_date"] for e in timeline] == ["2024-01-01", "2024-06-01"]
+
+    def test_excel_failure_fails_run_after_analysis_written(self, tmp_path):
+        """An unreadable workbook fails the run, but analysis.json is already on disk."""
+        dcm_path = _make_synthetic_dicom(tmp_path / "input")
+        out_dir  = tmp_path / "output"
+        xlsx     = tmp_path / "empty.xlsx"
+        pd.DataFrame({"Patient ID": [None]}).to_excel(xlsx, index=False)
+
+        with pytest.raises(ValueError, match="No data rows"):
+            run_case(dicom_path=dcm_path, out_dir=out_dir, excel_path=xlsx)
+
+        assert (out_dir / "analysis.json").exists()
+        assert not (out_dir / "final_report.md").exists()
 
-        assert _load_analysis(out_dir)["overall_status"] == "unknown"
+    def test_failed_validation_skips_excel(self, tmp_path, monkeypatch):
+        def reject(analysis):
+            raise jsonschema.ValidationError("forced failure")
 
-    def test_no_timeline_without_excel(self, tmp_path):
+        monkeypatch.setattr("src.pipelines.dicom_analysis.validate_analysis", reject)
         dcm_path = _make_synthetic_dicom(tmp_path / "input")
         out_dir  = tmp_path / "output"
+        xlsx     = tmp_path / "case.xlsx"
+        pd.DataFrame({"Patient ID": ["TESTPAT001"], "Study Date": ["2024-06-01"]}).to_excel(xlsx, index=False)
 
-        from src.pipelines.run_case import run_case
-        outputs = run_case(dicom_path=dcm_path, out_dir=out_dir)
+        with pytest.raises(SystemExit):
+            run_case(dicom_path=dcm_path, out_dir=out_dir, excel_path=xlsx)
 
-        assert "timeline" not in outputs
         assert not (out_dir / "timeline.json").exists()
 
+    def test_llm_modules_not_imported_without_api_key(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.delitem(sys.modules, "src.pipelines.llm_enrichment", raising=False)
+        dcm_path = _make_synthetic_dicom(tmp_path / "input")
+
+        run_case(dicom_path=dcm_path, out_dir=tmp_path / "output")
+
+        assert "src.pipelines.llm_enrichment" not in sys.modules
+
     def test_case_id_propagated(self, tmp_path):
         dcm_path = _make_synthetic_dicom(tmp_path / "input")
         out_dir  = tmp_path / "output"
 
-        from src.pipelines.run_case import run_case
         run_case(dicom_path=dcm_path, out_dir=out_dir, case_id="MY_CASE_42")
 
         analysis = _load_analysis(out_dir)
@@ -203,8 +219,6 @@ class TestE2EMissingDicom:
     """Pipeline must refuse to run and exit(1) when DICOM is absent."""
 
     def test_missing_dicom_exits_nonzero(self, tmp_path):
-        from src.pipelines.run_case import run_case
-
         with pytest.raises(SystemExit) as exc_info:
             run_case(
                 dicom_path=Path("/nonexistent/totally_fake.dcm"),
@@ -213,8 +227,6 @@ class TestE2EMissingDicom:
         assert exc_info.value.code != 0, "Pipeline must exit with non-zero status"
 
     def test_no_output_files_on_missing_dicom(self, tmp_path):
-        from src.pipelines.run_case import run_case
-
         out_dir = tmp_path / "output"
         with pytest.raises(SystemExit):
             run_case(
@@ -226,8 +238,6 @@ class TestE2EMissingDicom:
 
     def test_cli_missing_dicom_exits_nonzero(self, tmp_path):
         """The --dicom CLI flag with a missing path must exit(1)."""
-        from src.pipelines.run_case import main as run_main
-
         with pytest.raises(SystemExit) as exc_info:
             run_main([
                 "--dicom", str(tmp_path / "does_not_exist.dcm"),
@@ -245,20 +255,16 @@ class TestDicomAnalysis:
 
     def test_analyze_dicom_returns_valid_dict(self, tmp_path):
         dcm = _make_synthetic_dicom(tmp_path)
-        from src.pipelines.dicom_analysis import analyze_dicom, validate_analysis
 
         result = analyze_dicom(dcm, case_id="UNIT_01")
         validate_analysis(result)   # must not raise
 
     def test_missing_file_raises_file_not_found(self, tmp_path):
-        from src.pipelines.dicom_analysis import analyze_dicom
-
         with pytest.raises(FileNotFoundError, match="DICOM input is required"):
             analyze_dicom(Path("/nope/fake.dcm"))
 
     def test_pixel_array_is_used(self, tmp_path):
         dcm = _make_synthetic_dicom(tmp_path)
-        from src.pipelines.dicom_analysis import analyze_dicom
 
         result = analyze_dicom(dcm)
         stats = result["dicom"]["image_stats"]
@@ -269,19 +275,23 @@ class TestDicomAnalysis:
     def test_schema_validation_fails_on_missing_field(self, tmp_path):
         """Remove a required field → validate_analysis must raise."""
         dcm = _make_synthetic_dicom(tmp_path)
-        import jsonschema
-
-        from src.pipelines.dicom_analysis import analyze_dicom, validate_analysis
-
         result = analyze_dicom(dcm)
         del result["dicom"]  # remove mandatory block
 
         with pytest.raises(jsonschema.ValidationError):
             validate_analysis(result)
 
+    def test_schema_validator_compiled_once(self, tmp_path):
+        dcm = _make_synthetic_dicom(tmp_path)
+
+        result = analyze_dicom(dcm)
+        _schema_validator.cache_clear()
+        validate_analysis(result)
+        validate_analysis(result)
+        assert _schema_validator.cache_info().misses == 1
+
     def test_data_consistency_score_in_range(self, tmp_path):
         dcm = _make_synthetic_dicom(tmp_path)
-        from src.pipelines.dicom_analysis import analyze_dicom
 
         result = analyze_dicom(dcm)
         score = result["dicom"]["image_stats"]["data_consistency_score"]
@@ -291,7 +301,6 @@ class TestDicomAnalysis:
         dcm = _make_synthetic_dicom(tmp_path / "raw")
         out_path = tmp_path / "out" / "analysis.json"
 
-        from src.pipelines.dicom_analysis import main as dicom_main
         dicom_main([
             "--dicom",    str(dcm),
             "--case-id",  "CLI_TEST",
@@ -299,6 +308,34 @@ class TestDicomAnalysis:
         ])
 
         assert out_path.exists()
-        data = json.loads(out_path.read_text())
+        data = read_json(out_path)
         assert data["case_id"] == "CLI_TEST"
         assert "dicom" in data
+
+    def test_cli_missing_input_exits_nonzero(self, tmp_path):
+        with pytest.raises(SystemExit) as exc_info:
+            dicom_main(["--dicom", str(tmp_path / "missing.dcm")])
+        assert exc_info.value.code != 0
+
+    def test_large_array_keeps_full_shape_and_exact_range(self):
+        """Large arrays are subsampled for mean/std, but shape and min/max stay exact."""
+        arr = np.zeros((512, 512), dtype=np.int16)
+        arr[1, 1] = -1000   # off the stride grid — only the exact pass sees it
+        arr[3, 5] = 3000
+        stats = extract_image_stats(SimpleNamespace(pixel_array=arr), {})
+        assert stats["shape"] == [512, 512]
+        assert stats["min"] == -1000.0
+        assert stats["max"] == 3000.0
+        assert 0.0 <= stats["data_consistency_score"] <= 1.0
+
+    def test_compressed_pixel_data_error_names_transfer_syntax(self):
+        """Undecodable compressed pixel data → ValueError pointing at the codecs extra."""
+        class _CompressedDs:
+            file_meta = SimpleNamespace(TransferSyntaxUID=JPEG2000Lossless)
+
+            @property
+            def pixel_array(self):
+                raise RuntimeError("no handler available")
+
+        with pytest.raises(ValueError, match="codecs"):
+            extract_image_stats(_CompressedDs(), {})
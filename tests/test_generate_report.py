@@ -1,12 +1,16 @@
 """Sanity tests for the deterministic report renderer."""
 
-from src.pipelines.generate_report import build_context, render_report
+import pytest
+
+import src.pipelines.generate_report as generate_report
+from src.pipelines.generate_report import _load_template, build_context, render_report
+from tests.readonly import freeze
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
-TIMELINE_FULL = [
+TIMELINE_FULL = freeze([
     {
         "patient_id": "P001",
         "accession_number": "ACC001",
@@ -33,9 +37,9 @@ TIMELINE_FULL = [
             "conclusions": "Progression du nodule LSD.",
         },
     },
-]
+])
 
-ANALYSIS_PROGRESSION = {
+ANALYSIS_PROGRESSION = freeze({
     "case_id": "CASE_01",
     "patient_id": "P001",
     "exam_count": 2,
@@ -54,9 +58,9 @@ ANALYSIS_PROGRESSION = {
         "rule_applied": "progression: lesion(s) [0] increased >= 20.0% AND >= 5.0 mm",
         "thresholds": {"progression_pct": 20.0, "progression_abs_mm": 5.0, "response_pct": 30.0},
     },
-}
+})
 
-ANALYSIS_STABLE = {
+ANALYSIS_STABLE = freeze({
     **ANALYSIS_PROGRESSION,
     "overall_status": "stable",
     "lesion_deltas": [
@@ -68,9 +72,9 @@ ANALYSIS_STABLE = {
         "rule_applied": "stable: no progression or response criteria met",
         "thresholds": {"progression_pct": 20.0, "progression_abs_mm": 5.0, "response_pct": 30.0},
     },
-}
+})
 
-ANALYSIS_UNKNOWN = {
+ANALYSIS_UNKNOWN = freeze({
     **ANALYSIS_PROGRESSION,
     "overall_status": "unknown",
     "lesion_deltas": [],
@@ -80,7 +84,7 @@ ANALYSIS_UNKNOWN = {
         "rule_applied": "unknown: fewer than two exams have lesion measurements",
         "thresholds": {"progression_pct": 20.0, "progression_abs_mm": 5.0, "response_pct": 30.0},
     },
-}
+})
 
 
 # ---------------------------------------------------------------------------
@@ -118,6 +122,18 @@ class TestBuildContext:
         ctx = build_context(TIMELINE_FULL, ANALYSIS_PROGRESSION)
         assert ctx["generated_at"]  # non-empty string
 
+    def test_generated_at_override(self):
+        ctx = build_context(TIMELINE_FULL, ANALYSIS_PROGRESSION, generated_at="2024-07-15 12:00")
+        assert ctx["generated_at"] == "2024-07-15 12:00"
+
+    def test_recommendations_follow_status(self):
+        ctx = build_context(TIMELINE_FULL, ANALYSIS_PROGRESSION)
+        assert "4 semaines" in ctx["recommendations"]
+
+    def test_unrecognised_status_gets_unknown_recommendations(self):
+        ctx = build_context(TIMELINE_FULL, {**ANALYSIS_PROGRESSION, "overall_status": "mixed"})
+        assert "Données insuffisantes" in ctx["recommendations"]
+
 
 # ---------------------------------------------------------------------------
 # render_report
@@ -195,3 +211,21 @@ class TestRenderReport:
     def test_empty_timeline_does_not_crash(self):
         md = render_report([], ANALYSIS_UNKNOWN)
         assert isinstance(md, str)
+
+    def test_template_compiled_once(self):
+        _load_template.cache_clear()
+        render_report(TIMELINE_FULL, ANALYSIS_PROGRESSION)
+        render_report(TIMELINE_FULL, ANALYSIS_STABLE)
+        info = _load_template.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_minijinja_matches_jinja2(self, monkeypatch):
+        pytest.importorskip("minijinja")
+        _load_template.cache_clear()
+        fast = render_report(TIMELINE_FULL, ANALYSIS_PROGRESSION, generated_at="2024-07-15 12:00")
+        monkeypatch.setattr(generate_report, "minijinja", None)
+        _load_template.cache_clear()
+        try:
+            assert render_report(TIMELINE_FULL, ANALYSIS_PROGRESSION, generated_at="2024-07-15 12:00") == fast
+        finally:
+            _load_template.cache_clear()
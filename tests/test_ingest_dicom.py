@@ -1,20 +1,42 @@
-"""Tests for dicom_utils and ingest_dicom — uses mocked pydicom Datasets (no real files)."""
+"""Tests for dicom_utils and ingest_dicom — mostly mocked pydicom Datasets.
+
+Only the directory-scan tests read real files (pydicom's bundled CT_small.dcm).
+"""
 from __future__ import annotations
 
+import json
+import shutil
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import pydicom.data
 
+import src.pipelines.dicom_utils as dicom_utils
 from src.pipelines.dicom_utils import (
     build_study_summary,
     group_by_accession,
     parse_dicom_date,
     read_dicom_metadata,
+    scan_dicom_dir,
 )
 
 # ---------------------------------------------------------------------------
 # Helpers — build fake pydicom.Dataset-like objects
 # ---------------------------------------------------------------------------
 
+@dataclass(slots=True)
+class FakeDataset:
+    """Minimal stand-in for a pydicom Dataset — just the tags read_dicom_metadata() reads."""
+    AccessionNumber: str
+    StudyInstanceUID: str
+    SeriesInstanceUID: str
+    Modality: str
+    StudyDate: str
+    SeriesDescription: str
+    SeriesNumber: int | None
+
+
 def _fake_ds(
     accession: str = "ACC001",
     study_uid: str = "1.2.3",
@@ -22,18 +44,10 @@ def _fake_ds(
     modality: str = "CT",
     study_date: str = "20240615",
     series_desc: str = "Chest CT",
-    series_number: int = 3,
-) -> MagicMock:
-    """Return a MagicMock that behaves like a minimal pydicom Dataset."""
-    ds = MagicMock()
-    ds.AccessionNumber = accession
-    ds.StudyInstanceUID = study_uid
-    ds.SeriesInstanceUID = series_uid
-    ds.Modality = modality
-    ds.StudyDate = study_date
-    ds.SeriesDescription = series_desc
-    ds.SeriesNumber = series_number
-    return ds
+    series_number: int | None = 3,
+) -> FakeDataset:
+    """Return a FakeDataset that behaves like a minimal pydicom Dataset."""
+    return FakeDataset(accession, study_uid, series_uid, modality, study_date, series_desc, series_number)
 
 
 # ---------------------------------------------------------------------------
@@ -59,6 +73,10 @@ class TestParseDicomDate:
     def test_none_input(self):
         assert parse_dicom_date(None) is None
 
+    def test_non_ascii_digits_rejected(self):
+        # Full-width digits pass str.isdigit() but are not a valid DICOM DA value
+        assert parse_dicom_date("２０２４０６１５") is None
+
 
 # ---------------------------------------------------------------------------
 # read_dicom_metadata
@@ -82,14 +100,10 @@ class TestReadDicomMetadata:
         assert meta["modality"] == "SEG"
 
     def test_missing_optional_field(self):
-        ds = MagicMock()
-        ds.AccessionNumber = "ACC002"
-        ds.StudyInstanceUID = "9.9.9"
-        ds.SeriesInstanceUID = "9.9.9.1"
-        ds.Modality = "CT"
-        ds.StudyDate = "20240101"
-        ds.SeriesDescription = ""
-        ds.SeriesNumber = None
+        ds = _fake_ds(
+            accession="ACC002", study_uid="9.9.9", series_uid="9.9.9.1",
+            study_date="20240101", series_desc="", series_number=None,
+        )
         meta = read_dicom_metadata(ds)
         assert meta["series_number"] is None
 
@@ -103,6 +117,37 @@ class TestReadDicomMetadata:
         assert set(meta.keys()) == expected_keys
 
 
+# ---------------------------------------------------------------------------
+# scan_dicom_dir
+# ---------------------------------------------------------------------------
+
+class TestScanDicomDir:
+    def test_reads_only_metadata_tags(self, tmp_path):
+        (tmp_path / "a.dcm").write_bytes(b"")
+        with patch("pydicom.dcmread", return_value=_fake_ds()) as dcmread:
+            records = scan_dicom_dir(tmp_path)
+
+        assert [r["accession_number"] for r in records] == ["ACC001"]
+        kwargs = dcmread.call_args.kwargs
+        assert kwargs["stop_before_pixels"] is True
+        tags = set(kwargs["specific_tags"])
+        assert {"AccessionNumber", "StudyInstanceUID", "SeriesInstanceUID", "StudyDate",
+                "Modality", "SeriesDescription", "SeriesNumber"} <= tags
+
+    def test_worker_processes_match_inline_scan(self, tmp_path, monkeypatch):
+        ct_small = pydicom.data.get_testdata_file("CT_small.dcm")
+        for i in range(3):
+            shutil.copy(ct_small, tmp_path / f"ct_{i}.dcm")
+        (tmp_path / "notes.txt").write_text("not dicom")
+
+        inline = dicom_utils.scan_dicom_dir(tmp_path)
+        monkeypatch.setattr(dicom_utils, "_PARALLEL_MIN_FILES", 1)
+        pooled = dicom_utils.scan_dicom_dir(tmp_path, max_workers=2)
+
+        assert len(inline) == 3
+        assert pooled == inline
+
+
 # ---------------------------------------------------------------------------
 # group_by_accession
 # ---------------------------------------------------------------------------
@@ -260,3 +305,16 @@ class TestEnrichTimeline:
         assert enriched[0]["patient_id"] == "P001"
         assert enriched[0]["lesion_sizes_mm"] == [10.0]
         assert enriched[0]["dicom"] is None
+
+    def test_jsonl_output(self, tmp_path):
+        from src.pipelines.ingest_dicom import ingest_dicom
+
+        timeline_path = tmp_path / "CASE_timeline.json"
+        timeline_path.write_text(json.dumps(self.TIMELINE), encoding="utf-8")
+
+        with patch("src.pipelines.ingest_dicom.scan_dicom_dir", return_value=self.DICOM_RECORDS):
+            enriched = ingest_dicom(timeline_path, tmp_path, jsonl=True)
+
+        out = tmp_path / "CASE_timeline_enriched.jsonl"
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == enriched
@@ -0,0 +1,156 @@
+"""Tests for src/pipelines/ingest_excel.py — column discovery and row conversion."""
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.pipelines.ingest_excel import _discover_columns, _frame_to_exams, ingest_excel, ingest_excel_many
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _frame(**columns) -> pd.DataFrame:
+    """Build a DataFrame shaped like ``pd.read_excel(..., dtype=str)`` output."""
+    return pd.DataFrame(columns, dtype=object)
+
+
+def _exams(df: pd.DataFrame) -> list[dict]:
+    return _frame_to_exams(df, _discover_columns(df))
+
+
+# ---------------------------------------------------------------------------
+# _discover_columns
+# ---------------------------------------------------------------------------
+
+class TestDiscoverColumns:
+    def test_separators_and_case_ignored(self):
+        df = _frame(**{
+            "PATIENT-ID":        ["P1"],
+            "accession_number":  ["A1"],
+            "Study/Date":        ["2024-01-01"],
+            "Lesion Size":       ["10"],
+            "Taille_2":          ["12"],
+            "Compte rendu":      [""],
+        })
+        col_map = _discover_columns(df)
+        assert col_map["patient_id"] == "PATIENT-ID"
+        assert col_map["accession_number"] == "accession_number"
+        assert col_map["date"] == "Study/Date"
+        assert col_map["lesion_sizes"] == ["Lesion Size", "Taille_2"]
+        assert col_map["report"] == "Compte rendu"
+
+
+# ---------------------------------------------------------------------------
+# _frame_to_exams
+# ---------------------------------------------------------------------------
+
+class TestFrameToExams:
+    def test_basic_row(self):
+        df = _frame(**{
+            "Patient ID":       [" P001 "],
+            "Accession Number": ["ACC001"],
+            "Study Date":       ["2024-01-15"],
+            "Lesion size (mm)": ["12.5, 8"],
+            "Clinical report":  ["CLINICAL INFORMATION. Suivi. CONCLUSIONS. Stable."],
+        })
+        exam = _exams(df)[0]
+        assert exam["patient_id"] == "P001"
+        assert exam["accession_number"] == "ACC001"
+        assert exam["study_date"] == "2024-01-15"
+        assert exam["lesion_sizes_mm"] == [8.0, 12.5]
+        assert exam["report_sections"]["clinical_information"] == "Suivi."
+        assert exam["report_sections"]["conclusions"] == "Stable."
+
+    def test_accession_trailing_zero_stripped(self):
+        df = _frame(**{"Accession Number": ["123456.0", "A.0", "-7.0"]})
+        assert [e["accession_number"] for e in _exams(df)] == ["123456", "A.0", "-7"]
+
+    def test_missing_values_become_empty(self):
+        df = _frame(**{
+            "Patient ID":       [None],
+            "Study Date":       [None],
+            "Lesion size (mm)": [None],
+        })
+        exam = _exams(df)[0]
+        assert exam["patient_id"] == ""
+        assert exam["accession_number"] == ""
+        assert exam["study_date"] is None
+        assert exam["lesion_sizes_mm"] == []
+        assert exam["report_raw"] == ""
+
+    def test_unparseable_date_is_none(self):
+        df = _frame(**{"Study Date": ["2024-03-01", "not a date"]})
+        assert [e["study_date"] for e in _exams(df)] == ["2024-03-01", None]
+
+    def test_mixed_date_formats(self):
+        df = _frame(**{"Study Date": ["2024-01-15 00:00:00", "Jan 5 2024", "2024-02-30", None]})
+        assert [e["study_date"] for e in _exams(df)] == ["2024-01-15", "2024-01-05", None, None]
+
+    def test_lesions_merged_across_columns_and_deduplicated(self):
+        df = _frame(**{
+            "Lesion size (mm)": ["12 mm; 8"],
+            "Taille 2":         ["8, 15.5"],
+        })
+        assert _exams(df)[0]["lesion_sizes_mm"] == [8.0, 12.0, 15.5]
+
+    def test_repeated_lesion_cells_get_own_lists(self):
+        df = _frame(**{"Lesion size (mm)": ["12mm", "12mm", None, "12mm"]})
+        sizes = [e["lesion_sizes_mm"] for e in _exams(df)]
+        assert sizes == [[12.0], [12.0], [], [12.0]]
+        sizes[0].append(99.0)
+        assert sizes[1] == [12.0]
+
+
+# ---------------------------------------------------------------------------
+# ingest_excel (file round-trip)
+# ---------------------------------------------------------------------------
+
+class TestIngestExcel:
+    def test_sorted_by_date_and_written(self, tmp_path):
+        xlsx = tmp_path / "case.xlsx"
+        pd.DataFrame({
+            "Patient ID": ["P1", "P1", "P1"],
+            "Study Date": ["2024-06-01", None, "2024-01-01"],
+        }).to_excel(xlsx, index=False)
+        out = tmp_path / "timeline.json"
+
+        exams = ingest_excel(xlsx, case_id="C1", out_path=out)
+
+        assert [e["study_date"] for e in exams] == ["2024-01-01", "2024-06-01", None]
+        assert json.loads(out.read_text(encoding="utf-8")) == exams
+
+    def test_empty_rows_and_columns_dropped(self, tmp_path):
+        xlsx = tmp_path / "case.xlsx"
+        pd.DataFrame({
+            "Patient ID": ["P1", None, "P2"],
+            "Lesion size": [None, None, None],
+            "Study Date": ["2024-01-01", None, "2024-02-01"],
+        }).to_excel(xlsx, index=False)
+
+        exams = ingest_excel(xlsx, case_id="C1", out_path=tmp_path / "t.json")
+
+        assert [e["patient_id"] for e in exams] == ["P1", "P2"]
+        assert all(e["lesion_sizes_mm"] == [] for e in exams)
+
+    def test_many_files_keep_input_order(self, tmp_path):
+        paths = []
+        for name, date in [("case_b", "2024-02-02"), ("case_a", "2024-01-01")]:
+            path = tmp_path / f"{name}.xlsx"
+            pd.DataFrame({"Patient ID": [name], "Study Date": [date]}).to_excel(path, index=False)
+            paths.append(path)
+
+        results = ingest_excel_many(paths, out_dir=tmp_path / "out", max_workers=2)
+
+        assert [r[0]["patient_id"] for r in results] == ["case_b", "case_a"]
+        assert (tmp_path / "out" / "case_a_timeline.json").exists()
+
+    def test_many_files_reject_duplicate_stems(self, tmp_path):
+        paths = [tmp_path / "a" / "CASE_01.xlsx", tmp_path / "b" / "CASE_01.xlsx"]
+
+        with pytest.raises(ValueError, match="CASE_01"):
+            ingest_excel_many(paths, out_dir=tmp_path / "out")
+
+        assert not (tmp_path / "out").exists()
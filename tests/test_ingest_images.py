@@ -0,0 +1,84 @@
+"""Tests for src/pipelines/ingest_images.py — filename heuristics and thumbnails."""
+from __future__ import annotations
+
+import base64
+import io
+from datetime import date
+
+from PIL import Image
+
+from src.pipelines.ingest_images import (
+    _extract_date_from_filename,
+    _guess_modality,
+    ingest_images,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write_image(path, size=(800, 600), mode="RGB"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new(mode, size, color=128 if mode == "L" else (120, 60, 30)).save(path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Filename heuristics
+# ---------------------------------------------------------------------------
+
+class TestFilenameHeuristics:
+    def test_full_date(self):
+        assert _extract_date_from_filename("ct_2024_06_15.jpg") == date(2024, 6, 15)
+
+    def test_year_month(self):
+        assert _extract_date_from_filename("ct_2024-06.jpg") == date(2024, 6, 1)
+
+    def test_no_date(self):
+        assert _extract_date_from_filename("thorax.png") is None
+
+    def test_modality_ct(self):
+        assert _guess_modality("Scanner_thorax.jpg") == "CT"
+
+    def test_modality_pet(self):
+        assert _guess_modality("pet_2024.png") == "PET"
+
+    def test_modality_priority_not_position(self):
+        assert _guess_modality("PET_CT_fusion.png") == "CT"
+        assert _guess_modality("irm_radio.jpg") == "RX"
+
+    def test_modality_unknown(self):
+        assert _guess_modality("image.png") is None
+
+
+# ---------------------------------------------------------------------------
+# ingest_images
+# ---------------------------------------------------------------------------
+
+class TestIngestImages:
+    def test_metadata_and_thumbnail(self, tmp_path):
+        path = _write_image(tmp_path / "ct_2024_06_15.png")
+        [meta] = ingest_images([path])
+        assert (meta.width, meta.height) == (800, 600)
+        assert meta.exam_date == date(2024, 6, 15)
+        assert meta.modality == "CT"
+        thumb = Image.open(io.BytesIO(base64.standard_b64decode(meta.thumbnail_b64)))
+        assert max(thumb.size) <= 512
+        assert meta.thumbnail_media_type == Image.MIME[thumb.format]
+
+    def test_order_preserved_and_invalid_skipped(self, tmp_path):
+        paths = [
+            _write_image(tmp_path / "a_ct.png"),
+            tmp_path / "notes.txt",
+            tmp_path / "missing_ct.png",
+            _write_image(tmp_path / "b_pet.jpg", mode="L"),
+        ]
+        result = ingest_images(paths)
+        assert [m.filename for m in result] == ["a_ct.png", "b_pet.jpg"]
+
+    def test_large_jpeg_reports_original_size(self, tmp_path):
+        path = _write_image(tmp_path / "ct_large.jpg", size=(4096, 3072))
+        [meta] = ingest_images([path])
+        assert (meta.width, meta.height) == (4096, 3072)
+        thumb = Image.open(io.BytesIO(base64.standard_b64decode(meta.thumbnail_b64)))
+        assert thumb.size == (512, 384)
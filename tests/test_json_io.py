@@ -0,0 +1,58 @@
+"""Tests for src/pipelines/json_io.py — orjson and stdlib paths must agree."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.pipelines import json_io
+
+_DOC = {
+    "patient_id": "P001",
+    "report_raw": "Contrôle à 12 mois — nodule LSD.",
+    "lesion_sizes_mm": [8.0, 12.5],
+    "study_date": None,
+    "nested": {"ok": True, "count": 3, "empty": []},
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test against both serialisation backends."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_io, "orjson", None)
+    return request.param
+
+
+class TestJsonIO:
+    def test_round_trip(self, tmp_path, backend):
+        path = tmp_path / "doc.json"
+        json_io.write_json(path, _DOC)
+        assert json_io.read_json(path) == _DOC
+
+    def test_non_ascii_kept_verbatim(self, tmp_path, backend):
+        path = tmp_path / "doc.json"
+        json_io.write_json(path, _DOC)
+        assert "Contrôle à 12 mois" in path.read_text(encoding="utf-8")
+
+    def test_dumps_matches_stdlib_layout(self, backend):
+        assert json_io.dumps_json(_DOC) == json.dumps(_DOC, ensure_ascii=False, indent=2)
+
+    def test_dumps_line_compact(self, backend):
+        line = json_io.dumps_json_line(_DOC)
+        assert line == json.dumps(_DOC, ensure_ascii=False, separators=(",", ":"))
+        assert "\n" not in line
+
+    def test_jsonl_one_document_per_line(self, tmp_path, backend):
+        path = tmp_path / "doc.jsonl"
+        assert json_io.write_jsonl(path, iter([_DOC, {"n": 2}])) == 2
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [_DOC, {"n": 2}]
+
+    def test_numpy_values_serialised(self, tmp_path, backend):
+        np = pytest.importorskip("numpy")
+        path = tmp_path / "doc.json"
+        json_io.write_json(path, {"mean": np.float32(1.5), "shape": np.array([2, 3]), "n": np.int64(7)})
+        assert json_io.read_json(path) == {"mean": 1.5, "shape": [2, 3], "n": 7}
@@ -1,30 +1,39 @@
 """Tests for LLM enrichment module.
 
 All Anthropic API calls are mocked — no network required.
-A fake 'anthropic' module is injected into sys.modules before the module
-under test is imported, so tests run even when the package is not installed.
+A fake 'anthropic' module is injected into sys.modules by conftest.py,
+so tests run even when the package is not installed.
 """
 from __future__ import annotations
 
+import asyncio
 import sys
+from collections.abc import Mapping
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
 
 # ---------------------------------------------------------------------------
-# Inject a fake 'anthropic' module before importing the module under test
+# Fake 'anthropic' module — installed by conftest.py before this module loads
 # ---------------------------------------------------------------------------
 
-_fake_anthropic = MagicMock(name="anthropic")
-sys.modules.setdefault("anthropic", _fake_anthropic)
-_fake_anthropic = sys.modules["anthropic"]  # always use whichever mock was installed first
+_fake_anthropic = sys.modules["anthropic"]
 
-from src.pipelines.llm_enrichment import _PROTECTED_KEYS, enrich_analysis  # noqa: E402
+from src.pipelines.llm_enrichment import (  # noqa: E402
+    _PROTECTED_KEYS,
+    _get_client,
+    enrich_analyses,
+    enrich_analyses_batch,
+    enrich_analysis,
+)
+from tests.readonly import freeze  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-_BASE_ANALYSIS: dict[str, Any] = {
+_BASE_ANALYSIS_RAW: dict[str, Any] = {
     "case_id": "TEST_01",
     "patient_id": "PAT001",
     "overall_status": "unknown",
@@ -61,6 +70,9 @@ _BASE_ANALYSIS: dict[str, Any] = {
     },
 }
 
+# Read-only view handed straight to the code under test — nothing copies it
+_BASE_ANALYSIS: Mapping[str, Any] = freeze(_BASE_ANALYSIS_RAW)
+
 _FAKE_TOOL_INPUT = {
     "study_technique":      "Acquisition CT thoracique sans injection.",
     "preliminary_findings": "Plage HU [-1000, 400], compatible parenchyme pulmonaire.",
@@ -84,18 +96,26 @@ def _setup_mock_api(tool_input: dict | None = _FAKE_TOOL_INPUT) -> MagicMock:
     return response
 
 
+@pytest.fixture(autouse=True)
+def _fresh_client_cache():
+    """Drop cached clients so each test sees the freshly reset Anthropic mock."""
+    _get_client.cache_clear()
+    yield
+    _get_client.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # dry_run
 # ---------------------------------------------------------------------------
 
 class TestDryRun:
     def test_dry_run_returns_unchanged(self):
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), dry_run=True)
+        result = enrich_analysis(_BASE_ANALYSIS, dry_run=True)
         assert "llm_enriched" not in result
 
     def test_dry_run_never_calls_api(self):
         _fake_anthropic.reset_mock()
-        enrich_analysis(_BASE_ANALYSIS.copy(), dry_run=True)
+        enrich_analysis(_BASE_ANALYSIS, dry_run=True)
         _fake_anthropic.Anthropic.assert_not_called()
 
 
@@ -106,13 +126,13 @@ class TestDryRun:
 class TestNoApiKey:
     def test_no_key_returns_unchanged(self, monkeypatch):
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="")
         assert "llm_enriched" not in result
 
     def test_no_key_never_calls_api(self, monkeypatch):
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         _fake_anthropic.reset_mock()
-        enrich_analysis(_BASE_ANALYSIS.copy(), api_key="")
+        enrich_analysis(_BASE_ANALYSIS, api_key="")
         _fake_anthropic.Anthropic.assert_not_called()
 
 
@@ -125,36 +145,42 @@ class TestEnrichmentSuccess:
         _setup_mock_api()
 
     def test_llm_enriched_flag_set(self):
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert result.get("llm_enriched") is True
 
     def test_narrative_fields_populated(self):
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert result["latest_study_technique"] == _FAKE_TOOL_INPUT["study_technique"]
         assert result["latest_report"] == _FAKE_TOOL_INPUT["preliminary_findings"]
         assert result["latest_conclusions"] == _FAKE_TOOL_INPUT["conclusions"]
 
     def test_protected_fields_unchanged(self):
-        original = _BASE_ANALYSIS.copy()
+        original = _BASE_ANALYSIS
         result = enrich_analysis(original, api_key="fake-key")
         for key in _PROTECTED_KEYS:
             if key in original:
                 assert result[key] == original[key], f"Protected field '{key}' was modified"
 
     def test_overall_status_never_changed(self):
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert result["overall_status"] == "unknown"
 
     def test_dicom_block_never_changed(self):
-        original = _BASE_ANALYSIS.copy()
+        original = _BASE_ANALYSIS
         result = enrich_analysis(original, api_key="fake-key")
         assert result["dicom"] == original["dicom"]
 
     def test_kpi_never_changed(self):
-        original = _BASE_ANALYSIS.copy()
+        original = _BASE_ANALYSIS
         result = enrich_analysis(original, api_key="fake-key")
         assert result["kpi"] == original["kpi"]
 
+    def test_client_reused_across_calls(self):
+        enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
+        enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
+        _fake_anthropic.Anthropic.assert_called_once_with(api_key="fake-key")
+        assert _fake_anthropic.Anthropic.return_value.messages.create.call_count == 2
+
 
 # ---------------------------------------------------------------------------
 # Graceful degradation
@@ -163,7 +189,7 @@ class TestEnrichmentSuccess:
 class TestGracefulDegradation:
     def test_api_exception_returns_original(self):
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = Exception("timeout")
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert "llm_enriched" not in result
         # Reset side_effect for other tests
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = None
@@ -172,17 +198,125 @@ class TestGracefulDegradation:
         empty = MagicMock()
         empty.content = []
         _fake_anthropic.Anthropic.return_value.messages.create.return_value = empty
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert "llm_enriched" not in result
 
     def test_original_fields_intact_after_failure(self):
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = RuntimeError("fail")
-        result = enrich_analysis(_BASE_ANALYSIS.copy(), api_key="fake-key")
+        result = enrich_analysis(_BASE_ANALYSIS, api_key="fake-key")
         assert result["overall_status"] == "unknown"
         assert result["case_id"] == "TEST_01"
         _fake_anthropic.Anthropic.return_value.messages.create.side_effect = None
 
 
+# ---------------------------------------------------------------------------
+# enrich_analyses (concurrent batch)
+# ---------------------------------------------------------------------------
+
+class TestEnrichAnalyses:
+    def _setup_async(self, side_effect=None) -> AsyncMock:
+        response = _setup_mock_api()
+        create = AsyncMock(return_value=response, side_effect=side_effect)
+        _fake_anthropic.AsyncAnthropic.reset_mock(return_value=True, side_effect=True)
+        _fake_anthropic.AsyncAnthropic.return_value.messages.create = create
+        return create
+
+    def test_all_items_enriched_in_order(self):
+        create = self._setup_async()
+        items = [{**_BASE_ANALYSIS, "case_id": f"C{i}"} for i in range(5)]
+        results = asyncio.run(enrich_analyses(items, api_key="fake-key", max_concurrency=2))
+        assert [r["case_id"] for r in results] == ["C0", "C1", "C2", "C3", "C4"]
+        assert all(r.get("llm_enriched") is True for r in results)
+        assert create.await_count == 5
+        _fake_anthropic.AsyncAnthropic.assert_called_once_with(api_key="fake-key")
+
+    def test_failure_isolated_per_item(self):
+        response = _setup_mock_api()
+        self._setup_async(side_effect=[RuntimeError("fail"), response])
+        items = [{**_BASE_ANALYSIS, "case_id": "A"}, {**_BASE_ANALYSIS, "case_id": "B"}]
+        results = asyncio.run(enrich_analyses(items, api_key="fake-key", max_concurrency=1))
+        assert "llm_enriched" not in results[0]
+        assert results[1]["llm_enriched"] is True
+
+    def test_no_key_returns_unchanged(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        _fake_anthropic.reset_mock()
+        items = [_BASE_ANALYSIS]
+        assert asyncio.run(enrich_analyses(items, api_key="")) == items
+        _fake_anthropic.AsyncAnthropic.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# enrich_analyses_batch (Message Batches API)
+# ---------------------------------------------------------------------------
+
+class TestEnrichAnalysesBatch:
+    def _setup_batch(self, result_types: list[str], statuses=("in_progress", "ended")) -> MagicMock:
+        response = _setup_mock_api()
+        batches = _fake_anthropic.Anthropic.return_value.messages.batches
+        batches.reset_mock(return_value=True, side_effect=True)
+
+        snapshots = []
+        for status in statuses:
+            snap = MagicMock()
+            snap.id = "msgbatch_01"
+            snap.processing_status = status
+            snapshots.append(snap)
+        batches.create.return_value = snapshots[0]
+        batches.retrieve.side_effect = snapshots[1:]
+
+        entries = []
+        for i, result_type in enumerate(result_types):
+            entry = MagicMock()
+            entry.custom_id = f"analysis-{i}"
+            entry.result.type = result_type
+            entry.result.message = response
+            entries.append(entry)
+        # Results stream back in arbitrary order
+        batches.results.return_value = list(reversed(entries))
+        return batches
+
+    def test_single_submission_merged_in_order(self):
+        batches = self._setup_batch(["succeeded"] * 3)
+        items = [{**_BASE_ANALYSIS, "case_id": f"C{i}"} for i in range(3)]
+        results = enrich_analyses_batch(items, api_key="fake-key", poll_interval=0)
+        assert [r["case_id"] for r in results] == ["C0", "C1", "C2"]
+        assert all(r.get("llm_enriched") is True for r in results)
+        batches.create.assert_called_once()
+        requests = batches.create.call_args.kwargs["requests"]
+        assert [r["custom_id"] for r in requests] == ["analysis-0", "analysis-1", "analysis-2"]
+        assert requests[0]["params"]["tool_choice"]["name"] == "write_report_sections"
+        batches.retrieve.assert_called_once_with("msgbatch_01")
+        _fake_anthropic.Anthropic.return_value.messages.create.assert_not_called()
+
+    def test_failed_request_left_unchanged(self):
+        self._setup_batch(["errored", "succeeded"])
+        items = [{**_BASE_ANALYSIS, "case_id": "A"}, {**_BASE_ANALYSIS, "case_id": "B"}]
+        results = enrich_analyses_batch(items, api_key="fake-key", poll_interval=0)
+        assert "llm_enriched" not in results[0]
+        assert results[1]["llm_enriched"] is True
+
+    def test_timeout_cancels_batch(self):
+        batches = self._setup_batch(["succeeded"], statuses=("in_progress",))
+        items = [_BASE_ANALYSIS]
+        assert enrich_analyses_batch(items, api_key="fake-key", poll_interval=0, max_wait=0) == items
+        batches.cancel.assert_called_once_with("msgbatch_01")
+        batches.results.assert_not_called()
+
+    def test_submission_failure_returns_unchanged(self):
+        batches = self._setup_batch(["succeeded"])
+        batches.create.side_effect = RuntimeError("rate limited")
+        items = [_BASE_ANALYSIS]
+        assert enrich_analyses_batch(items, api_key="fake-key", poll_interval=0) == items
+
+    def test_no_key_returns_unchanged(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        _fake_anthropic.reset_mock()
+        items = [_BASE_ANALYSIS]
+        assert enrich_analyses_batch(items, api_key="") == items
+        _fake_anthropic.Anthropic.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # build_context integration
 # ---------------------------------------------------------------------------
@@ -231,7 +365,7 @@ class TestBuildContextFallback:
     def test_no_enrichment_no_timeline_gives_none(self):
         from src.pipelines.generate_report import build_context
 
-        ctx = build_context([], _BASE_ANALYSIS.copy())
+        ctx = build_context([], _BASE_ANALYSIS)
         assert ctx["latest_study_technique"] is None
         assert ctx["latest_report"] is None
         assert ctx["latest_conclusions"] is None
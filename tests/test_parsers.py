@@ -74,6 +74,22 @@ class TestParseLesionSizes:
         result = parse_lesion_sizes(pd.NaT)
         assert result == []
 
+    def test_nan_and_inf_strings(self):
+        # float() accepts these, but they are not lesion sizes
+        for text in ("nan", "NaN", "inf", "-Infinity"):
+            assert parse_lesion_sizes(text) == [], text
+
+    def test_inf_float(self):
+        assert parse_lesion_sizes(float("inf")) == []
+        assert parse_lesion_sizes(float("-inf")) == []
+
+    def test_nan_and_inf_tokens_in_text(self):
+        # A trailing dot kept "nan." / "Infinity." out of the unit stripping
+        assert parse_lesion_sizes("nan. 12mm, Infinity. -inf.") == [12.0]
+
+    def test_free_text_with_one_size(self):
+        assert parse_lesion_sizes("Pas de lésion cible mesurable, nodule 12mm") == [12.0]
+
     # --- Non-numeric / garbage inputs ---
 
     def test_pure_text(self):
@@ -89,6 +105,12 @@ class TestParseLesionSizes:
     def test_dot_only(self):
         assert parse_lesion_sizes(".") == []
 
+    def test_leading_dot_same_alone_or_in_text(self):
+        # The token path strips the leading dot; a lone cell must agree with it
+        assert parse_lesion_sizes(".5") == [5.0]
+        assert parse_lesion_sizes(".5 cm") == [5.0]
+        assert parse_lesion_sizes("1, .5") == [1.0, 5.0]
+
     # --- Deduplication is NOT expected (values may repeat for different lesions) ---
 
     def test_duplicate_values_preserved(self):
@@ -226,3 +248,25 @@ class TestSplitReportSections:
         assert result["conclusions"] == "Final."
         assert result["clinical_information"] == "First."
         assert result["report"] == "Middle."
+
+    def test_mutating_result_does_not_leak_between_calls(self):
+        text = "CONCLUSIONS. Stable disease."
+        first = split_report_sections(text)
+        first["conclusions"] = "tampered"
+        assert split_report_sections(text)["conclusions"] == "Stable disease."
+
+    def test_marker_lookalike_words_skipped(self):
+        text = "CLINICAL trial. CLINICAL INFORMATION. Suivi. REPORT. Nodule."
+        result = split_report_sections(text)
+        assert result["clinical_information"] == "Suivi."
+        assert result["report"] == "Nodule."
+
+    def test_overlapping_markers_searched_independently(self):
+        # CONCLUSIONS? swallows the S of STUDY; both markers still match, so
+        # neither section has any content of its own
+        assert split_report_sections("4conclusionstudy technique") == {
+            "clinical_information": None,
+            "study_technique":      None,
+            "report":               None,
+            "conclusions":          None,
+        }
@@ -0,0 +1,289 @@
+"""Tests for src/tools/vision_tool.py study scanning and src/imaging/dicom_utils.py headers."""
+from __future__ import annotations
+
+import json
+import threading
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import src.tools.vision_tool as vision_tool
+from src.imaging.dicom_utils import read_dicom_metadata
+from src.tools.vision_tool import (
+    _build_study_meta,
+    _extract_dcm_members,
+    _measure_studies,
+    _scan_dcm_files,
+    run_vision_tool,
+)
+from tests.dicom_factory import dcm_bytes, fast_uid
+
+# ---------------------------------------------------------------------------
+# DICOM factory
+# ---------------------------------------------------------------------------
+
+_PIXEL_BYTES = np.zeros((8, 8), dtype=np.int16).tobytes()
+
+
+def _make_dicom(
+    path: Path,
+    series_uid: str,
+    modality: str = "CT",
+    spacing: tuple[float, float] = (0.7, 0.7),
+) -> Path:
+    """Write a tiny 8×8 DICOM slice belonging to *series_uid*."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dcm_bytes({
+        "PatientID":                 "VISPAT",
+        "StudyInstanceUID":          "1.2.3",
+        "SeriesInstanceUID":         series_uid,
+        "SOPInstanceUID":            fast_uid(),
+        "SOPClassUID":               "1.2.840.10008.5.1.4.1.1.2",
+        "Modality":                  modality,
+        "StudyDate":                 "20240715",
+        "InstanceNumber":            "1",
+        "PixelSpacing":              list(spacing),
+        "Rows":                      8,
+        "Columns":                   8,
+        "BitsAllocated":             16,
+        "BitsStored":                16,
+        "HighBit":                   15,
+        "PixelRepresentation":       1,
+        "SamplesPerPixel":           1,
+        "PhotometricInterpretation": "MONOCHROME2",
+    }, _PIXEL_BYTES))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# read_dicom_metadata
+# ---------------------------------------------------------------------------
+
+class TestReadDicomMetadata:
+    def test_tags_extracted(self, tmp_path):
+        meta = read_dicom_metadata(_make_dicom(tmp_path / "a.dcm", "9.9"))
+        assert meta["PatientID"] == "VISPAT"
+        assert meta["StudyDate"] == "2024-07-15"
+        assert meta["SeriesInstanceUID"] == "9.9"
+        assert meta["PixelSpacing"] == [0.7, 0.7]
+        assert meta["InstanceNumber"] == 1
+
+    def test_cached_result_not_shared(self, tmp_path):
+        path = _make_dicom(tmp_path / "a.dcm", "9.9")
+        read_dicom_metadata(path)["PixelSpacing"].append(99.0)
+        assert read_dicom_metadata(path)["PixelSpacing"] == [0.7, 0.7]
+
+    def test_rewritten_file_is_reread(self, tmp_path):
+        path = _make_dicom(tmp_path / "a.dcm", "9.9")
+        assert read_dicom_metadata(path)["Modality"] == "CT"
+        _make_dicom(path, "9.9", modality="MR", spacing=(0.55, 0.55))  # size changes too
+        assert read_dicom_metadata(path)["Modality"] == "MR"
+
+
+# ---------------------------------------------------------------------------
+# _build_study_meta
+# ---------------------------------------------------------------------------
+
+class TestBuildStudyMeta:
+    def test_series_grouped_and_counted(self, tmp_path):
+        for i in range(3):
+            _make_dicom(tmp_path / "ct" / f"s{i}.dcm", "1.1")
+        _make_dicom(tmp_path / "seg" / "seg.DCM", "1.2", modality="SEG")
+
+        meta = _build_study_meta(_scan_dcm_files(tmp_path))
+
+        assert meta["patient_id"] == "VISPAT"
+        assert meta["study_uid"] == "1.2.3"
+        counts = {s["series_uid"]: s["file_count"] for s in meta["series"]}
+        assert counts == {"1.1": 3, "1.2": 1}
+
+
+# ---------------------------------------------------------------------------
+# _scan_dcm_files
+# ---------------------------------------------------------------------------
+
+class TestScanDcmFiles:
+    def test_recursive_case_insensitive_no_duplicates(self, tmp_path):
+        for rel in ["a.dcm", "sub/b.DCM", "sub/deeper/c.Dcm", "notes.txt", "sub/d.dcm.bak"]:
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_bytes(b"")
+
+        found = _scan_dcm_files(tmp_path)
+
+        assert sorted(p.relative_to(tmp_path).as_posix() for p in found) == [
+            "a.dcm", "sub/b.DCM", "sub/deeper/c.Dcm",
+        ]
+
+    def test_sorted_and_directories_named_dcm_skipped(self, tmp_path):
+        for rel in ["z.dcm", "series.dcm/b.dcm", "a.dcm"]:
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_bytes(b"")
+
+        found = _scan_dcm_files(tmp_path)
+
+        assert [p.relative_to(tmp_path).as_posix() for p in found] == [
+            "a.dcm", "series.dcm/b.dcm", "z.dcm",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# _extract_dcm_members
+# ---------------------------------------------------------------------------
+
+class TestExtractDcmMembers:
+    def test_only_dcm_members_written(self, tmp_path):
+        zip_path = tmp_path / "study.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("PAT/STUDY/SER1/IM0.dcm", b"a" * 10)
+            zf.writestr("PAT/STUDY/SER2/IM0.DCM", b"b" * 20)
+            zf.writestr("DICOMDIR", b"dir")
+            zf.writestr("PAT/preview.png", b"png")
+            zf.writestr("../escape.dcm", b"evil")
+
+        out = tmp_path / "out"
+        n = _extract_dcm_members(zip_path, out)
+
+        assert n == 2
+        assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file()) == [
+            "PAT/STUDY/SER1/IM0.dcm", "PAT/STUDY/SER2/IM0.DCM",
+        ]
+        assert (out / "PAT/STUDY/SER2/IM0.DCM").read_bytes() == b"b" * 20
+        assert not (tmp_path / "escape.dcm").exists()
+
+
+# ---------------------------------------------------------------------------
+# run_vision_tool (px → mm)
+# ---------------------------------------------------------------------------
+
+class TestRunVisionTool:
+    def test_pixels_converted_to_mm(self, tmp_path):
+        _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.5, 0.8))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "1.1", "long_axis_px": 21, "short_axis_px": 10},
+            {"series_uid": "1.1", "long_axis_px": 7, "short_axis_px": None},
+        ]}]
+
+        result = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+
+        lesions = result["studies"][0]["lesions"]
+        assert [(les["lesion_id"], les["long_axis_mm"], les["short_axis_mm"]) for les in lesions] == [
+            ("L1", 10.5, 8.0),
+            ("L2", 3.5, None),
+        ]
+        assert result["studies"][0]["kpis"]["sum_long_axis_mm"] == 14.0
+        assert result["calibration"]["pixel_spacing_mm"] == [0.5, 0.8]
+
+    def test_mm_values_correctly_rounded(self, tmp_path):
+        # 11 × 0.145 lands just below 1.595 and 35 × 0.139 just above 4.865 in binary;
+        # np.round's scale-then-round turns them into 1.6 and 4.86
+        _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.145, 0.139))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "1.1", "long_axis_px": 11, "short_axis_px": 35},
+        ]}]
+
+        lesion = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)["studies"][0]["lesions"][0]
+
+        assert (lesion["long_axis_mm"], lesion["short_axis_mm"]) == (1.59, 4.87)
+
+    def test_repeat_call_served_from_cache(self, tmp_path):
+        _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.5, 0.5))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "1.1", "long_axis_px": 20, "short_axis_px": 10},
+        ]}]
+
+        first = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+        first["studies"][0]["lesions"].clear()  # caller mutation must not leak
+        hits = _measure_studies.cache_info().hits
+        second = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+
+        assert _measure_studies.cache_info().hits == hits + 1
+        assert second["studies"][0]["lesions"][0]["long_axis_mm"] == 10.0
+
+    def test_changed_file_or_annotations_invalidate(self, tmp_path):
+        path = _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.5, 0.5))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "1.1", "long_axis_px": 20, "short_axis_px": 10},
+        ]}]
+        run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+
+        _make_dicom(path, "1.1", spacing=(0.25, 0.25))
+        rescanned = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+        assert rescanned["studies"][0]["lesions"][0]["long_axis_mm"] == 5.0
+
+        annotations[0]["lesions"][0]["long_axis_px"] = 40
+        remeasured = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+        assert remeasured["studies"][0]["lesions"][0]["long_axis_mm"] == 10.0
+
+    def test_orthanc_studies_fetched_concurrently_in_order(self, tmp_path, monkeypatch):
+        barrier = threading.Barrier(2, timeout=5)  # deadlocks if downloads are serial
+
+        def fake_download(study_id, out_dir):
+            barrier.wait()
+            zip_path = Path(out_dir) / f"study_{study_id[:8]}.zip"
+            zip_path.parent.mkdir(parents=True, exist_ok=True)
+            spacing = (1.0, 1.0) if study_id.startswith("b") else (0.5, 0.5)
+            src = _make_dicom(tmp_path / "src" / study_id / "im.dcm", "1.1", spacing=spacing)
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.write(src, "SER/im.dcm")
+            return str(zip_path)
+
+        monkeypatch.setattr(vision_tool, "download_study", fake_download)
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "1.1", "long_axis_px": 10, "short_axis_px": 5},
+        ]}]
+
+        result = run_vision_tool(
+            orthanc_study_ids=["bbbbbbbbbbbb", "aaaaaaaa"],
+            annotations=annotations,
+            work_dir=str(tmp_path / "work"),
+        )
+
+        assert [s["lesions"][0]["long_axis_mm"] for s in result["studies"]] == [10.0, 5.0]
+
+    def test_kpis_ignore_unmeasured_long_axes(self, tmp_path):
+        _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.5, 0.5))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"series_uid": "1.1", "long_axis_px": 30, "short_axis_px": 10},
+            {"series_uid": "1.1", "long_axis_px": None, "short_axis_px": 8},
+            {"series_uid": "1.1", "long_axis_px": 50, "short_axis_px": None},
+        ]}]
+
+        kpis = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)["studies"][0]["kpis"]
+
+        assert kpis == {"sum_long_axis_mm": 40.0, "dominant_lesion_mm": 25.0, "lesion_count": 3}
+
+    def test_kpis_none_when_no_long_axis(self, tmp_path):
+        _make_dicom(tmp_path / "s1.dcm", "1.1")
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"series_uid": "1.1", "long_axis_px": None, "short_axis_px": 8},
+        ]}]
+
+        kpis = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)["studies"][0]["kpis"]
+
+        assert kpis["sum_long_axis_mm"] is None
+        assert kpis["dominant_lesion_mm"] is None
+        assert kpis["lesion_count"] == 1
+
+    def test_malformed_annotations_hard_fail(self, tmp_path):
+        _make_dicom(tmp_path / "s1.dcm", "1.1")
+        annotations = [{"study_id": "1.2.3", "lesions": [{"long_axis_px": "twelve"}]}]
+
+        with pytest.raises(ValueError, match="MEASUREMENTS_REQUIRED") as exc_info:
+            run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+
+        assert "lesions → 0 → long_axis_px" in json.loads(str(exc_info.value))["detail"]
+
+    def test_unmatched_series_falls_back_to_first_ct_spacing(self, tmp_path):
+        _make_dicom(tmp_path / "mr.dcm", "1.0", modality="MR", spacing=(0.9, 0.9))
+        _make_dicom(tmp_path / "s1.dcm", "1.1", spacing=(0.5, 0.5))
+        annotations = [{"study_id": "1.2.3", "lesions": [
+            {"lesion_id": "L1", "series_uid": "9.9", "long_axis_px": 20, "short_axis_px": 10},
+            {"lesion_id": "L2", "series_uid": "1.0", "long_axis_px": 10, "short_axis_px": 10},
+        ]}]
+
+        result = run_vision_tool(dicom_paths=[tmp_path], annotations=annotations)
+
+        assert [les["long_axis_mm"] for les in result["studies"][0]["lesions"]] == [10.0, 9.0]
+        assert any("L1" in w and "first CT series" in w for w in result["warnings"])